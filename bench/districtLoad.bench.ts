@@ -0,0 +1,156 @@
+import { recordRow, timeItAsync, type BenchResults } from './harness';
+import { createSyntheticDistricts, createSyntheticPoints } from './synthetic';
+import {
+  fetchDistrictChanges,
+  fetchDistrictOutlines,
+  fetchDistrictsWithMeta,
+  mergeDistrictChanges,
+  withDistrictOutlines,
+} from '../src/lib/districts';
+import type { DistrictRow } from '../src/lib/districtData';
+import { findDistrictLabelPoint, locateDistricts, parseDistrictRows } from '../src/lib/geometryWorker';
+import { clearPerfStats, getPerfStats } from '../src/lib/perf';
+import type { DistrictFeatureCollection, DistrictGeometry } from '../src/types/domain';
+
+// The district load path as the app runs it: supabase-js queries against the REST stand-in that
+// scripts/bench.mjs starts, then parsing, delta merges, outlines and hit tests. Query and parse
+// times come from the same perf stages the in-app panel shows. The render stages (setData, first
+// idle, hover queries, the print tile wait) need a GL context; read those from the panel (`?perf`).
+// The stand-in is not PostGIS: tiles, the outline rebuild, geometry cleanup and the SQL behind the
+// sync RPCs are not exercised here.
+
+const SIZES = [17, 1000, 10000];
+// Share of districts touched by one realtime change batch in the delta-sync run.
+const CHANGED_FRACTION = 0.01;
+const QUERY_COUNT = 2000;
+
+let outlineRevision = 0;
+
+async function putTable(table: string, rows: unknown[]): Promise<void> {
+  const response = await fetch(`${import.meta.env.VITE_SUPABASE_URL}/__bench/${table}`, {
+    method: 'PUT',
+    body: JSON.stringify(rows),
+  });
+  if (!response.ok) {
+    throw new Error(`Stand-in rejected ${table}: ${response.status}`);
+  }
+}
+
+function toRows(collection: DistrictFeatureCollection): DistrictRow[] {
+  return collection.features.map((feature, index) => ({
+    id: feature.properties.id,
+    name: feature.properties.name,
+    chapter_name: null,
+    color: '#FFD700',
+    geometry: feature.geometry,
+    is_active: true,
+    revision: index + 1,
+  }));
+}
+
+// Rounding stands in for rebuild_district_outlines(); the bench only needs smaller payloads.
+function roundGeometry(geometry: DistrictGeometry, decimals: number): DistrictGeometry {
+  const scale = 10 ** decimals;
+  const round = (ring: number[][]) => ring.map(([x, y]) => [Math.round(x * scale) / scale, Math.round(y * scale) / scale]);
+  return geometry.type === 'Polygon'
+    ? { type: 'Polygon', coordinates: geometry.coordinates.map(round) }
+    : { type: 'MultiPolygon', coordinates: geometry.coordinates.map((polygon) => polygon.map(round)) };
+}
+
+function stageMedian(stage: string): number {
+  return getPerfStats().find((entry) => entry.stage === stage)?.medianMs ?? NaN;
+}
+
+export default async function run(): Promise<BenchResults> {
+  const results: BenchResults = {};
+  console.log(`District load path against the REST stand-in (delta: ${CHANGED_FRACTION * 100}% of districts changed)`);
+  for (const size of SIZES) {
+    const synthetic = createSyntheticDistricts({ count: size });
+    const rows = toRows(synthetic);
+    const payloadMb = JSON.stringify(rows).length / 1e6;
+    await putTable('districts', rows);
+    clearPerfStats();
+
+    let base: DistrictFeatureCollection = { type: 'FeatureCollection', features: [] };
+    let baseCursor = 0;
+    const load = await timeItAsync(async () => {
+      const result = await fetchDistrictsWithMeta();
+      if (result.source !== 'supabase' || result.data.features.length !== size) {
+        throw new Error(`Expected ${size} districts from the stand-in, got ${result.source}: ${result.message}`);
+      }
+      base = result.data;
+      baseCursor = result.cursor ?? 0;
+    }, 3);
+    // The legacy text geometry column: every row's geometry is a JSON string to parse.
+    const textRows = rows.map((row) => ({ ...row, geometry: JSON.stringify(row.geometry) }));
+    const textParse = await timeItAsync(() => parseDistrictRows(textRows), 3);
+    console.log(
+      recordRow(
+        results,
+        `${size} load`,
+        {
+          'total ms': load.ms,
+          'query ms': stageMedian('supabase.districts'),
+          'parse ms': stageMedian('districts.parseRows'),
+          'text parse ms': textParse.ms,
+        },
+        { 'payload MB': payloadMb },
+      ),
+    );
+
+    const changedCount = Math.max(1, Math.round(size * CHANGED_FRACTION));
+    const baseRevision = rows.length;
+    const changedRows = rows.map((row, index) =>
+      index < changedCount
+        ? { ...row, revision: baseRevision + index + 1, geometry: roundGeometry(row.geometry as DistrictGeometry, 5) }
+        : row,
+    );
+    await putTable('districts', changedRows);
+    // Outlines as the rebuild leaves them once it has caught up with the delta; outlines behind
+    // any district are not swapped in at all.
+    await putTable(
+      'district_outlines',
+      changedRows.map((row) => ({
+        district_id: row.id,
+        level: 1,
+        geometry: roundGeometry(row.geometry as DistrictGeometry, 4),
+        revision: row.revision,
+      })),
+    );
+    let merged: DistrictFeatureCollection = base;
+    const delta = await timeItAsync(async () => {
+      const changes = await fetchDistrictChanges(baseCursor);
+      if (changes.upserts.length !== changedCount) {
+        throw new Error(`Expected ${changedCount} changed districts, got ${changes.upserts.length}.`);
+      }
+      merged = mergeDistrictChanges(base, changes);
+    });
+    console.log(
+      recordRow(results, `${size} delta`, {
+        'total ms': delta.ms,
+        'query ms': stageMedian('supabase.districtChanges'),
+      }),
+    );
+
+    const outlines = await timeItAsync(async () => {
+      withDistrictOutlines(merged, await fetchDistrictOutlines(1, ++outlineRevision));
+    }, 3);
+
+    const points = createSyntheticPoints(QUERY_COUNT);
+    const lookups = await timeItAsync(() => locateDistricts(points, merged));
+
+    // Label points are cached per feature after the first request, so time a single cold pass.
+    const labelStart = performance.now();
+    await Promise.all(merged.features.map((feature) => findDistrictLabelPoint(feature.properties.id, merged)));
+    const labelMs = performance.now() - labelStart;
+
+    console.log(
+      recordRow(results, `${size} view`, {
+        'outlines ms': outlines.ms,
+        'lookup µs/pt': (lookups.ms * 1000) / QUERY_COUNT,
+        'labels ms': labelMs,
+      }),
+    );
+  }
+  return results;
+}
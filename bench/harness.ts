@@ -0,0 +1,55 @@
+type Timing = {
+  ms: number;
+  iterations: number;
+};
+
+// What a bench file's default export resolves with: timings keyed "<row label> <column>", which
+// scripts/bench.mjs writes out as JSON and checks against bench/baseline.json. Lower is better.
+export type BenchResults = Record<string, number>;
+
+/** Run `fn` repeatedly (after one warm-up call) and report the median wall time per run. */
+export function timeIt(fn: () => unknown, iterations = 5): Timing {
+  fn();
+  const samples: number[] = [];
+  for (let i = 0; i < iterations; i++) {
+    const start = performance.now();
+    fn();
+    samples.push(performance.now() - start);
+  }
+  samples.sort((a, b) => a - b);
+  return { ms: samples[Math.floor(samples.length / 2)], iterations };
+}
+
+/** Async counterpart of `timeIt`; runs are sequential so they don't compete with each other. */
+export async function timeItAsync(fn: () => Promise<unknown>, iterations = 5): Promise<Timing> {
+  await fn();
+  const samples: number[] = [];
+  for (let i = 0; i < iterations; i++) {
+    const start = performance.now();
+    await fn();
+    samples.push(performance.now() - start);
+  }
+  samples.sort((a, b) => a - b);
+  return { ms: samples[Math.floor(samples.length / 2)], iterations };
+}
+
+export function formatRow(label: string, values: Record<string, number>): string {
+  const cells = Object.entries(values).map(([key, value]) => `${key}=${value.toFixed(value >= 100 ? 0 : 3)}`);
+  return `  ${label.padEnd(16)} ${cells.join('  ')}`;
+}
+
+/**
+ * Format a row like `formatRow` and record its `timings` into `results`. `info` columns (sizes,
+ * ratios) are only printed; they are not timings and don't regress the same way.
+ */
+export function recordRow(
+  results: BenchResults,
+  label: string,
+  timings: Record<string, number>,
+  info: Record<string, number> = {},
+): string {
+  for (const [key, value] of Object.entries(timings)) {
+    results[`${label} ${key}`] = value;
+  }
+  return formatRow(label, { ...info, ...timings });
+}
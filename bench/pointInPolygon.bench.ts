@@ -0,0 +1,91 @@
+import type { DistrictFeature, DistrictFeatureCollection } from '../src/types/domain';
+import { buildDistrictIndex, findDistrictAtPoint, findDistrictsAtPoints } from '../src/lib/pointInPolygon';
+import { createSyntheticDistricts, createSyntheticPoints } from './synthetic';
+import { recordRow, timeIt, type BenchResults } from './harness';
+
+// The pre-index implementation, kept verbatim as the baseline.
+function isInsideRing(point: [number, number], ring: number[][]): boolean {
+  const [px, py] = point;
+  let inside = false;
+  for (let i = 0, j = ring.length - 1; i < ring.length; j = i++) {
+    const [xi, yi] = ring[i];
+    const [xj, yj] = ring[j];
+    if (yi > py !== yj > py && px < ((xj - xi) * (py - yi)) / (yj - yi) + xi) {
+      inside = !inside;
+    }
+  }
+  return inside;
+}
+
+function isInsidePolygon(point: [number, number], coordinates: number[][][]): boolean {
+  if (!isInsideRing(point, coordinates[0])) {
+    return false;
+  }
+  for (let i = 1; i < coordinates.length; i++) {
+    if (isInsideRing(point, coordinates[i])) {
+      return false;
+    }
+  }
+  return true;
+}
+
+function linearFindDistrictAtPoint(
+  point: [number, number],
+  districts: DistrictFeatureCollection,
+): DistrictFeature | null {
+  for (const feature of districts.features) {
+    const geometry = feature.geometry;
+    if (geometry.type === 'Polygon') {
+      if (isInsidePolygon(point, geometry.coordinates)) {
+        return feature;
+      }
+    } else if (geometry.type === 'MultiPolygon') {
+      for (const polygon of geometry.coordinates) {
+        if (isInsidePolygon(point, polygon)) {
+          return feature;
+        }
+      }
+    }
+  }
+  return null;
+}
+
+const SIZES = [17, 1000, 5000];
+const QUERY_COUNT = 2000;
+
+export default async function run(): Promise<BenchResults> {
+  const results: BenchResults = {};
+  console.log('findDistrictAtPoint: linear scan vs. indexed lookup');
+  for (const size of SIZES) {
+    const districts = createSyntheticDistricts({ count: size });
+    const points = createSyntheticPoints(QUERY_COUNT);
+
+    const build = timeIt(() => buildDistrictIndex(districts), 1);
+    const linear = timeIt(() => points.forEach((point) => linearFindDistrictAtPoint(point, districts)));
+    findDistrictAtPoint(points[0], districts);
+    const indexed = timeIt(() => points.forEach((point) => findDistrictAtPoint(point, districts)));
+    const batch = timeIt(() => findDistrictsAtPoints(points, districts));
+
+    const mismatches = points.filter(
+      (point) => linearFindDistrictAtPoint(point, districts) !== findDistrictAtPoint(point, districts),
+    ).length;
+    if (mismatches) {
+      throw new Error(`${mismatches} lookups disagree with the linear scan at ${size} districts.`);
+    }
+
+    console.log(
+      recordRow(
+        results,
+        `${size} districts`,
+        {
+          'index build ms': build.ms,
+          'linear µs/pt': (linear.ms * 1000) / QUERY_COUNT,
+          'indexed µs/pt': (indexed.ms * 1000) / QUERY_COUNT,
+          'batch µs/pt': (batch.ms * 1000) / QUERY_COUNT,
+        },
+        { speedup: linear.ms / indexed.ms },
+      ),
+    );
+  }
+  return results;
+}
@@ -0,0 +1,113 @@
+import type { DistrictFeature, DistrictFeatureCollection } from '../src/types/domain';
+
+// Austin-area extent used for every synthetic district set.
+export const SYNTHETIC_BBOX: [number, number, number, number] = [-98.2, 29.9, -97.2, 30.8];
+
+type SyntheticOptions = {
+  count: number;
+  verticesPerEdge?: number;
+  seed?: number;
+};
+
+export function createRandom(seed = 1): () => number {
+  let state = seed >>> 0;
+  return () => {
+    state = (state + 0x6d2b79f5) >>> 0;
+    let t = state;
+    t = Math.imul(t ^ (t >>> 15), t | 1);
+    t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+  };
+}
+
+/**
+ * Generate a gap-free coverage of roughly `count` jagged precinct-like polygons.
+ * Lattice corners are jittered and every shared edge is subdivided once, so
+ * neighbors reference identical vertex chains just like real district boundaries.
+ */
+export function createSyntheticDistricts({
+  count,
+  verticesPerEdge = 24,
+  seed = 1,
+}: SyntheticOptions): DistrictFeatureCollection {
+  const random = createRandom(seed);
+  const [minX, minY, maxX, maxY] = SYNTHETIC_BBOX;
+  const columns = Math.max(1, Math.ceil(Math.sqrt(count)));
+  const rows = Math.max(1, Math.ceil(count / columns));
+  const cellWidth = (maxX - minX) / columns;
+  const cellHeight = (maxY - minY) / rows;
+
+  const corners: number[][][] = [];
+  for (let row = 0; row <= rows; row++) {
+    corners.push([]);
+    for (let column = 0; column <= columns; column++) {
+      const interior = row > 0 && row < rows && column > 0 && column < columns;
+      const jitterX = interior ? (random() - 0.5) * cellWidth * 0.3 : 0;
+      const jitterY = interior ? (random() - 0.5) * cellHeight * 0.3 : 0;
+      corners[row].push([minX + column * cellWidth + jitterX, minY + row * cellHeight + jitterY]);
+    }
+  }
+
+  const edgeCache = new Map<string, number[][]>();
+  const edgeChain = (a: [number, number], b: [number, number]): number[][] => {
+    const forward = `${a[0]},${a[1]}>${b[0]},${b[1]}`;
+    const cached = edgeCache.get(forward);
+    if (cached) {
+      return cached;
+    }
+    const start = corners[a[0]][a[1]];
+    const end = corners[b[0]][b[1]];
+    const isBorder =
+      (a[0] === b[0] && (a[0] === 0 || a[0] === rows)) || (a[1] === b[1] && (a[1] === 0 || a[1] === columns));
+    const chain: number[][] = [];
+    for (let step = 1; step < verticesPerEdge; step++) {
+      const t = step / verticesPerEdge;
+      const wobble = isBorder ? 0 : (random() - 0.5) * 0.1;
+      const dx = end[0] - start[0];
+      const dy = end[1] - start[1];
+      chain.push([start[0] + dx * t - dy * wobble * 0.2, start[1] + dy * t + dx * wobble * 0.2]);
+    }
+    edgeCache.set(forward, chain);
+    edgeCache.set(`${b[0]},${b[1]}>${a[0]},${a[1]}`, [...chain].reverse());
+    return chain;
+  };
+
+  const features: DistrictFeature[] = [];
+  for (let row = 0; row < rows && features.length < count; row++) {
+    for (let column = 0; column < columns && features.length < count; column++) {
+      const loop: Array<[number, number]> = [
+        [row, column],
+        [row, column + 1],
+        [row + 1, column + 1],
+        [row + 1, column],
+      ];
+      const ring: number[][] = [];
+      loop.forEach((corner, index) => {
+        const next = loop[(index + 1) % loop.length];
+        ring.push(corners[corner[0]][corner[1]], ...edgeChain(corner, next));
+      });
+      ring.push(ring[0]);
+
+      const id = `precinct-${features.length + 1}`;
+      features.push({
+        type: 'Feature',
+        properties: { id, name: `Precinct ${features.length + 1}`, chapter_name: null, color: '#FFD700' },
+        geometry: { type: 'Polygon', coordinates: [ring] },
+      });
+    }
+  }
+
+  return { type: 'FeatureCollection', features };
+}
+
+/** Uniformly distributed [lon, lat] points over the synthetic extent (with a margin outside it). */
+export function createSyntheticPoints(count: number, seed = 2): Array<[number, number]> {
+  const random = createRandom(seed);
+  const [minX, minY, maxX, maxY] = SYNTHETIC_BBOX;
+  const marginX = (maxX - minX) * 0.05;
+  const marginY = (maxY - minY) * 0.05;
+  return Array.from({ length: count }, (): [number, number] => [
+    minX - marginX + random() * (maxX - minX + marginX * 2),
+    minY - marginY + random() * (maxY - minY + marginY * 2),
+  ]);
+}
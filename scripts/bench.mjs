@@ -0,0 +1,107 @@
+// Runs the TypeScript benchmarks in bench/ through Vite's SSR loader so they
+// share the app's module resolution (including `?raw` imports) without a build step.
+//
+//   npm run bench                      # every bench/*.bench.ts
+//   npm run bench -- pointInPolygon    # only files whose name contains "pointInPolygon"
+//   npm run bench -- --json=out.json   # also write the results as JSON
+//   npm run bench -- --update-baseline # record this run's results as the baseline
+//
+// Each bench resolves with its timings. Any timing more than BENCH_TOLERANCE (default 0.25, i.e.
+// 25%) and a small absolute margin above bench/baseline.json fails the run. Baselines are
+// machine-specific; record them on the machine that runs the check.
+//
+// Supabase is pointed at an in-memory REST stand-in (scripts/restStandIn.mjs) for the run, so
+// benchmarks never touch a real project even when .env configures one.
+import { existsSync, readFileSync, readdirSync, writeFileSync } from 'node:fs';
+import { fileURLToPath } from 'node:url';
+import { createServer } from 'vite';
+import { startRestStandIn } from './restStandIn.mjs';
+
+const root = fileURLToPath(new URL('..', import.meta.url));
+const baselinePath = fileURLToPath(new URL('../bench/baseline.json', import.meta.url));
+const args = process.argv.slice(2);
+const filters = args.filter((arg) => !arg.startsWith('--'));
+const jsonPath = args.find((arg) => arg.startsWith('--json='))?.slice('--json='.length);
+const updateBaseline = args.includes('--update-baseline');
+const tolerance = Number(process.env.BENCH_TOLERANCE ?? 0.25);
+// Below these differences a timing is noise whatever the ratio says.
+const NOISE_FLOOR = { ms: 1, 'µs/pt': 0.25 };
+const files = readdirSync(new URL('../bench', import.meta.url))
+  .filter((file) => file.endsWith('.bench.ts'))
+  .filter((file) => !filters.length || filters.some((filter) => file.includes(filter)))
+  .sort();
+
+// Vite gives variables already in process.env precedence over .env files.
+const standIn = await startRestStandIn();
+process.env.VITE_SUPABASE_URL = standIn.url;
+process.env.VITE_SUPABASE_PUBLISHABLE_KEY = 'bench-publishable-key';
+
+const server = await createServer({
+  root,
+  logLevel: 'error',
+  appType: 'custom',
+  server: { middlewareMode: true, hmr: false },
+});
+
+let failed = false;
+const results = {};
+try {
+  for (const file of files) {
+    console.log(`\n# ${file}`);
+    try {
+      const mod = await server.ssrLoadModule(`/bench/${file}`);
+      results[file] = (await mod.default()) ?? {};
+    } catch (error) {
+      failed = true;
+      console.error(`Benchmark ${file} failed:`, error);
+    }
+  }
+} finally {
+  await server.close();
+  await standIn.close();
+}
+
+if (jsonPath) {
+  writeFileSync(jsonPath, `${JSON.stringify({ generatedAt: new Date().toISOString(), results }, null, 2)}\n`);
+}
+
+const baseline = existsSync(baselinePath) ? JSON.parse(readFileSync(baselinePath, 'utf8')) : { results: {} };
+if (updateBaseline) {
+  // Files left out by a filter keep their previous baseline.
+  writeFileSync(baselinePath, `${JSON.stringify({ results: { ...baseline.results, ...results } }, null, 2)}\n`);
+  console.log(`\nBaseline updated: ${baselinePath}`);
+} else if (!existsSync(baselinePath)) {
+  console.log('\nNo bench/baseline.json; run `npm run bench -- --update-baseline` to record one.');
+} else {
+  console.log(`\nAgainst baseline (tolerance ${tolerance * 100}%):`);
+  const regressions = compareToBaseline(baseline.results, results);
+  regressions.forEach((line) => console.error(`  REGRESSION ${line}`));
+  if (regressions.length) {
+    failed = true;
+  } else {
+    console.log('  no regressions');
+  }
+}
+
+process.exit(failed ? 1 : 0);
+
+function noiseFloor(metric) {
+  const unit = Object.keys(NOISE_FLOOR).find((suffix) => metric.endsWith(suffix));
+  return unit ? NOISE_FLOOR[unit] : 0;
+}
+
+function compareToBaseline(expected, actual) {
+  const regressions = [];
+  for (const [file, metrics] of Object.entries(actual)) {
+    for (const [metric, value] of Object.entries(metrics)) {
+      const before = expected[file]?.[metric];
+      if (typeof before !== 'number' || !Number.isFinite(before) || !Number.isFinite(value)) {
+        continue;
+      }
+      if (value > before * (1 + tolerance) && value - before > noiseFloor(metric)) {
+        regressions.push(`${file} ${metric}: ${value.toFixed(3)} vs ${before.toFixed(3)} baseline`);
+      }
+    }
+  }
+  return regressions;
+}
@@ -0,0 +1,145 @@
+// In-memory stand-in for the Supabase REST endpoint, so benchmarks can drive the app's real
+// supabase-js queries without a database. It understands just the PostgREST subset the app
+// reads with: `select=` column lists, `col=eq.v` / `col=gt.v` filters and `order=col.asc|desc`,
+// plus the district sync RPCs. Tables are replaced wholesale with `PUT /__bench/<table>` and a
+// JSON array body; each PUT counts as one committed transaction for the sync cursor.
+import { createServer } from 'node:http';
+
+const DISTRICT_RPC_COLUMNS = ['id', 'name', 'chapter_name', 'color', 'geometry', 'is_active', 'revision'];
+
+function applyQuery(rows, params) {
+  let result = rows;
+  for (const [key, value] of params) {
+    if (key === 'select' || key === 'order') {
+      continue;
+    }
+    const dot = value.indexOf('.');
+    const op = value.slice(0, dot);
+    const operand = value.slice(dot + 1);
+    if (op === 'eq') {
+      result = result.filter((row) => String(row[key]) === operand);
+    } else if (op === 'gt') {
+      result = result.filter((row) => Number(row[key]) > Number(operand));
+    } else {
+      throw new Error(`Unsupported filter ${key}=${value}`);
+    }
+  }
+
+  const order = params.get('order');
+  if (order) {
+    const [column, direction] = order.split('.');
+    const sign = direction === 'desc' ? -1 : 1;
+    result = [...result].sort((a, b) => (a[column] < b[column] ? -sign : a[column] > b[column] ? sign : 0));
+  }
+
+  const select = params.get('select');
+  if (select && select !== '*') {
+    const columns = select.split(',');
+    result = result.map((row) => Object.fromEntries(columns.map((column) => [column, row[column] ?? null])));
+  }
+  return result;
+}
+
+/** Start the stand-in on a free local port; resolves with its base URL and a `close()`. */
+export async function startRestStandIn() {
+  const tables = new Map();
+  // Emulates districts.revision_xid: the "transaction" (PUT) that last changed each row, by id.
+  const rowJson = new Map();
+  const rowXids = new Map();
+  let lastXid = 0;
+  // Serialized responses by request URL, dropped whenever a table changes, so timings measure
+  // transfer and client-side parsing rather than this server's JSON.stringify.
+  const bodies = new Map();
+
+  const server = createServer((req, res) => {
+    const url = new URL(req.url ?? '/', 'http://localhost');
+    const send = (status, body) => {
+      res.writeHead(status, { 'Content-Type': 'application/json' });
+      res.end(body);
+    };
+
+    if (req.method === 'PUT' && url.pathname.startsWith('/__bench/')) {
+      const chunks = [];
+      req.on('data', (chunk) => chunks.push(chunk));
+      req.on('end', () => {
+        const table = url.pathname.slice('/__bench/'.length);
+        const rows = JSON.parse(Buffer.concat(chunks).toString('utf8'));
+        const xid = ++lastXid;
+        rows.forEach((row, index) => {
+          const key = `${table}:${row.id ?? index}`;
+          const json = JSON.stringify(row);
+          if (rowJson.get(key) !== json) {
+            rowJson.set(key, json);
+            rowXids.set(key, xid);
+          }
+        });
+        tables.set(table, rows);
+        bodies.clear();
+        send(204, '');
+      });
+      return;
+    }
+
+    // Nothing is ever in flight here, so the cursor is simply the next transaction id.
+    if (req.method === 'POST' && url.pathname === '/rest/v1/rpc/district_sync_cursor') {
+      send(200, JSON.stringify(lastXid + 1));
+      return;
+    }
+    if (req.method === 'POST' && url.pathname === '/rest/v1/rpc/district_snapshot') {
+      let body = bodies.get(url.pathname);
+      if (body === undefined) {
+        const rows = (tables.get('districts') ?? [])
+          .filter((row) => row.is_active)
+          .sort((a, b) => (a.name < b.name ? -1 : a.name > b.name ? 1 : 0))
+          .map((row) => Object.fromEntries(DISTRICT_RPC_COLUMNS.map((column) => [column, row[column] ?? null])));
+        const revisions = (tables.get('districts') ?? []).map((row) => row.revision);
+        body = JSON.stringify({ cursor: lastXid + 1, revision: revisions.length ? Math.max(...revisions) : null, rows });
+        bodies.set(url.pathname, body);
+      }
+      send(200, body);
+      return;
+    }
+    if (req.method === 'POST' && url.pathname === '/rest/v1/rpc/district_changes_since') {
+      const chunks = [];
+      req.on('data', (chunk) => chunks.push(chunk));
+      req.on('end', () => {
+        const { p_cursor: cursor } = JSON.parse(Buffer.concat(chunks).toString('utf8') || '{}');
+        const rows = (tables.get('districts') ?? [])
+          .filter((row) => (rowXids.get(`districts:${row.id}`) ?? 0) >= cursor)
+          .sort((a, b) => a.revision - b.revision)
+          .map((row) => Object.fromEntries(DISTRICT_RPC_COLUMNS.map((column) => [column, row[column] ?? null])));
+        send(200, JSON.stringify({ cursor: lastXid + 1, rows }));
+      });
+      return;
+    }
+
+    const match = /^\/rest\/v1\/([a-z_]+)$/.exec(url.pathname);
+    if (req.method !== 'GET' || !match) {
+      send(404, JSON.stringify({ message: `No stand-in route for ${req.method} ${url.pathname}` }));
+      return;
+    }
+    const rows = tables.get(match[1]);
+    if (!rows) {
+      send(404, JSON.stringify({ code: '42P01', message: `relation "public.${match[1]}" does not exist` }));
+      return;
+    }
+
+    try {
+      let body = bodies.get(req.url);
+      if (body === undefined) {
+        body = JSON.stringify(applyQuery(rows, url.searchParams));
+        bodies.set(req.url, body);
+      }
+      send(200, body);
+    } catch (error) {
+      send(400, JSON.stringify({ message: error instanceof Error ? error.message : String(error) }));
+    }
+  });
+
+  await new Promise((resolve) => server.listen(0, '127.0.0.1', resolve));
+  const { port } = server.address();
+  return {
+    url: `http://127.0.0.1:${port}`,
+    close: () => new Promise((resolve) => server.close(resolve)),
+  };
+}
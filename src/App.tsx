@@ -2,17 +2,25 @@ import { useEffect, useMemo, useRef, useState } from 'react';
 import type { User } from '@supabase/supabase-js';
 import MapView from './components/MapView';
 import Sidebar from './components/Sidebar';
+import PerfPanel from './components/PerfPanel';
 import StatusIndicator from './components/StatusIndicator';
 import AuthModal from './components/AuthModal';
 import {
   createDistrictBoundary,
+  fetchDistrictChanges,
   fetchDistrictsWithMeta,
   fetchEditHistory,
+  loadDistrictSnapshot,
+  mergeDistrictChanges,
   renameDistrict,
+  scheduleDistrictSnapshot,
   softDeleteDistrict,
+  SupabaseUnreachableError,
   updateDistrictBoundary,
 } from './lib/districts';
 import { getSessionAndRole, signOut } from './lib/auth';
+import { preloadDistrictGeometry, validateDistrictGeometry } from './lib/geometryWorker';
+import { isPerfPanelEnabled } from './lib/perf';
 import { supabase } from './lib/supabase';
 import type {
   AppRole,
@@ -27,6 +35,9 @@ import type {
 } from './types/domain';
 
 const EMPTY_FC: DistrictFeatureCollection = { type: 'FeatureCollection', features: [] };
+const REALTIME_SYNC_DEBOUNCE_MS = 300;
+const SUPABASE_RETRY_MS = 15000;
+const SHOW_PERF_PANEL = isPerfPanelEnabled();
 
 const getInitialBasemap = (): string => {
   if (typeof window === 'undefined') {
@@ -59,50 +70,127 @@ export default function App() {
     message: '',
   });
   const retryTimeoutRef = useRef<ReturnType<typeof setTimeout> | null>(null);
+  // Revision of the loaded Supabase data; null means it is not Supabase data.
+  const revisionRef = useRef<number | null>(null);
+  // Delta sync cursor for the loaded data; null means only a full fetch can refresh it.
+  const cursorRef = useRef<number | null>(null);
+  const [districtRevision, setDistrictRevision] = useState<number | null>(null);
+  const syncChainRef = useRef<Promise<unknown>>(Promise.resolve());
+  const savedSnapshotRef = useRef<DistrictFeatureCollection | null>(null);
   const isEditor = useMemo(() => role === 'editor' || role === 'admin', [role]);
   const isAdmin = useMemo(() => role === 'admin', [role]);
 
+  // Tile URLs are keyed on the revision and cached as immutable, so it never moves backwards: a
+  // full read can report less than a delta already reached, and an older key serves older tiles.
+  const setRevision = (revision: number | null) => {
+    const next = revision === null ? null : Math.max(revision, revisionRef.current ?? revision);
+    revisionRef.current = next;
+    setDistrictRevision(next);
+  };
+
+  // Chained so overlapping triggers (a local save and its realtime echo) apply change sets in order.
+  const syncDistrictChanges = (): Promise<void> => {
+    const run = syncChainRef.current.then(async () => {
+      const since = cursorRef.current;
+      if (since === null) {
+        throw new Error('No district sync cursor to sync from.');
+      }
+      const changes = await fetchDistrictChanges(since);
+      cursorRef.current = changes.cursor;
+      if (changes.revision !== null) {
+        setRevision(changes.revision);
+      }
+      setDistricts((current) => mergeDistrictChanges(current, changes));
+    });
+    syncChainRef.current = run.catch(() => undefined);
+    return run;
+  };
+
+  // Resolves true once the districts on screen are current with Supabase.
+  const refreshDistricts = async ({ full = false }: { full?: boolean } = {}): Promise<boolean> => {
+    if (!full && cursorRef.current !== null) {
+      try {
+        await syncDistrictChanges();
+        setSupabaseStatus({ state: 'connected', message: '' });
+        return true;
+      } catch (error) {
+        // The full read would only time out the same way; keep what is on screen until the retry.
+        if (error instanceof SupabaseUnreachableError) {
+          setSupabaseStatus({ state: 'fallback', message: `Showing saved boundaries. ${error.message}` });
+          return false;
+        }
+        console.warn('Incremental district sync failed. Refetching all districts:', error);
+      }
+    }
+
+    // Supabase-derived data (live or snapshot) is never downgraded to the bundled fallback.
+    const hasSupabaseData = revisionRef.current !== null;
+    try {
+      const result = await fetchDistrictsWithMeta({ fallback: !hasSupabaseData });
+      if (result.source === 'supabase' || !hasSupabaseData) {
+        setRevision(result.revision);
+        cursorRef.current = result.cursor;
+        setDistricts(result.data);
+      }
+      setSupabaseStatus({
+        state: result.source === 'supabase' ? 'connected' : 'fallback',
+        message:
+          result.source === 'supabase'
+            ? ''
+            : hasSupabaseData
+              ? `Showing saved boundaries. ${result.message || 'Supabase is unreachable.'}`
+              : result.message || 'Using local fallback boundaries.',
+      });
+      return result.source === 'supabase';
+    } catch {
+      if (!hasSupabaseData) {
+        setDistricts(EMPTY_FC);
+      }
+      setSupabaseStatus({ state: 'fallback', message: 'District refresh failed. Using fallback boundaries.' });
+      return false;
+    }
+  };
+
   useEffect(() => {
     let alive = true;
 
     const load = async () => {
       setLoading(true);
-      const { data: districtData, source, message } = await fetchDistrictsWithMeta();
 
+      // Render the last good Supabase snapshot immediately, then revalidate it by sync cursor:
+      // an unchanged server costs one empty delta query instead of the full payload.
+      const snapshot = await loadDistrictSnapshot();
       if (!alive) {
         return;
       }
+      if (snapshot) {
+        setRevision(snapshot.revision);
+        cursorRef.current = snapshot.cursor;
+        savedSnapshotRef.current = snapshot.data;
+        setDistricts(snapshot.data);
+        setSupabaseStatus({ state: 'checking', message: 'Showing saved boundaries while checking for updates...' });
+        setLoading(false);
+      }
 
-      setDistricts(districtData);
-      setSupabaseStatus({
-        state: source === 'supabase' ? 'connected' : 'fallback',
-        message: source === 'supabase' ? '' : message || 'Using local fallback boundaries.',
-      });
+      const connected = await refreshDistricts();
+      if (!alive) {
+        return;
+      }
       setLoading(false);
 
       const retrySupabaseDistricts = async () => {
         if (!alive) {
           return;
         }
-        const result = await fetchDistrictsWithMeta();
+        const retryConnected = await refreshDistricts();
         if (!alive) {
           return;
         }
-        if (result.source === 'supabase') {
-          setDistricts(result.data);
-          setSupabaseStatus({ state: 'connected', message: '' });
-          retryTimeoutRef.current = null;
-          return;
-        }
-        setSupabaseStatus({
-          state: 'fallback',
-          message: result.message || 'Using local fallback boundaries.',
-        });
-        retryTimeoutRef.current = setTimeout(retrySupabaseDistricts, 15000);
+        retryTimeoutRef.current = retryConnected ? null : setTimeout(retrySupabaseDistricts, SUPABASE_RETRY_MS);
       };
 
-      if (source === 'fallback') {
-        retryTimeoutRef.current = setTimeout(retrySupabaseDistricts, 15000);
+      if (!connected) {
+        retryTimeoutRef.current = setTimeout(retrySupabaseDistricts, SUPABASE_RETRY_MS);
       }
 
       fetchEditHistory()
@@ -142,6 +230,31 @@ export default function App() {
 
     void load();
 
+    // Other editors' saves arrive as change notifications. The payload already carries the
+    // row, but re-reading by sync cursor keeps ordering and payload size limits out of the picture.
+    let realtimeTimer: ReturnType<typeof setTimeout> | null = null;
+    let realtimeNeedsFullRefresh = false;
+    const districtChannel = supabase
+      ?.channel('districts-changes')
+      .on('postgres_changes', { event: '*', schema: 'public', table: 'districts' }, (payload) => {
+        // Hard deletes leave no row behind for a revision query to find.
+        if (payload.eventType === 'DELETE') {
+          realtimeNeedsFullRefresh = true;
+        }
+        if (realtimeTimer) {
+          clearTimeout(realtimeTimer);
+        }
+        realtimeTimer = setTimeout(() => {
+          realtimeTimer = null;
+          const full = realtimeNeedsFullRefresh;
+          realtimeNeedsFullRefresh = false;
+          if (alive && revisionRef.current !== null) {
+            void refreshDistricts({ full });
+          }
+        }, REALTIME_SYNC_DEBOUNCE_MS);
+      })
+      .subscribe();
+
     const sub = supabase?.auth.onAuthStateChange(async (event) => {
       if (event === 'INITIAL_SESSION') {
         return;
@@ -175,27 +288,31 @@ export default function App() {
         retryTimeoutRef.current = null;
       }
       sub?.data?.subscription?.unsubscribe();
+      if (realtimeTimer) {
+        clearTimeout(realtimeTimer);
+      }
+      if (districtChannel) {
+        void supabase?.removeChannel(districtChannel);
+      }
     };
   }, []);
 
-  const refreshDistrictsAndHistory = async () => {
-    const [districtDataResult, editsResult] = await Promise.allSettled([fetchDistrictsWithMeta(), fetchEditHistory()]);
-    const districtData = districtDataResult.status === 'fulfilled' ? districtDataResult.value.data : EMPTY_FC;
+  useEffect(() => {
+    preloadDistrictGeometry(districts);
+  }, [districts]);
 
-    if (districtDataResult.status === 'fulfilled') {
-      setSupabaseStatus({
-        state: districtDataResult.value.source === 'supabase' ? 'connected' : 'fallback',
-        message:
-          districtDataResult.value.source === 'supabase'
-            ? ''
-            : districtDataResult.value.message || 'Using local fallback boundaries.',
-      });
-    } else {
-      setSupabaseStatus({ state: 'fallback', message: 'District refresh failed. Using fallback boundaries.' });
+  useEffect(() => {
+    const revision = revisionRef.current;
+    if (revision === null || !districts.features.length || savedSnapshotRef.current === districts) {
+      return;
     }
+    savedSnapshotRef.current = districts;
+    scheduleDistrictSnapshot(districts, revision, cursorRef.current);
+  }, [districts]);
 
+  const refreshDistrictsAndHistory = async () => {
+    const [, editsResult] = await Promise.allSettled([refreshDistricts(), fetchEditHistory()]);
     const edits = editsResult.status === 'fulfilled' ? editsResult.value : [];
-    setDistricts(districtData);
     setHistory(edits);
   };
 
@@ -205,6 +322,11 @@ export default function App() {
       return { ok: false, message: 'Login required.' };
     }
 
+    const problem = await validateDistrictGeometry(geometry);
+    if (problem) {
+      return { ok: false, message: problem };
+    }
+
     try {
       await updateDistrictBoundary(districtId, geometry);
       await refreshDistrictsAndHistory();
@@ -223,6 +345,10 @@ export default function App() {
     if (!isAdmin) {
       return { ok: false, message: 'Only admins can add districts.' };
     }
+    const problem = await validateDistrictGeometry(geometry);
+    if (problem) {
+      return { ok: false, message: problem };
+    }
     try {
       await createDistrictBoundary(name, geometry);
       await refreshDistrictsAndHistory();
@@ -319,6 +445,7 @@ export default function App() {
           onViewChange={setViewState}
           lineColor={lineColor}
           districts={districts}
+          districtRevision={districtRevision}
           selectedDistrictId={selectedDistrictId}
           onSelectDistrict={setSelectedDistrictId}
           canEdit={isEditor}
@@ -330,6 +457,7 @@ export default function App() {
           loading={loading}
         />
         <StatusIndicator supabaseStatus={supabaseStatus} authStatus={authStatus} />
+        {SHOW_PERF_PANEL ? <PerfPanel /> : null}
       </main>
       <AuthModal
         isOpen={authOpen}
@@ -0,0 +1,172 @@
+import { useEffect, useMemo, useRef, useState } from 'react';
+import {
+  batchFileKey,
+  classifyCsv,
+  clearCompletedRows,
+  createCompletedRowWriter,
+  loadCompletedRows,
+  type BatchProgress,
+} from '../lib/batchClassify';
+import { readTextChunks } from '../lib/csv';
+import { geocodeAddress } from '../lib/geocode';
+import { createMockGeocoder } from '../lib/mockGeocoder';
+import type { DistrictFeature, DistrictFeatureCollection } from '../types/domain';
+
+type BatchClassifyProps = {
+  districts: DistrictFeature[];
+};
+
+type Download = {
+  url: string;
+  fileName: string;
+};
+
+// VITE_GEOCODER=mock swaps Nominatim for the deterministic offline geocoder.
+const useMockGeocoder = import.meta.env.VITE_GEOCODER === 'mock';
+const geocoder = useMockGeocoder ? createMockGeocoder() : geocodeAddress;
+// Nominatim lookups are rate limited inside geocodeAddress; concurrency only lets cache hits overtake them.
+const GEOCODER_CONCURRENCY = useMockGeocoder ? 8 : 4;
+// Output lines are gathered into Blobs of this many lines so the browser can keep them off the JS heap.
+const OUTPUT_BLOB_LINES = 1000;
+
+function outputFileName(inputName: string): string {
+  const base = inputName.replace(/\.csv$/i, '');
+  return `${base}-districts.csv`;
+}
+
+export default function BatchClassify({ districts }: BatchClassifyProps) {
+  const [file, setFile] = useState<File | null>(null);
+  const [running, setRunning] = useState(false);
+  const [progress, setProgress] = useState<BatchProgress | null>(null);
+  const [percentRead, setPercentRead] = useState(0);
+  const [error, setError] = useState('');
+  const [download, setDownload] = useState<Download | null>(null);
+  const abortRef = useRef<AbortController | null>(null);
+  const collection = useMemo<DistrictFeatureCollection>(
+    () => ({ type: 'FeatureCollection', features: districts }),
+    [districts],
+  );
+
+  useEffect(() => {
+    return () => {
+      abortRef.current?.abort();
+    };
+  }, []);
+
+  useEffect(() => {
+    return () => {
+      if (download) {
+        URL.revokeObjectURL(download.url);
+      }
+    };
+  }, [download]);
+
+  const start = async () => {
+    if (!file || running) {
+      return;
+    }
+    const controller = new AbortController();
+    abortRef.current = controller;
+    setRunning(true);
+    setError('');
+    setProgress(null);
+    setPercentRead(0);
+    setDownload(null);
+
+    const fileKey = batchFileKey(file);
+    const writer = createCompletedRowWriter(fileKey);
+    const blobs: Blob[] = [];
+    let lines: string[] = [];
+    let finalProgress: BatchProgress | null = null;
+    try {
+      const completedRows = await loadCompletedRows(fileKey);
+      const chunks = readTextChunks(file, (bytesRead, totalBytes) => {
+        setPercentRead(totalBytes ? Math.round((bytesRead / totalBytes) * 100) : 100);
+      });
+      for await (const line of classifyCsv(chunks, {
+        districts: collection,
+        geocoder,
+        concurrency: GEOCODER_CONCURRENCY,
+        completedRows,
+        onRowCompleted: writer.add,
+        onProgress: (next) => {
+          finalProgress = next;
+          setProgress(next);
+        },
+        signal: controller.signal,
+      })) {
+        lines.push(line);
+        if (lines.length >= OUTPUT_BLOB_LINES) {
+          blobs.push(new Blob(lines));
+          lines = [];
+        }
+      }
+      await writer.flush();
+      if (controller.signal.aborted) {
+        setError('Stopped. Classify the same file again to resume, or re-run the downloaded file.');
+      } else if ((finalProgress as BatchProgress | null)?.failed === 0) {
+        // Every row has a final answer, so the saved progress has served its purpose.
+        await clearCompletedRows(fileKey);
+      }
+    } catch (err) {
+      setError(err instanceof Error ? err.message : 'Batch classification failed.');
+    } finally {
+      abortRef.current = null;
+      await writer.flush();
+      setRunning(false);
+      if (lines.length) {
+        blobs.push(new Blob(lines));
+      }
+      if (blobs.length) {
+        setDownload({
+          url: URL.createObjectURL(new Blob(blobs, { type: 'text/csv' })),
+          fileName: outputFileName(file.name),
+        });
+      }
+    }
+  };
+
+  const summary = progress
+    ? `${progress.rowsDone} rows · ${progress.matched} matched · ${progress.noDistrict} outside · ${progress.notFound} not found` +
+      (progress.failed ? ` · ${progress.failed} failed` : '') +
+      (progress.skipped ? ` · ${progress.skipped} already done` : '')
+    : '';
+
+  return (
+    <div className="batch-classify">
+      <input
+        type="file"
+        accept=".csv,text/csv"
+        disabled={running}
+        onChange={(event) => {
+          setFile(event.target.files?.[0] ?? null);
+          setProgress(null);
+          setError('');
+          setDownload(null);
+        }}
+      />
+      <div className="batch-classify-actions">
+        <button className="primary" onClick={() => void start()} disabled={!file || running || !districts.length}>
+          Classify
+        </button>
+        {running ? (
+          <button className="danger" onClick={() => abortRef.current?.abort()}>
+            Stop
+          </button>
+        ) : null}
+        {download && !running ? (
+          <a className="batch-classify-download" href={download.url} download={download.fileName}>
+            Download CSV
+          </a>
+        ) : null}
+      </div>
+      {running ? <div className="batch-classify-status">Reading file: {percentRead}%</div> : null}
+      {summary ? <div className="batch-classify-status">{summary}</div> : null}
+      {error ? <div className="batch-classify-error">{error}</div> : null}
+      <p className="batch-classify-hint">
+        CSV with an <code>address</code> column or <code>lat</code>/<code>lon</code> columns. Progress is saved as rows
+        finish: classify the same file again to resume after a stop or reload, or upload the output file.
+      </p>
+    </div>
+  );
+}
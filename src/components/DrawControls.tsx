@@ -36,6 +36,8 @@ type DrawControlsProps = {
   onCreate: (name: string, geometry: DistrictGeometry) => Promise<OperationResult>;
   onDelete: (districtId: string) => Promise<OperationResult>;
   onRename: (districtId: string, newName: string, chapterName?: string) => Promise<OperationResult>;
+  // Called with true while a boundary is being edited or drawn, false once back to idle.
+  onEditingChange?: (editing: boolean) => void;
 };
 
 export default function DrawControls({
@@ -49,6 +51,7 @@ export default function DrawControls({
   onCreate,
   onDelete,
   onRename,
+  onEditingChange,
 }: DrawControlsProps) {
   const geomanRef = useRef<GeomanApi | null>(null);
   const modeRef = useRef<DrawMode>('idle');
@@ -57,6 +60,7 @@ export default function DrawControls({
   const setMode = (mode: DrawMode) => {
     modeRef.current = mode;
     window.__districtDrawMode = mode;
+    onEditingChange?.(mode !== 'idle' && mode !== 'simple_select');
   };
 
   useEffect(() => {
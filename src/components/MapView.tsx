@@ -1,9 +1,25 @@
-import { useCallback, useEffect, useRef, useState } from 'react';
-import maplibregl, { type GeoJSONSource, type LayerSpecification, type RasterSourceSpecification } from 'maplibre-gl';
+import { useCallback, useEffect, useMemo, useRef, useState } from 'react';
+import maplibregl, {
+  type GeoJSONSource,
+  type LayerSpecification,
+  type RasterSourceSpecification,
+  type VectorTileSource,
+} from 'maplibre-gl';
 import AddressSearch from './AddressSearch';
 import DrawControls from './DrawControls';
 import PrintControls from './PrintControls';
-import { findDistrictAtPoint } from '../lib/pointInPolygon';
+import {
+  districtTileRequestHeaders,
+  districtTileUrl,
+  districtOutlinesCurrent,
+  dropDistrictOutlines,
+  fetchDistrictOutlines,
+  outlineLevelForZoom,
+  withDistrictOutlines,
+  type DistrictOutlines,
+} from '../lib/districts';
+import { findDistrictLabelPoint, locateDistrict } from '../lib/geometryWorker';
+import { isPerfPanelEnabled, measurePerf, startPerfMeasure } from '../lib/perf';
 import type {
   DistrictFeature,
   DistrictFeatureCollection,
@@ -28,12 +44,20 @@ type BasemapConfig = {
   layers: LayerSpecification[];
 };
 
+type LoadedOutlines = {
+  level: number;
+  revision: number;
+  outlines: DistrictOutlines;
+};
+
 type MapViewProps = {
   basemap: string;
   initialView: ViewState;
   onViewChange: (view: ViewState) => void;
   lineColor: DistrictLineColor;
   districts: DistrictFeatureCollection;
+  // Supabase revision of `districts`; null (fallback data) always draws full geometry.
+  districtRevision: number | null;
   selectedDistrictId: string | null;
   onSelectDistrict: (districtId: string | null) => void;
   canEdit: boolean;
@@ -46,6 +70,21 @@ type MapViewProps = {
 };
 
 const EMPTY_FC: DistrictFeatureCollection = { type: 'FeatureCollection', features: [] };
+// Beyond this share of changed features a full setData is cheaper than a diff.
+const MAX_DIFF_FRACTION = 0.5;
+const DISTRICT_GEOJSON_SOURCE = 'districts';
+const DISTRICT_TILE_SOURCE = 'districts-tiles';
+// Layer names inside each tile; must match the names passed to ST_AsMVT in district_tiles().
+const DISTRICT_TILE_LAYER = 'districts';
+const DISTRICT_TILE_LABEL_LAYER = 'district_labels';
+// How long to wait before re-reading outlines that trail the districts; the rebuild job runs
+// once a minute (see process_district_outline_queue in supabase/schema.sql).
+const OUTLINE_RETRY_MS = 60_000;
+// Tile failures in a row, for one revision, before viewing falls back to GeoJSON.
+const DISTRICT_TILE_MAX_FAILURES = 3;
+// Past this zoom tiles are overzoomed; 4096 units per z14 tile is well under a metre.
+const DISTRICT_TILE_MAX_ZOOM = 14;
+const DISTRICT_LAYER_IDS = ['district-fill', 'district-outline', 'district-label'];
 const DISTRICT_LINE_COLORS: Record<DistrictLineColor, string> = {
   green: '#00A651',
   black: '#000000',
@@ -211,30 +250,96 @@ function buildAttributesHtml(properties?: Record<string, unknown> | null): strin
   return `<div><h4 style="margin:0 0 4px 0;">${name}</h4>${chapterLine}</div>`;
 }
 
-function getFeatureCenter(feature?: DistrictFeature | null): [number, number] | null {
-  if (!feature) {
-    return null;
+/**
+ * Push `next` into the districts source. Features keep their object identity
+ * across incremental merges, so only replaced/added/removed ones are sent.
+ * Returns whether the source was touched.
+ */
+function applyDistrictData(
+  source: GeoJSONSource,
+  previous: DistrictFeatureCollection | null,
+  next: DistrictFeatureCollection,
+): boolean {
+  if (previous === next) {
+    return false;
+  }
+  if (!previous) {
+    measurePerf('map.setData', () => source.setData(next));
+    return true;
   }
 
-  const geometry = feature.geometry;
-  const ring =
-    geometry.type === 'Polygon'
-      ? geometry.coordinates[0]
-      : geometry.type === 'MultiPolygon'
-        ? geometry.coordinates[0]?.[0]
-        : undefined;
+  const previousById = new Map(previous.features.map((feature) => [feature.properties.id, feature]));
+  const nextIds = new Set<string>();
+  const add: DistrictFeature[] = [];
+  const remove: string[] = [];
+  for (const feature of next.features) {
+    const id = feature.properties.id;
+    nextIds.add(id);
+    const before = previousById.get(id);
+    if (before !== feature) {
+      add.push(feature);
+      // Replaced features are removed and re-added under the same id.
+      if (before) {
+        remove.push(id);
+      }
+    }
+  }
+  previousById.forEach((_, id) => {
+    if (!nextIds.has(id)) {
+      remove.push(id);
+    }
+  });
 
-  if (!ring?.length) {
-    return null;
+  if (!add.length && !remove.length) {
+    return false;
   }
+  if (add.length + remove.length > Math.max(1, next.features.length * MAX_DIFF_FRACTION)) {
+    measurePerf('map.setData', () => source.setData(next));
+    return true;
+  }
+  measurePerf('map.updateData', () => source.updateData({ remove, add }));
+  return true;
+}
 
-  let lon = 0;
-  let lat = 0;
-  ring.forEach(([x, y]) => {
-    lon += x;
-    lat += y;
-  });
-  return [lon / ring.length, lat / ring.length];
+function buildDistrictLayers(source: string, lineColor: string): LayerSpecification[] {
+  const onTiles = source === DISTRICT_TILE_SOURCE;
+  const sourceLayer = onTiles ? { 'source-layer': DISTRICT_TILE_LAYER } : {};
+  // Tiles carry one label point per district; labelling the clipped polygons would repeat names
+  // at tile seams.
+  const labelSourceLayer = onTiles ? { 'source-layer': DISTRICT_TILE_LABEL_LAYER } : {};
+  return [
+    {
+      id: 'district-fill',
+      type: 'fill',
+      source,
+      ...sourceLayer,
+      paint: { 'fill-color': '#00A651', 'fill-opacity': 0 },
+    } as LayerSpecification,
+    {
+      id: 'district-outline',
+      type: 'line',
+      source,
+      ...sourceLayer,
+      paint: { 'line-color': lineColor, 'line-width': 3 },
+    } as LayerSpecification,
+    {
+      id: 'district-label',
+      type: 'symbol',
+      source,
+      ...labelSourceLayer,
+      layout: {
+        'text-field': ['get', 'name'],
+        'text-size': 12,
+        'text-font': ['Noto Sans Regular'],
+        'text-allow-overlap': false,
+      },
+      paint: {
+        'text-color': '#ffffff',
+        'text-halo-color': 'rgba(0,0,0,0.8)',
+        'text-halo-width': 1.2,
+      },
+    } as LayerSpecification,
+  ];
 }
 
 function firstDrawLayerId(map: maplibregl.Map): string | undefined {
@@ -249,13 +354,30 @@ function moveDistrictLayersBelowDraw(map: maplibregl.Map): void {
   if (!drawLayerId) {
     return;
   }
-  ['district-fill', 'district-outline', 'district-label'].forEach((layerId) => {
+  DISTRICT_LAYER_IDS.forEach((layerId) => {
     if (map.getLayer(layerId)) {
       map.moveLayer(layerId, drawLayerId);
     }
   });
 }
 
+/**
+ * Point the district layers at `source`. A layer's source can't be changed in place, so they
+ * are re-created under the same ids; delegated `map.on(type, layerId)` handlers keep working.
+ */
+function setDistrictLayerSource(map: maplibregl.Map, source: string, lineColor: string): void {
+  if (map.getLayer('district-fill')?.source === source) {
+    return;
+  }
+  DISTRICT_LAYER_IDS.forEach((layerId) => {
+    if (map.getLayer(layerId)) {
+      map.removeLayer(layerId);
+    }
+  });
+  const beforeId = firstDrawLayerId(map);
+  buildDistrictLayers(source, lineColor).forEach((layer) => map.addLayer(layer, beforeId));
+}
+
 function isDrawInteractionActive(): boolean {
   const mode = window.__districtDrawMode;
   return Boolean(mode && mode !== 'idle' && mode !== 'simple_select');
@@ -277,6 +399,7 @@ export default function MapView({
   onViewChange,
   lineColor,
   districts,
+  districtRevision,
   selectedDistrictId,
   onSelectDistrict,
   canEdit,
@@ -290,6 +413,8 @@ export default function MapView({
   const mapRef = useRef<maplibregl.Map | null>(null);
   const mapNodeRef = useRef<HTMLDivElement | null>(null);
   const districtsRef = useRef(districts);
+  // Collection currently held by the map's districts source.
+  const appliedDistrictsRef = useRef<DistrictFeatureCollection | null>(null);
   const canEditRef = useRef(canEdit);
   const hoverPopupRef = useRef<maplibregl.Popup | null>(null);
   const clickPopupRef = useRef<maplibregl.Popup | null>(null);
@@ -298,6 +423,17 @@ export default function MapView({
   const [mapReady, setMapReady] = useState(false);
   const [message, setMessage] = useState('');
   const [searchResult, setSearchResult] = useState<string | null>(null);
+  const [outlineLevel, setOutlineLevel] = useState(() => outlineLevelForZoom(initialView?.zoom ?? 9));
+  const [loadedOutlines, setLoadedOutlines] = useState<LoadedOutlines | null>(null);
+  // Bumped to re-read outlines that trailed the districts when they were loaded.
+  const [outlineRetry, setOutlineRetry] = useState(0);
+  const [drawActive, setDrawActive] = useState(false);
+  // Revision whose tiles kept failing; a new revision gets another try.
+  const [tileFailedRevision, setTileFailedRevision] = useState<number | null>(null);
+  const tileFailuresRef = useRef({ revision: null as number | null, count: 0 });
+  const districtRevisionRef = useRef(districtRevision);
+  // Tile URL the vector source was last pointed at.
+  const appliedTileUrlRef = useRef<string | null>(null);
 
   const basemapConfig = BASEMAPS[(basemap as BasemapKey) || 'osm-standard'] || BASEMAPS['osm-standard'];
   const districtLineColorHex = DISTRICT_LINE_COLORS[lineColor] || DISTRICT_LINE_COLORS.green;
@@ -310,6 +446,64 @@ export default function MapView({
     canEditRef.current = canEdit;
   }, [canEdit]);
 
+  useEffect(() => {
+    districtRevisionRef.current = districtRevision;
+  }, [districtRevision]);
+
+  // Viewing reads vector tiles straight from PostGIS. Editing needs the GeoJSON source, since
+  // Geoman snaps against full geometry; so do fallback data and a failing tile endpoint.
+  const tileUrl =
+    drawActive || districtRevision === null || tileFailedRevision === districtRevision
+      ? null
+      : districtTileUrl(districtRevision);
+  // Outlines only matter when the GeoJSON source is drawn, and never while editing.
+  const wantedOutlineLevel = tileUrl || drawActive || districtRevision === null ? null : outlineLevel;
+
+  useEffect(() => {
+    if (wantedOutlineLevel === null || districtRevision === null) {
+      return;
+    }
+    let alive = true;
+    let retryTimer: ReturnType<typeof setTimeout> | null = null;
+    fetchDistrictOutlines(wantedOutlineLevel, districtRevision)
+      .then((outlines) => {
+        if (!alive) {
+          return;
+        }
+        setLoadedOutlines({ level: wantedOutlineLevel, revision: districtRevision, outlines });
+        // Saves queue the rebuild rather than run it, so right after one the outlines lag and
+        // full geometry is drawn until a later read finds the rebuilt set. An empty set means
+        // the server can't build outlines at all; there is nothing to wait for.
+        if (outlines.size && !districtOutlinesCurrent(districtsRef.current, outlines)) {
+          retryTimer = setTimeout(() => {
+            dropDistrictOutlines(wantedOutlineLevel, districtRevision);
+            setOutlineRetry((count) => count + 1);
+          }, OUTLINE_RETRY_MS);
+        }
+      })
+      .catch((err) => {
+        console.warn('District outlines unavailable. Drawing full geometry:', err);
+      });
+    return () => {
+      alive = false;
+      if (retryTimer) {
+        clearTimeout(retryTimer);
+      }
+    };
+  }, [wantedOutlineLevel, districtRevision, outlineRetry]);
+
+  // Outlines from another band or revision are never shown; full geometry covers the gap.
+  const displayedDistricts = useMemo(() => {
+    if (
+      wantedOutlineLevel === null ||
+      loadedOutlines?.level !== wantedOutlineLevel ||
+      loadedOutlines.revision !== districtRevision
+    ) {
+      return districts;
+    }
+    return withDistrictOutlines(districts, loadedOutlines.outlines);
+  }, [districts, districtRevision, wantedOutlineLevel, loadedOutlines]);
+
   useEffect(() => {
     if (!mapNodeRef.current) {
       return;
@@ -322,47 +516,24 @@ export default function MapView({
         glyphs: 'https://demotiles.maplibre.org/font/{fontstack}/{range}.pbf',
         sources: {
           ...basemapConfig.sources,
-          districts: { type: 'geojson', data: districtsRef.current || EMPTY_FC },
+          // promoteId lets incremental updates address features by district id.
+          [DISTRICT_GEOJSON_SOURCE]: { type: 'geojson', data: districtsRef.current || EMPTY_FC, promoteId: 'id' },
         },
-        layers: [
-          ...basemapConfig.layers,
-          {
-            id: 'district-fill',
-            type: 'fill',
-            source: 'districts',
-            paint: { 'fill-color': '#00A651', 'fill-opacity': 0 },
-          } as LayerSpecification,
-          {
-            id: 'district-outline',
-            type: 'line',
-            source: 'districts',
-            paint: { 'line-color': districtLineColorHex, 'line-width': 3 },
-          } as LayerSpecification,
-          {
-            id: 'district-label',
-            type: 'symbol',
-            source: 'districts',
-            layout: {
-              'text-field': ['get', 'name'],
-              'text-size': 12,
-              'text-font': ['Noto Sans Regular'],
-              'text-allow-overlap': false,
-            },
-            paint: {
-              'text-color': '#ffffff',
-              'text-halo-color': 'rgba(0,0,0,0.8)',
-              'text-halo-width': 1.2,
-            },
-          } as LayerSpecification,
-        ],
+        layers: [...basemapConfig.layers, ...buildDistrictLayers(DISTRICT_GEOJSON_SOURCE, districtLineColorHex)],
+      },
+      transformRequest: (url) => {
+        const headers = districtTileRequestHeaders(url);
+        return headers ? { url, headers } : undefined;
       },
       center: initialView?.center || [-97.74, 30.28],
       zoom: initialView?.zoom ?? 9,
     });
+    map.once('idle', startPerfMeasure('map.firstIdle'));
 
     map.addControl(new maplibregl.NavigationControl(), 'top-right');
 
     mapRef.current = map;
+    appliedDistrictsRef.current = districtsRef.current || EMPTY_FC;
     setMapReady(true);
 
     map.on('load', () => {
@@ -399,7 +570,9 @@ export default function MapView({
         if (!map.getLayer('district-fill')) {
           return;
         }
-        const hits = map.queryRenderedFeatures(event.point, { layers: ['district-fill'] });
+        const hits = measurePerf('map.clickQuery', () =>
+          map.queryRenderedFeatures(event.point, { layers: ['district-fill'] }),
+        );
         if (hits.length === 0) {
           onSelectDistrict(null);
           if (clickPopupRef.current) {
@@ -440,6 +613,48 @@ export default function MapView({
           hoverPopupRef.current.remove();
         }
       });
+
+      // The layer-scoped mousemove above runs this same query internally, out of reach of a
+      // measure; with the perf panel on, repeat it once per move so hover cost can be read.
+      if (isPerfPanelEnabled()) {
+        map.on('mousemove', (event) => {
+          if (map.getLayer('district-fill')) {
+            measurePerf('map.hoverQuery', () =>
+              map.queryRenderedFeatures(event.point, { layers: ['district-fill'] }),
+            );
+          }
+        });
+      }
+    });
+
+    // A single failed tile is retried by MapLibre on the next pan; only repeated failures with no
+    // successful tile in between give up on tiles, and only for the current revision.
+    map.on('error', (event) => {
+      if ((event as { sourceId?: string }).sourceId !== DISTRICT_TILE_SOURCE) {
+        return;
+      }
+      const revision = districtRevisionRef.current;
+      const failures = tileFailuresRef.current;
+      if (failures.revision !== revision) {
+        failures.revision = revision;
+        failures.count = 0;
+      }
+      failures.count += 1;
+      console.warn('District tile failed to load:', event.error);
+      if (failures.count >= DISTRICT_TILE_MAX_FAILURES) {
+        console.warn('District tiles keep failing. Falling back to GeoJSON until the next revision.');
+        setTileFailedRevision(revision);
+      }
+    });
+
+    map.on('sourcedata', (event) => {
+      if (event.sourceId === DISTRICT_TILE_SOURCE && event.tile) {
+        tileFailuresRef.current.count = 0;
+      }
+    });
+
+    map.on('zoom', () => {
+      setOutlineLevel(outlineLevelForZoom(map.getZoom()));
     });
 
     map.on('moveend', () => {
@@ -477,6 +692,8 @@ export default function MapView({
       }
       map.remove();
       mapRef.current = null;
+      appliedDistrictsRef.current = null;
+      appliedTileUrlRef.current = null;
       setMapReady(false);
     };
   }, []);
@@ -488,9 +705,32 @@ export default function MapView({
     }
 
     const syncData = () => {
-      const source = map.getSource('districts');
-      if (source && 'setData' in source) {
-        (source as GeoJSONSource).setData(districts || EMPTY_FC);
+      if (tileUrl) {
+        const tileSource = map.getSource(DISTRICT_TILE_SOURCE) as VectorTileSource | undefined;
+        if (!tileSource) {
+          map.addSource(DISTRICT_TILE_SOURCE, {
+            type: 'vector',
+            tiles: [tileUrl],
+            maxzoom: DISTRICT_TILE_MAX_ZOOM,
+            promoteId: 'id',
+          });
+        } else if (appliedTileUrlRef.current !== tileUrl) {
+          tileSource.setTiles([tileUrl]);
+        }
+        appliedTileUrlRef.current = tileUrl;
+        setDistrictLayerSource(map, DISTRICT_TILE_SOURCE, districtLineColorHex);
+      } else {
+        // The GeoJSON source is left untouched while tiles are drawn and caught up here.
+        const source = map.getSource(DISTRICT_GEOJSON_SOURCE);
+        if (source && 'setData' in source) {
+          const next = displayedDistricts || EMPTY_FC;
+          if (applyDistrictData(source as GeoJSONSource, appliedDistrictsRef.current, next)) {
+            // setData only hands off to MapLibre's worker; the next idle is when it is drawn.
+            map.once('idle', startPerfMeasure('map.dataToIdle'));
+          }
+          appliedDistrictsRef.current = next;
+        }
+        setDistrictLayerSource(map, DISTRICT_GEOJSON_SOURCE, districtLineColorHex);
       }
       if (map.getLayer('district-outline')) {
         map.setPaintProperty('district-outline', 'line-color', districtLineColorHex);
@@ -511,10 +751,12 @@ export default function MapView({
     return () => {
       map.off('load', syncData);
     };
-  }, [districts, districtLineColorHex, selectedDistrictId]);
+  }, [tileUrl, displayedDistricts, districtLineColorHex, selectedDistrictId]);
 
   const handleSearchResult = useCallback(
-    (result: { lat: number; lon: number }) => {
+    async (result: { lat: number; lon: number }) => {
+      const lngLat: [number, number] = [result.lon, result.lat];
+      const district = await locateDistrict(lngLat, districtsRef.current);
       const map = mapRef.current;
       if (!map) {
         return;
@@ -528,8 +770,6 @@ export default function MapView({
         searchPopupRef.current.remove();
       }
 
-      const lngLat: [number, number] = [result.lon, result.lat];
-      const district = findDistrictAtPoint(lngLat, districtsRef.current);
       const districtLabel = district ? district.properties.name : 'No district';
       setSearchResult(districtLabel);
 
@@ -549,18 +789,24 @@ export default function MapView({
     [],
   );
 
+  // Only a new selection moves the camera; realtime updates from other editors replace
+  // `districts` and must not pull the view back to the selected district.
   useEffect(() => {
     const map = mapRef.current;
     if (!map || !selectedDistrictId) {
       return;
     }
 
-    const feature = districts.features.find((entry) => entry.properties?.id === selectedDistrictId);
-    const center = getFeatureCenter(feature);
-    if (center) {
-      map.flyTo({ center, zoom: 11.2, essential: true });
-    }
-  }, [districts, selectedDistrictId]);
+    let alive = true;
+    void findDistrictLabelPoint(selectedDistrictId, districtsRef.current).then((center) => {
+      if (alive && center) {
+        map.flyTo({ center, zoom: 11.2, essential: true });
+      }
+    });
+    return () => {
+      alive = false;
+    };
+  }, [selectedDistrictId]);
 
   return (
     <>
@@ -594,6 +840,7 @@ export default function MapView({
           setTimeout(() => setMessage(''), 2500);
           return result;
         }}
+        onEditingChange={setDrawActive}
         onRename={async (districtId, newName, chapterName) => {
           const result = await onDistrictRename(districtId, newName, chapterName);
           setMessage(result.message);
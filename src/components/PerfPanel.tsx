@@ -0,0 +1,95 @@
+import { useEffect, useRef, useState } from 'react';
+import { clearPerfStats, exportPerfReport, getPerfStats, subscribePerfStats } from '../lib/perf';
+
+function formatMs(ms: number): string {
+  return ms >= 100 ? ms.toFixed(0) : ms.toFixed(1);
+}
+
+export default function PerfPanel() {
+  const [open, setOpen] = useState(false);
+  const [stats, setStats] = useState(getPerfStats);
+  const panelRef = useRef<HTMLDivElement>(null);
+
+  // Hover measures arrive on every mousemove, so only re-render while the table is showing.
+  useEffect(() => {
+    if (!open) return;
+    setStats(getPerfStats());
+    return subscribePerfStats(setStats);
+  }, [open]);
+
+  useEffect(() => {
+    if (!open) return;
+
+    const handleClickOutside = (event: MouseEvent) => {
+      if (panelRef.current && !panelRef.current.contains(event.target as Node)) {
+        setOpen(false);
+      }
+    };
+
+    document.addEventListener('mousedown', handleClickOutside);
+    return () => document.removeEventListener('mousedown', handleClickOutside);
+  }, [open]);
+
+  const exportJson = () => {
+    const report = exportPerfReport();
+    const url = URL.createObjectURL(new Blob([JSON.stringify(report, null, 2)], { type: 'application/json' }));
+    const link = document.createElement('a');
+    link.href = url;
+    link.download = `district-map-perf-${report.generatedAt.replace(/[:.]/g, '-')}.json`;
+    link.click();
+    URL.revokeObjectURL(url);
+  };
+
+  return (
+    <div className="perf-indicator" ref={panelRef}>
+      <button
+        className="perf-toggle"
+        onClick={() => setOpen((prev) => !prev)}
+        title="Performance timings"
+        aria-label="Toggle performance panel"
+      >
+        ⏱
+      </button>
+      {open ? (
+        <div className="status-panel perf-panel">
+          {stats.length ? (
+            <table className="perf-table">
+              <thead>
+                <tr>
+                  <th>Stage (ms)</th>
+                  <th>n</th>
+                  <th>last</th>
+                  <th>p50</th>
+                  <th>p95</th>
+                  <th>max</th>
+                </tr>
+              </thead>
+              <tbody>
+                {stats.map((row) => (
+                  <tr key={row.stage}>
+                    <td>{row.stage}</td>
+                    <td>{row.count}</td>
+                    <td>{formatMs(row.lastMs)}</td>
+                    <td>{formatMs(row.medianMs)}</td>
+                    <td>{formatMs(row.p95Ms)}</td>
+                    <td>{formatMs(row.maxMs)}</td>
+                  </tr>
+                ))}
+              </tbody>
+            </table>
+          ) : (
+            <div className="status-panel-detail">Nothing measured yet.</div>
+          )}
+          <div className="perf-actions">
+            <button onClick={exportJson} disabled={!stats.length}>
+              Export JSON
+            </button>
+            <button onClick={clearPerfStats} disabled={!stats.length}>
+              Clear
+            </button>
+          </div>
+        </div>
+      ) : null}
+    </div>
+  );
+}
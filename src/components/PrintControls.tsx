@@ -1,5 +1,6 @@
 import { useCallback, useEffect, useRef, useState } from 'react';
 import type maplibregl from 'maplibre-gl';
+import { startPerfMeasure } from '../lib/perf';
 
 type PaperSize = 'letter' | 'legal' | 'tabloid' | 'a4' | 'a3';
 type Orientation = 'landscape' | 'portrait';
@@ -99,7 +100,9 @@ export default function PrintControls({ mapRef }: PrintControlsProps) {
     styleTagRef.current = style;
 
     // Wait for map tiles to load, then print
+    const stopTileWait = startPerfMeasure('print.tileWait');
     const doPrint = () => {
+      stopTileWait();
       window.print();
       // Clean up after print dialog closes
       if (styleTagRef.current) {
@@ -1,4 +1,5 @@
 import type { User } from '@supabase/supabase-js';
+import BatchClassify from './BatchClassify';
 import type {
   AppRole,
   BoundaryEdit,
@@ -114,6 +115,11 @@ export default function Sidebar({
         </ul>
       </section>
 
+      <section className="section section-batch">
+        <h2>Bulk Classify</h2>
+        <BatchClassify districts={districts} />
+      </section>
+
       <section className="section section-history">
         <h2>Recent Edits</h2>
         <ul className="history-list">
@@ -1,4 +1,5 @@
 import { useEffect, useRef, useState } from 'react';
+import { getGeocodeCacheStats, subscribeGeocodeCacheStats } from '../lib/geocode';
 import type { SystemAuthStatus, SystemSupabaseStatus } from '../types/domain';
 
 type StatusIndicatorProps = {
@@ -26,8 +27,11 @@ function authLabel(state: SystemAuthStatus['state']): string {
 
 export default function StatusIndicator({ supabaseStatus, authStatus }: StatusIndicatorProps) {
   const [open, setOpen] = useState(false);
+  const [geocodeStats, setGeocodeStats] = useState(getGeocodeCacheStats);
   const panelRef = useRef<HTMLDivElement>(null);
 
+  useEffect(() => subscribeGeocodeCacheStats(setGeocodeStats), []);
+
   useEffect(() => {
     if (!open) return;
 
@@ -69,6 +73,12 @@ export default function StatusIndicator({ supabaseStatus, authStatus }: StatusIn
           {authStatus.message ? (
             <div className="status-panel-detail">{authStatus.message}</div>
           ) : null}
+          <div className="status-panel-row">
+            <span className="status-panel-label">Geocode cache</span>
+            <span className="status-panel-detail">
+              {geocodeStats.hits} hits / {geocodeStats.misses} misses
+            </span>
+          </div>
         </div>
       ) : null}
     </div>
@@ -0,0 +1,411 @@
+import { isAbortError, wait } from './async';
+import { createCsvParser, formatCsvRow } from './csv';
+import { geocodeAddress, type Geocoder } from './geocode';
+import { locateDistrict } from './geometryWorker';
+import { requestToPromise, withStore } from './idb';
+import type { DistrictFeatureCollection } from '../types/domain';
+
+export type BatchRowStatus = 'matched' | 'no_district' | 'not_found' | 'invalid' | 'error' | 'pending';
+
+export type BatchProgress = {
+  rowsDone: number;
+  matched: number;
+  noDistrict: number;
+  notFound: number;
+  invalid: number;
+  failed: number;
+  // Rows already classified by an earlier run and passed through unchanged.
+  skipped: number;
+};
+
+type BatchOptions = {
+  districts: DistrictFeatureCollection;
+  geocoder?: Geocoder;
+  // Maximum geocoder calls in flight at once.
+  concurrency?: number;
+  // Minimum spacing between geocoder calls. `geocodeAddress` already throttles its own
+  // network requests, so this is only needed for geocoders that don't.
+  minIntervalMs?: number;
+  maxRetries?: number;
+  onProgress?: (progress: BatchProgress) => void;
+  // Output lines of rows an interrupted run already finished, by data row index; passed through as is.
+  completedRows?: Map<number, string>;
+  // Called in row order for each row this run classifies with a final status, for persisting progress.
+  onRowCompleted?: (rowIndex: number, line: string) => void;
+  signal?: AbortSignal;
+};
+
+type ColumnLayout = {
+  width: number;
+  address: number;
+  addressParts: number[];
+  lat: number;
+  lon: number;
+  output: Record<(typeof OUTPUT_COLUMNS)[number], number>;
+};
+
+type BatchRowRecord = {
+  fileKey: string;
+  rowIndex: number;
+  line: string;
+};
+
+type BufferedRow = Promise<{ rowIndex: number; line: string; status: BatchRowStatus | 'skipped' }>;
+
+type RowResult = {
+  status: BatchRowStatus;
+  districtId?: string;
+  districtName?: string;
+  lat?: number;
+  lon?: number;
+  note?: string;
+};
+
+export const OUTPUT_COLUMNS = [
+  'district_id',
+  'district_name',
+  'match_lat',
+  'match_lon',
+  'match_status',
+  'match_note',
+] as const;
+
+const ADDRESS_COLUMNS = ['address', 'full_address', 'street_address'];
+const ADDRESS_PART_COLUMNS = ['street', 'address1', 'address2', 'city', 'state', 'zip', 'zip_code', 'zipcode', 'postal_code'];
+const LAT_COLUMNS = ['lat', 'latitude'];
+const LON_COLUMNS = ['lon', 'lng', 'long', 'longitude'];
+// Statuses that a re-run treats as final; anything else (error, pending, blank) is retried.
+const FINAL_STATUSES = new Set<string>(['matched', 'no_district', 'not_found', 'invalid']);
+const PROGRESS_INTERVAL_MS = 200;
+const RETRY_BASE_DELAY_MS = 2000;
+const BATCH_ROWS_STORE = 'batchRows';
+// Completed rows are written to IndexedDB in groups: every this many rows or this often.
+const PERSIST_BATCH_ROWS = 50;
+const PERSIST_INTERVAL_MS = 1000;
+
+function createLimiter(concurrency: number, minIntervalMs: number) {
+  let active = 0;
+  let nextSlotAt = 0;
+  const queue: Array<() => void> = [];
+
+  const release = () => {
+    active -= 1;
+    queue.shift()?.();
+  };
+
+  return async <T>(task: () => Promise<T>, signal?: AbortSignal): Promise<T> => {
+    if (active >= concurrency) {
+      await new Promise<void>((resolve) => queue.push(resolve));
+    }
+    active += 1;
+    try {
+      const now = Date.now();
+      const startAt = Math.max(now, nextSlotAt);
+      nextSlotAt = startAt + minIntervalMs;
+      if (startAt > now) {
+        await wait(startAt - now, signal);
+      }
+      return await task();
+    } finally {
+      release();
+    }
+  };
+}
+
+function findColumn(header: string[], candidates: string[]): number {
+  return header.findIndex((name) => candidates.includes(name));
+}
+
+function layoutColumns(rawHeader: string[]): { layout: ColumnLayout; outputHeader: string[] } {
+  const header = rawHeader.map((name) => name.trim().toLowerCase());
+  const outputHeader = [...rawHeader];
+  const output = {} as ColumnLayout['output'];
+  for (const column of OUTPUT_COLUMNS) {
+    let index = header.indexOf(column);
+    if (index < 0) {
+      index = outputHeader.length;
+      outputHeader.push(column);
+    }
+    output[column] = index;
+  }
+
+  return {
+    layout: {
+      width: outputHeader.length,
+      address: findColumn(header, ADDRESS_COLUMNS),
+      addressParts: ADDRESS_PART_COLUMNS.map((name) => header.indexOf(name)).filter((index) => index >= 0),
+      lat: findColumn(header, LAT_COLUMNS),
+      lon: findColumn(header, LON_COLUMNS),
+      output,
+    },
+    outputHeader,
+  };
+}
+
+function parseCoordinate(value: string | undefined): number | null {
+  if (value === undefined || value.trim() === '') {
+    return null;
+  }
+  const parsed = Number(value);
+  return Number.isFinite(parsed) ? parsed : null;
+}
+
+function buildQuery(row: string[], layout: ColumnLayout): string {
+  if (layout.address >= 0 && row[layout.address]?.trim()) {
+    return row[layout.address].trim();
+  }
+  return layout.addressParts
+    .map((index) => row[index]?.trim())
+    .filter(Boolean)
+    .join(', ');
+}
+
+function writeRow(row: string[], layout: ColumnLayout, result: RowResult): string {
+  const out = Array.from({ length: layout.width }, (_, index) => row[index] ?? '');
+  out[layout.output.district_id] = result.districtId ?? '';
+  out[layout.output.district_name] = result.districtName ?? '';
+  out[layout.output.match_lat] = result.lat === undefined ? '' : result.lat.toFixed(6);
+  out[layout.output.match_lon] = result.lon === undefined ? '' : result.lon.toFixed(6);
+  out[layout.output.match_status] = result.status;
+  out[layout.output.match_note] = result.note ?? '';
+  return formatCsvRow(out);
+}
+
+/**
+ * Stream a CSV of addresses (or lat/lon rows) through geocoding and district
+ * classification, yielding the annotated CSV line by line in input order.
+ *
+ * Every input row is always written out. Rows that failed or were not reached
+ * before an abort are marked `error`/`pending`, and feeding the output back in
+ * re-processes only those rows, which is how an interrupted run is resumed.
+ * Within one browser, `completedRows`/`onRowCompleted` do the same for the original
+ * file without a download, which also survives a reload or crash.
+ */
+export async function* classifyCsv(chunks: AsyncIterable<string>, options: BatchOptions): AsyncGenerator<string> {
+  const {
+    districts,
+    geocoder = geocodeAddress,
+    concurrency = 2,
+    minIntervalMs = 0,
+    maxRetries = 2,
+    onProgress,
+    completedRows,
+    onRowCompleted,
+    signal,
+  } = options;
+  const limit = createLimiter(Math.max(1, concurrency), Math.max(0, minIntervalMs));
+  const maxBuffered = Math.max(1, concurrency) * 8;
+  const progress: BatchProgress = { rowsDone: 0, matched: 0, noDistrict: 0, notFound: 0, invalid: 0, failed: 0, skipped: 0 };
+  let lastProgressAt = 0;
+  let layout: ColumnLayout | null = null;
+
+  const geocodeWithRetry = async (query: string) => {
+    for (let attempt = 0; ; attempt++) {
+      try {
+        return await limit(() => geocoder(query, { signal }), signal);
+      } catch (error) {
+        if (isAbortError(error) || attempt >= maxRetries) {
+          throw error;
+        }
+        await wait(RETRY_BASE_DELAY_MS * 2 ** attempt, signal);
+      }
+    }
+  };
+
+  const classifyRow = async (row: string[], rowLayout: ColumnLayout): Promise<RowResult> => {
+    if (signal?.aborted) {
+      return { status: 'pending' };
+    }
+
+    let lat = parseCoordinate(row[rowLayout.lat]);
+    let lon = parseCoordinate(row[rowLayout.lon]);
+    let note = '';
+
+    if (lat === null || lon === null) {
+      const query = buildQuery(row, rowLayout);
+      if (!query) {
+        return { status: 'invalid', note: 'No address or coordinates.' };
+      }
+      try {
+        const geocoded = await geocodeWithRetry(query);
+        if (!geocoded) {
+          return { status: 'not_found' };
+        }
+        lat = geocoded.lat;
+        lon = geocoded.lon;
+        note = geocoded.displayName;
+      } catch (error) {
+        if (isAbortError(error)) {
+          return { status: 'pending' };
+        }
+        return { status: 'error', note: error instanceof Error ? error.message : 'Geocoding failed.' };
+      }
+    }
+
+    if (Math.abs(lat) > 90 || Math.abs(lon) > 180) {
+      return { status: 'invalid', note: 'Coordinates out of range.' };
+    }
+
+    const district = await locateDistrict([lon, lat], districts);
+    if (!district) {
+      return { status: 'no_district', lat, lon, note };
+    }
+    return {
+      status: 'matched',
+      districtId: district.properties.id,
+      districtName: district.properties.name,
+      lat,
+      lon,
+      note,
+    };
+  };
+
+  const record = (status: BatchRowStatus | 'skipped') => {
+    progress.rowsDone += 1;
+    if (status === 'matched') progress.matched += 1;
+    else if (status === 'no_district') progress.noDistrict += 1;
+    else if (status === 'not_found') progress.notFound += 1;
+    else if (status === 'invalid') progress.invalid += 1;
+    else if (status === 'skipped') progress.skipped += 1;
+    else progress.failed += 1;
+
+    const now = Date.now();
+    if (onProgress && now - lastProgressAt >= PROGRESS_INTERVAL_MS) {
+      lastProgressAt = now;
+      onProgress({ ...progress });
+    }
+  };
+
+  // Rows start classifying as they are enqueued, so capping this also caps the work in flight.
+  const buffered: BufferedRow[] = [];
+  let nextRowIndex = 0;
+
+  const enqueue = (row: string[]) => {
+    const rowLayout = layout as ColumnLayout;
+    const rowIndex = nextRowIndex++;
+    const completedLine = completedRows?.get(rowIndex);
+    if (completedLine !== undefined) {
+      buffered.push(Promise.resolve({ rowIndex, line: completedLine, status: 'skipped' }));
+      return;
+    }
+    const previousStatus = row[rowLayout.output.match_status]?.trim();
+    if (previousStatus && FINAL_STATUSES.has(previousStatus)) {
+      const out = Array.from({ length: rowLayout.width }, (_, index) => row[index] ?? '');
+      buffered.push(Promise.resolve({ rowIndex, line: formatCsvRow(out), status: 'skipped' }));
+      return;
+    }
+    buffered.push(
+      classifyRow(row, rowLayout).then((result) => ({
+        rowIndex,
+        line: writeRow(row, rowLayout, result),
+        status: result.status,
+      })),
+    );
+  };
+
+  const drainTo = async function* (size: number): AsyncGenerator<string> {
+    while (buffered.length > size) {
+      const next = await (buffered.shift() as BufferedRow);
+      record(next.status);
+      if (FINAL_STATUSES.has(next.status)) {
+        onRowCompleted?.(next.rowIndex, next.line);
+      }
+      yield next.line;
+    }
+  };
+
+  const parser = createCsvParser();
+  const handleRows = async function* (rows: string[][]): AsyncGenerator<string> {
+    for (const row of rows) {
+      if (!layout) {
+        const { layout: detected, outputHeader } = layoutColumns(row);
+        if (detected.address < 0 && !detected.addressParts.length && (detected.lat < 0 || detected.lon < 0)) {
+          throw new Error('CSV needs an "address" column or "lat"/"lon" columns.');
+        }
+        layout = detected;
+        yield formatCsvRow(outputHeader);
+        continue;
+      }
+      enqueue(row);
+      yield* drainTo(maxBuffered - 1);
+    }
+  };
+
+  for await (const chunk of chunks) {
+    yield* handleRows(parser.push(chunk));
+  }
+  yield* handleRows(parser.flush());
+  yield* drainTo(0);
+
+  onProgress?.({ ...progress });
+}
+
+/** Identifies an input file across page loads, so an interrupted run can pick up where it stopped. */
+export function batchFileKey(file: File): string {
+  return `${file.name}:${file.size}:${file.lastModified}`;
+}
+
+function fileRange(fileKey: string): IDBKeyRange {
+  return IDBKeyRange.bound([fileKey, 0], [fileKey, Infinity]);
+}
+
+/** Output lines of rows already finished for `fileKey`, for `completedRows`. Empty if storage is unavailable. */
+export async function loadCompletedRows(fileKey: string): Promise<Map<number, string>> {
+  try {
+    const records = await withStore(BATCH_ROWS_STORE, 'readonly', (store) =>
+      requestToPromise(store.getAll(fileRange(fileKey)) as IDBRequest<BatchRowRecord[]>),
+    );
+    return new Map((records ?? []).map((record) => [record.rowIndex, record.line]));
+  } catch (err) {
+    console.warn('Batch progress read failed:', err);
+    return new Map();
+  }
+}
+
+export async function clearCompletedRows(fileKey: string): Promise<void> {
+  try {
+    await withStore(BATCH_ROWS_STORE, 'readwrite', (store) => {
+      store.delete(fileRange(fileKey));
+    });
+  } catch (err) {
+    console.warn('Batch progress clear failed:', err);
+  }
+}
+
+/**
+ * Buffer completed rows and write them to IndexedDB in small transactions, so a reload or
+ * crash loses at most the last few rows. `flush` writes whatever is pending and waits for it.
+ */
+export function createCompletedRowWriter(fileKey: string) {
+  let pending: BatchRowRecord[] = [];
+  let lastFlushAt = Date.now();
+  let writing: Promise<void> = Promise.resolve();
+
+  const flush = (): Promise<void> => {
+    lastFlushAt = Date.now();
+    if (pending.length) {
+      const batch = pending;
+      pending = [];
+      writing = writing
+        .then(() =>
+          withStore(BATCH_ROWS_STORE, 'readwrite', (store) => {
+            batch.forEach((record) => store.put(record));
+          }),
+        )
+        .then(
+          () => undefined,
+          (err) => console.warn('Batch progress write failed:', err),
+        );
+    }
+    return writing;
+  };
+
+  const add = (rowIndex: number, line: string) => {
+    pending.push({ fileKey, rowIndex, line });
+    if (pending.length >= PERSIST_BATCH_ROWS || Date.now() - lastFlushAt >= PERSIST_INTERVAL_MS) {
+      void flush();
+    }
+  };
+
+  return { add, flush };
+}
@@ -0,0 +1,123 @@
+// Minimal RFC 4180 CSV support. The parser is incremental so large files can be
+// streamed chunk by chunk; quoted fields may contain commas, quotes and newlines.
+
+export type CsvParser = {
+  push: (chunk: string) => string[][];
+  flush: () => string[][];
+};
+
+export function createCsvParser(): CsvParser {
+  let field = '';
+  let row: string[] = [];
+  let inQuotes = false;
+  let pendingQuote = false;
+  let pendingCarriageReturn = false;
+  let rowHasContent = false;
+
+  const endField = () => {
+    row.push(field);
+    field = '';
+  };
+
+  const endRow = (rows: string[][]) => {
+    endField();
+    if (rowHasContent || row.length > 1 || row[0] !== '') {
+      rows.push(row);
+    }
+    row = [];
+    rowHasContent = false;
+  };
+
+  const push = (chunk: string): string[][] => {
+    const rows: string[][] = [];
+    for (let i = 0; i < chunk.length; i++) {
+      const char = chunk[i];
+
+      if (pendingCarriageReturn) {
+        pendingCarriageReturn = false;
+        if (char === '\n') {
+          continue;
+        }
+      }
+
+      if (inQuotes) {
+        if (pendingQuote) {
+          pendingQuote = false;
+          if (char === '"') {
+            field += '"';
+            continue;
+          }
+          inQuotes = false;
+        } else if (char === '"') {
+          pendingQuote = true;
+          continue;
+        } else {
+          field += char;
+          continue;
+        }
+      }
+
+      if (char === '"' && field === '') {
+        inQuotes = true;
+        rowHasContent = true;
+      } else if (char === ',') {
+        endField();
+      } else if (char === '\n' || char === '\r') {
+        pendingCarriageReturn = char === '\r';
+        endRow(rows);
+      } else {
+        field += char;
+        rowHasContent = true;
+      }
+    }
+    return rows;
+  };
+
+  const flush = (): string[][] => {
+    const rows: string[][] = [];
+    pendingQuote = false;
+    inQuotes = false;
+    if (field !== '' || row.length || rowHasContent) {
+      endRow(rows);
+    }
+    return rows;
+  };
+
+  return { push, flush };
+}
+
+function formatCsvField(value: unknown): string {
+  const text = value === null || value === undefined ? '' : String(value);
+  return /[",\r\n]/.test(text) ? `"${text.replaceAll('"', '""')}"` : text;
+}
+
+export function formatCsvRow(fields: unknown[]): string {
+  return `${fields.map(formatCsvField).join(',')}\r\n`;
+}
+
+/** Decode a Blob/File as a stream of text chunks, reporting bytes consumed as it goes. */
+export async function* readTextChunks(
+  blob: Blob,
+  onBytesRead?: (bytesRead: number, totalBytes: number) => void,
+): AsyncGenerator<string> {
+  const reader = blob.stream().getReader();
+  const decoder = new TextDecoder();
+  let bytesRead = 0;
+  try {
+    while (true) {
+      const { done, value } = await reader.read();
+      if (done) {
+        break;
+      }
+      bytesRead += value.byteLength;
+      onBytesRead?.(bytesRead, blob.size);
+      yield decoder.decode(value, { stream: true });
+    }
+    const tail = decoder.decode();
+    if (tail) {
+      yield tail;
+    }
+  } finally {
+    reader.releaseLock();
+  }
+}
@@ -0,0 +1,226 @@
+// Pure parsing and validation of district data. Kept free of Supabase, IndexedDB and DOM
+// dependencies so the geometry worker can run it off the main thread.
+import type { Geometry, Position } from 'geojson';
+import type { DistrictFeature, DistrictFeatureCollection, DistrictGeometry } from '../types/domain';
+
+const FALLBACK_DISTRICT_ORDER = [
+  'Leander',
+  'Round Rock',
+  'Cedar Park',
+  'Pflugerville',
+  'Lakeline',
+  'Wells Branch',
+  'Walnut Creek',
+  'Hyde Park',
+  'Downtown',
+  'South-Mopac',
+  'Live Oak',
+  'Brodie',
+  'Searight',
+  'Hill Country',
+  'Bastrop',
+  'College Station',
+  'Del Valle',
+] as const;
+
+const SOURCE_NAME_TO_CANONICAL: Record<string, (typeof FALLBACK_DISTRICT_ORDER)[number]> = {
+  'Crystal Falls': 'Leander',
+  'Crystal Fall': 'Leander',
+  'Round Rock': 'Round Rock',
+  'Cedar Park': 'Cedar Park',
+  Pflugerville: 'Pflugerville',
+  Lakeline: 'Lakeline',
+  'Wells Branch': 'Wells Branch',
+  'Walnut Creek': 'Walnut Creek',
+  'Hyde Park': 'Hyde Park',
+  // Delwood polygon is pre-merged into Hyde Park in the GeoJSON,
+  // but keep the alias in case any legacy source still labels it Delwood.
+  Delwood: 'Hyde Park',
+  Downtown: 'Downtown',
+  'South Mopac': 'South-Mopac',
+  'Live Oak': 'Live Oak',
+  Brodie: 'Brodie',
+  Searight: 'Searight',
+  'Hill Country': 'Hill Country',
+  Bastrop: 'Bastrop',
+  'College Station': 'College Station',
+  'Del Valle': 'Del Valle',
+};
+
+const DISTRICT_ID_BY_NAME: Record<(typeof FALLBACK_DISTRICT_ORDER)[number], string> = {
+  Leander: 'leander',
+  'Round Rock': 'round-rock',
+  'Cedar Park': 'cedar-park',
+  Pflugerville: 'pflugerville',
+  Lakeline: 'lakeline',
+  'Wells Branch': 'wells-branch',
+  'Walnut Creek': 'walnut-creek',
+  'Hyde Park': 'hyde-park',
+  Downtown: 'downtown',
+  'South-Mopac': 'south-mopac',
+  'Live Oak': 'live-oak',
+  Brodie: 'brodie',
+  Searight: 'searight',
+  'Hill Country': 'hill-country',
+  Bastrop: 'bastrop',
+  'College Station': 'college-station',
+  'Del Valle': 'del-valle',
+};
+
+export type DistrictRow = {
+  id: string;
+  name: string;
+  chapter_name: string | null;
+  color: string | null;
+  geometry: Geometry | string | null;
+  is_active: boolean;
+  revision: number | null;
+};
+
+type FallbackFeatureLike = {
+  type?: string;
+  properties?: Record<string, unknown>;
+  geometry?: Geometry;
+};
+
+export type FallbackCollectionLike = {
+  type?: string;
+  features?: FallbackFeatureLike[];
+};
+
+function normalizeDistrictName(name: string): string {
+  if (name === 'Crystal Falls' || name === 'Crystal Fall') {
+    return 'Leander';
+  }
+  return name;
+}
+
+export function normalizeFallbackDistricts(rawCollection: FallbackCollectionLike): DistrictFeatureCollection {
+  const featuresByName = new Map<string, DistrictFeature>();
+
+  for (const feature of rawCollection?.features || []) {
+    const sourceName =
+      (feature?.properties?.name as string | undefined) ||
+      (feature?.properties?.Name as string | undefined) ||
+      (feature?.properties?.District as string | undefined) ||
+      '';
+
+    const canonicalName = SOURCE_NAME_TO_CANONICAL[sourceName];
+    if (!canonicalName || featuresByName.has(canonicalName) || !feature.geometry) {
+      continue;
+    }
+
+    featuresByName.set(canonicalName, {
+      type: 'Feature',
+      properties: {
+        id: DISTRICT_ID_BY_NAME[canonicalName],
+        name: canonicalName,
+        color: '#FFD700',
+      },
+      geometry: feature.geometry as DistrictGeometry,
+    });
+  }
+
+  return {
+    type: 'FeatureCollection',
+    features: FALLBACK_DISTRICT_ORDER.map((name) => featuresByName.get(name)).filter(
+      (feature): feature is DistrictFeature => Boolean(feature),
+    ),
+  };
+}
+
+export function parseMaybeJson(value: Geometry | string | null): Geometry | null {
+  if (value && typeof value === 'object') {
+    return value;
+  }
+  if (typeof value !== 'string') {
+    return null;
+  }
+  try {
+    return JSON.parse(value) as Geometry;
+  } catch {
+    return null;
+  }
+}
+
+export function isValidGeometry(geometry: Geometry | null): geometry is DistrictGeometry {
+  if (!geometry || typeof geometry !== 'object') {
+    return false;
+  }
+  const allowedTypes = new Set(['Polygon', 'MultiPolygon']);
+  if (!allowedTypes.has(geometry.type)) {
+    return false;
+  }
+  return Array.isArray((geometry as DistrictGeometry).coordinates) && (geometry as DistrictGeometry).coordinates.length > 0;
+}
+
+function describeRingProblem(ring: Position[]): string | null {
+  if (!Array.isArray(ring) || ring.length < 4) {
+    return 'Every ring needs at least four positions.';
+  }
+  for (const position of ring) {
+    const [lon, lat] = position ?? [];
+    if (!Number.isFinite(lon) || !Number.isFinite(lat) || Math.abs(lon) > 180 || Math.abs(lat) > 90) {
+      return 'Geometry has coordinates outside longitude/latitude range.';
+    }
+  }
+  const first = ring[0];
+  const last = ring[ring.length - 1];
+  if (first[0] !== last[0] || first[1] !== last[1]) {
+    return 'Every ring must end where it starts.';
+  }
+  return null;
+}
+
+/**
+ * Explain why `geometry` can't be saved as a district boundary, or return null if it can.
+ * Only structure is checked here; topology (overlaps, slivers) is cleaned up server-side.
+ */
+export function describeGeometryProblem(geometry: unknown): string | null {
+  const candidate = geometry as Geometry | null;
+  if (!isValidGeometry(candidate)) {
+    return 'Geometry must be a Polygon or MultiPolygon.';
+  }
+  const polygons = candidate.type === 'Polygon' ? [candidate.coordinates] : candidate.coordinates;
+  for (const polygon of polygons) {
+    if (!Array.isArray(polygon) || !polygon.length) {
+      return 'Every polygon needs an outer ring.';
+    }
+    for (const ring of polygon) {
+      const problem = describeRingProblem(ring);
+      if (problem) {
+        return problem;
+      }
+    }
+  }
+  return null;
+}
+
+export function rowToFeature(row: DistrictRow): DistrictFeature | null {
+  const geometry = parseMaybeJson(row.geometry);
+  if (!isValidGeometry(geometry)) {
+    return null;
+  }
+  return {
+    type: 'Feature',
+    properties: {
+      id: row.id,
+      name: normalizeDistrictName(row.name),
+      chapter_name: row.chapter_name ?? null,
+      color: row.color,
+      revision: row.revision,
+    },
+    geometry,
+  };
+}
+
+export function rowsToFeatureCollection(rows: DistrictRow[]): DistrictFeatureCollection {
+  const features = rows
+    .map(rowToFeature)
+    .filter((feature): feature is DistrictFeature => Boolean(feature));
+
+  return {
+    type: 'FeatureCollection',
+    features,
+  };
+}
@@ -1,166 +1,121 @@
 import type { Geometry } from 'geojson';
-import fallbackRaw from '../data/districts.geojson?raw';
 import fallbackUrl from '../data/districts.geojson?url';
-import { supabase } from './supabase';
+import {
+  isValidGeometry,
+  normalizeFallbackDistricts,
+  parseMaybeJson,
+  type DistrictRow,
+  type FallbackCollectionLike,
+} from './districtData';
+import { parseDistrictRows, parseFallbackDistricts } from './geometryWorker';
+import { measurePerfAsync } from './perf';
+import { requestToPromise, withStores } from './idb';
+import { supabase, supabaseRequestHeaders, supabaseRestUrl } from './supabase';
 import type { BoundaryEdit, DistrictFeature, DistrictFeatureCollection, DistrictGeometry } from '../types/domain';
 
-const FALLBACK_DISTRICT_ORDER = [
-  'Leander',
-  'Round Rock',
-  'Cedar Park',
-  'Pflugerville',
-  'Lakeline',
-  'Wells Branch',
-  'Walnut Creek',
-  'Hyde Park',
-  'Downtown',
-  'South-Mopac',
-  'Live Oak',
-  'Brodie',
-  'Searight',
-  'Hill Country',
-  'Bastrop',
-  'College Station',
-  'Del Valle',
-] as const;
+type DistrictFetchMeta = {
+  data: DistrictFeatureCollection;
+  source: 'supabase' | 'fallback';
+  message: string;
+  // Highest revision over all rows, archived ones included, so it moves on every write; null for
+  // fallback data.
+  revision: number | null;
+  // Where fetchDistrictChanges picks up from; null when only a full fetch can refresh the data.
+  cursor: number | null;
+};
 
-const SOURCE_NAME_TO_CANONICAL: Record<string, (typeof FALLBACK_DISTRICT_ORDER)[number]> = {
-  'Crystal Falls': 'Leander',
-  'Crystal Fall': 'Leander',
-  'Round Rock': 'Round Rock',
-  'Cedar Park': 'Cedar Park',
-  Pflugerville: 'Pflugerville',
-  Lakeline: 'Lakeline',
-  'Wells Branch': 'Wells Branch',
-  'Walnut Creek': 'Walnut Creek',
-  'Hyde Park': 'Hyde Park',
-  // Delwood polygon is pre-merged into Hyde Park in the GeoJSON,
-  // but keep the alias in case any legacy source still labels it Delwood.
-  Delwood: 'Hyde Park',
-  Downtown: 'Downtown',
-  'South Mopac': 'South-Mopac',
-  'Live Oak': 'Live Oak',
-  Brodie: 'Brodie',
-  Searight: 'Searight',
-  'Hill Country': 'Hill Country',
-  Bastrop: 'Bastrop',
-  'College Station': 'College Station',
-  'Del Valle': 'Del Valle',
+export type DistrictSnapshot = {
+  data: DistrictFeatureCollection;
+  revision: number;
+  cursor: number | null;
+  savedAt: number;
 };
 
-const DISTRICT_ID_BY_NAME: Record<(typeof FALLBACK_DISTRICT_ORDER)[number], string> = {
-  Leander: 'leander',
-  'Round Rock': 'round-rock',
-  'Cedar Park': 'cedar-park',
-  Pflugerville: 'pflugerville',
-  Lakeline: 'lakeline',
-  'Wells Branch': 'wells-branch',
-  'Walnut Creek': 'walnut-creek',
-  'Hyde Park': 'hyde-park',
-  Downtown: 'downtown',
-  'South-Mopac': 'south-mopac',
-  'Live Oak': 'live-oak',
-  Brodie: 'brodie',
-  Searight: 'searight',
-  'Hill Country': 'hill-country',
-  Bastrop: 'bastrop',
-  'College Station': 'college-station',
-  'Del Valle': 'del-valle',
+// Order and sync state of the snapshot; its features are stored one record each in
+// SNAPSHOT_FEATURE_STORE, so a save only writes the districts that changed.
+type DistrictSnapshotRecord = Omit<DistrictSnapshot, 'data'> & {
+  key: string;
+  version: number;
+  ids: string[];
 };
 
-type DistrictRow = {
-  id: string;
-  name: string;
-  chapter_name: string | null;
-  color: string | null;
+type PendingSnapshot = Pick<DistrictSnapshot, 'data' | 'revision' | 'cursor'>;
+
+// Simplified geometry by district id, with the district revision it was built from.
+export type DistrictOutlines = Map<string, { geometry: DistrictGeometry; revision: number | null }>;
+
+type DistrictOutlineRow = {
+  district_id: string;
   geometry: Geometry | string | null;
-  is_active: boolean;
+  revision: number | null;
 };
 
-type DistrictFetchMeta = {
-  data: DistrictFeatureCollection;
-  source: 'supabase' | 'fallback';
-  message: string;
+export type DistrictChanges = {
+  upserts: DistrictFeature[];
+  removedIds: string[];
+  // Highest revision among the returned rows (archived ones included), or null if there were none.
+  revision: number | null;
+  cursor: number;
 };
 
-type FallbackFeatureLike = {
-  type?: string;
-  properties?: Record<string, unknown>;
-  geometry?: Geometry;
+// What district_snapshot() and district_changes_since() return.
+type DistrictRowsResponse = {
+  cursor: number;
+  rows: DistrictRow[];
 };
 
-type FallbackCollectionLike = {
-  type?: string;
-  features?: FallbackFeatureLike[];
+type DistrictSnapshotResponse = DistrictRowsResponse & {
+  // Highest revision over all rows, archived ones included.
+  revision: number | null;
 };
 
 const EMPTY_FC: DistrictFeatureCollection = { type: 'FeatureCollection', features: [] };
 let fallbackDistrictsCache: DistrictFeatureCollection | null = null;
 const SUPABASE_READ_TIMEOUT_MS = 6000;
 const SAFE_EDIT_ACTIONS = new Set(['update', 'insert', 'soft_delete', 'restore']);
-
-function normalizeDistrictName(name: string): string {
-  if (name === 'Crystal Falls' || name === 'Crystal Fall') {
-    return 'Leander';
-  }
-  return name;
-}
-
-function normalizeFallbackDistricts(rawCollection: FallbackCollectionLike): DistrictFeatureCollection {
-  const featuresByName = new Map<string, DistrictFeature>();
-
-  for (const feature of rawCollection?.features || []) {
-    const sourceName =
-      (feature?.properties?.name as string | undefined) ||
-      (feature?.properties?.Name as string | undefined) ||
-      (feature?.properties?.District as string | undefined) ||
-      '';
-
-    const canonicalName = SOURCE_NAME_TO_CANONICAL[sourceName];
-    if (!canonicalName || featuresByName.has(canonicalName) || !feature.geometry) {
-      continue;
-    }
-
-    featuresByName.set(canonicalName, {
-      type: 'Feature',
-      properties: {
-        id: DISTRICT_ID_BY_NAME[canonicalName],
-        name: canonicalName,
-        color: '#FFD700',
-      },
-      geometry: feature.geometry as DistrictGeometry,
-    });
-  }
-
-  return {
-    type: 'FeatureCollection',
-    features: FALLBACK_DISTRICT_ORDER.map((name) => featuresByName.get(name)).filter(
-      (feature): feature is DistrictFeature => Boolean(feature),
-    ),
-  };
-}
+// Precomputed in the background by rebuild_district_outlines() (supabase/schema.sql) and only
+// used when vector tiles are unavailable; each level is drawn below `maxZoom`, and full geometry
+// from there up.
+export const DISTRICT_OUTLINE_LEVELS = [
+  { level: 1, maxZoom: 9 },
+  { level: 2, maxZoom: 12 },
+] as const;
+const outlinesCache = new Map<string, Promise<DistrictOutlines>>();
+// Per outline set, the feature derived from each full-detail feature, so incremental merges
+// keep producing the same objects for untouched districts.
+const outlineFeatureCache = new WeakMap<DistrictOutlines, WeakMap<DistrictFeature, DistrictFeature>>();
+const DISTRICT_TILE_MEDIA_TYPE = 'application/vnd.mapbox-vector-tile';
+const SNAPSHOT_STORE = 'snapshots';
+const SNAPSHOT_FEATURE_STORE = 'snapshotFeatures';
+const SNAPSHOT_KEY = 'districts';
+// Bump when the stored feature shape changes so stale snapshots are ignored.
+const SNAPSHOT_VERSION = 3;
+const SNAPSHOT_IDLE_TIMEOUT_MS = 5000;
+// What the feature store holds, by id; null until it has been read or written this session (or
+// after a failed write), in which case the next save rewrites it in full.
+let storedSnapshotFeatures: Map<string, DistrictFeature> | null = null;
+let pendingSnapshot: PendingSnapshot | null = null;
+let snapshotWrites: Promise<void> = Promise.resolve();
 
 async function loadFallbackDistricts(): Promise<DistrictFeatureCollection> {
   if (fallbackDistrictsCache) {
     return fallbackDistrictsCache;
   }
   try {
-    const raw = JSON.parse(fallbackRaw) as FallbackCollectionLike;
-    fallbackDistrictsCache = normalizeFallbackDistricts(raw);
-    if (fallbackDistrictsCache.features.length) {
+    // The geometry worker fetches and parses the asset so the 257 KB parse stays off the UI thread.
+    const parsed = await parseFallbackDistricts(fallbackUrl);
+    if (parsed.features.length) {
+      fallbackDistrictsCache = parsed;
       return fallbackDistrictsCache;
     }
-  } catch {
-    // Fall through to URL fetch path.
+  } catch (err) {
+    console.warn('Fallback districts could not be fetched. Using the bundled copy:', err);
   }
 
   try {
-    const response = await fetch(fallbackUrl, { cache: 'no-store' });
-    if (!response.ok) {
-      console.error('Fallback geojson fetch failed:', response.status);
-      return EMPTY_FC;
-    }
-    const raw = (await response.json()) as FallbackCollectionLike;
+    // Imported lazily so the bundle stays off the startup path unless it is actually needed.
+    const { default: fallbackRaw } = await import('../data/districts.geojson?raw');
+    const raw = JSON.parse(fallbackRaw) as FallbackCollectionLike;
     fallbackDistrictsCache = normalizeFallbackDistricts(raw);
     return fallbackDistrictsCache;
   } catch (err) {
@@ -169,29 +124,12 @@ async function loadFallbackDistricts(): Promise<DistrictFeatureCollection> {
   }
 }
 
-function parseMaybeJson(value: Geometry | string | null): Geometry | null {
-  if (value && typeof value === 'object') {
-    return value;
-  }
-  if (typeof value !== 'string') {
-    return null;
-  }
-  try {
-    return JSON.parse(value) as Geometry;
-  } catch {
-    return null;
-  }
-}
-
-function isValidGeometry(geometry: Geometry | null): geometry is DistrictGeometry {
-  if (!geometry || typeof geometry !== 'object') {
-    return false;
-  }
-  const allowedTypes = new Set(['Polygon', 'MultiPolygon']);
-  if (!allowedTypes.has(geometry.type)) {
-    return false;
-  }
-  return Array.isArray((geometry as DistrictGeometry).coordinates) && (geometry as DistrictGeometry).coordinates.length > 0;
+/**
+ * Supabase could not be reached at all (timeout or network failure), as opposed to answering with
+ * an error. Retrying a different query against it will not do any better.
+ */
+export class SupabaseUnreachableError extends Error {
+  name = 'SupabaseUnreachableError';
 }
 
 async function withTimeout<T>(promise: PromiseLike<T>, timeoutMs: number, label: string): Promise<T> {
@@ -200,7 +138,10 @@ async function withTimeout<T>(promise: PromiseLike<T>, timeoutMs: number, label:
     return await Promise.race([
       Promise.resolve(promise),
       new Promise<T>((_, reject) => {
-        timer = setTimeout(() => reject(new Error(`${label} timed out after ${timeoutMs}ms`)), timeoutMs);
+        timer = setTimeout(
+          () => reject(new SupabaseUnreachableError(`${label} timed out after ${timeoutMs}ms`)),
+          timeoutMs,
+        );
       }),
     ]);
   } finally {
@@ -210,30 +151,11 @@ async function withTimeout<T>(promise: PromiseLike<T>, timeoutMs: number, label:
   }
 }
 
-function rowsToFeatureCollection(rows: DistrictRow[]): DistrictFeatureCollection {
-  const features = rows
-    .map((row): DistrictFeature | null => {
-      const geometry = parseMaybeJson(row.geometry);
-      if (!isValidGeometry(geometry)) {
-        return null;
-      }
-      return {
-        type: 'Feature',
-        properties: {
-          id: row.id,
-          name: normalizeDistrictName(row.name),
-          chapter_name: row.chapter_name ?? null,
-          color: row.color,
-        },
-        geometry,
-      };
-    })
-    .filter((feature): feature is DistrictFeature => Boolean(feature));
-
-  return {
-    type: 'FeatureCollection',
-    features,
-  };
+function maxRevision(rows: DistrictRow[]): number | null {
+  return rows.reduce<number | null>(
+    (max, row) => (typeof row.revision === 'number' && (max === null || row.revision > max) ? row.revision : max),
+    null,
+  );
 }
 
 export async function fetchDistricts(): Promise<DistrictFeatureCollection> {
@@ -241,53 +163,408 @@ export async function fetchDistricts(): Promise<DistrictFeatureCollection> {
   return data;
 }
 
-export async function fetchDistrictsWithMeta(): Promise<DistrictFetchMeta> {
-  const fallback = await loadFallbackDistricts();
-
+/**
+ * Read the active districts. On failure the bundled districts are returned instead, unless
+ * `fallback` is false (the caller already shows Supabase data), in which case `data` is empty.
+ */
+export async function fetchDistrictsWithMeta({
+  fallback = true,
+}: { fallback?: boolean } = {}): Promise<DistrictFetchMeta> {
+  const fallbackData = () => (fallback ? loadFallbackDistricts() : Promise.resolve(EMPTY_FC));
   if (!supabase) {
-    return { data: fallback, source: 'fallback', message: 'Supabase client is not configured.' };
+    return {
+      data: await fallbackData(),
+      source: 'fallback',
+      message: 'Supabase client is not configured.',
+      revision: null,
+      cursor: null,
+    };
   }
 
   try {
-    const result = await withTimeout<{
-      data: DistrictRow[] | null;
-      error: { message: string } | null;
-    }>(
-      supabase
-        .from('districts')
-        .select('id,name,chapter_name,color,geometry,is_active')
-        .eq('is_active', true)
-        .order('name') as unknown as Promise<{
-        data: DistrictRow[] | null;
+    const client = supabase;
+    // Rows and sync cursor come from one snapshot (supabase/schema.sql, or migrations through
+    // 0010_add_district_snapshot).
+    const result = await measurePerfAsync('supabase.districts', () =>
+      withTimeout<{
+        data: DistrictSnapshotResponse | null;
         error: { message: string } | null;
-      }>,
-      SUPABASE_READ_TIMEOUT_MS,
-      'Supabase districts query',
+        status: number;
+      }>(
+        client.rpc('district_snapshot') as unknown as Promise<{
+          data: DistrictSnapshotResponse | null;
+          error: { message: string } | null;
+          status: number;
+        }>,
+        SUPABASE_READ_TIMEOUT_MS,
+        'Supabase districts query',
+      ),
     );
-    const { data, error } = result;
+    const { error, status } = result;
+    const data = result.data?.rows;
 
     if (error) {
+      if (status === 0) {
+        throw new SupabaseUnreachableError(error.message);
+      }
       console.warn('Supabase districts read failed. Using local fallback:', error.message);
-      return { data: fallback, source: 'fallback', message: error.message || 'Supabase read failed.' };
+      return {
+        data: await fallbackData(),
+        source: 'fallback',
+        message: error.message || 'Supabase read failed.',
+        revision: null,
+        cursor: null,
+      };
     }
 
     if (data?.length) {
-      const fromDb = rowsToFeatureCollection(data as DistrictRow[]);
+      const fromDb = await measurePerfAsync('districts.parseRows', () => parseDistrictRows(data as DistrictRow[]));
       if (fromDb.features.length) {
-        return { data: fromDb, source: 'supabase', message: 'Loaded from Supabase.' };
+        return {
+          data: fromDb,
+          source: 'supabase',
+          message: 'Loaded from Supabase.',
+          revision: result.data?.revision ?? maxRevision(data),
+          cursor: result.data?.cursor ?? null,
+        };
       }
       console.warn('Supabase districts rows were present but invalid. Using local fallback.');
-      return { data: fallback, source: 'fallback', message: 'Supabase rows were invalid geometry.' };
+      return {
+        data: await fallbackData(),
+        source: 'fallback',
+        message: 'Supabase rows were invalid geometry.',
+        revision: null,
+        cursor: null,
+      };
     }
 
-    return { data: fallback, source: 'fallback', message: 'Supabase returned no active districts.' };
+    return {
+      data: await fallbackData(),
+      source: 'fallback',
+      message: 'Supabase returned no active districts.',
+      revision: null,
+      cursor: null,
+    };
   } catch (error) {
     console.warn('Using local fallback districts due to Supabase read failure:', error);
     return {
-      data: fallback,
+      data: await fallbackData(),
       source: 'fallback',
       message: error instanceof Error ? error.message : 'Supabase read failed unexpectedly.',
+      revision: null,
+      cursor: null,
+    };
+  }
+}
+
+/**
+ * Fetch the district rows written since `cursor`, including archived rows so the caller can
+ * drop them. Rows already seen may be included; mergeDistrictChanges skips them by revision.
+ * Throws on read failure; SupabaseUnreachableError when the server could not be reached.
+ */
+export async function fetchDistrictChanges(cursor: number): Promise<DistrictChanges> {
+  if (!supabase) {
+    throw new Error('Supabase is not configured.');
+  }
+
+  const client = supabase;
+  const { data, error, status } = await measurePerfAsync('supabase.districtChanges', () =>
+    withTimeout<{
+      data: DistrictRowsResponse | null;
+      error: { message: string } | null;
+      status: number;
+    }>(
+      client.rpc('district_changes_since', { p_cursor: cursor }) as unknown as Promise<{
+        data: DistrictRowsResponse | null;
+        error: { message: string } | null;
+        status: number;
+      }>,
+      SUPABASE_READ_TIMEOUT_MS,
+      'Supabase district changes query',
+    ),
+  );
+
+  if (error && status === 0) {
+    throw new SupabaseUnreachableError(error.message);
+  }
+  if (error || !data) {
+    throw new Error(error?.message || 'Supabase change read failed.');
+  }
+
+  // Parsed like a full load: string geometry goes to the worker. Archived rows and rows whose
+  // geometry doesn't parse are removed.
+  const parsed = await measurePerfAsync('districts.parseChanges', () =>
+    parseDistrictRows(data.rows.filter((row) => row.is_active)),
+  );
+  const upserts = parsed.features;
+  const upsertIds = new Set(upserts.map((feature) => feature.properties.id));
+  const removedIds = data.rows.filter((row) => !upsertIds.has(row.id)).map((row) => row.id);
+
+  return { upserts, removedIds, revision: maxRevision(data.rows), cursor: data.cursor };
+}
+
+/**
+ * Apply a change set to a collection. Untouched features keep their object
+ * identity so downstream diffing (e.g. MapView's source updates) stays O(changes).
+ * Returns the input collection unchanged when there is nothing to apply.
+ */
+export function mergeDistrictChanges(
+  collection: DistrictFeatureCollection,
+  changes: DistrictChanges,
+): DistrictFeatureCollection {
+  const currentById = new Map(collection.features.map((feature) => [feature.properties.id, feature]));
+  const removed = new Set(changes.removedIds.filter((id) => currentById.has(id)));
+  // Change sets can repeat rows the collection already has; only newer revisions replace a feature.
+  const upserts = changes.upserts.filter((feature) => {
+    const current = currentById.get(feature.properties.id);
+    return current?.properties.revision == null || current.properties.revision !== feature.properties.revision;
+  });
+  if (!upserts.length && !removed.size) {
+    return collection;
+  }
+
+  const upsertsById = new Map(upserts.map((feature) => [feature.properties.id, feature]));
+  const features = collection.features
+    .filter((feature) => !removed.has(feature.properties.id))
+    .map((feature) => {
+      const replacement = upsertsById.get(feature.properties.id);
+      if (replacement) {
+        upsertsById.delete(feature.properties.id);
+        return replacement;
+      }
+      return feature;
+    });
+
+  features.push(...upsertsById.values());
+  features.sort((a, b) => a.properties.name.localeCompare(b.properties.name));
+
+  return { type: 'FeatureCollection', features };
+}
+
+/**
+ * Tile URL template for the district_tiles() RPC, or null without Supabase. The revision makes
+ * each URL immutable: tiles are refetched only after districts change. Pass the revision over all
+ * rows (see district_snapshot()), so archiving a district also moves it.
+ */
+export function districtTileUrl(revision: number): string | null {
+  if (!supabaseRestUrl) {
+    return null;
+  }
+  return `${supabaseRestUrl}/rpc/district_tiles?z={z}&x={x}&y={y}&rev=${revision}`;
+}
+
+/** Headers a district tile request needs, or null if `url` is not a district tile. */
+export function districtTileRequestHeaders(url: string): Record<string, string> | null {
+  if (!supabaseRestUrl || !url.startsWith(`${supabaseRestUrl}/rpc/district_tiles?`)) {
+    return null;
+  }
+  return { ...supabaseRequestHeaders(), Accept: DISTRICT_TILE_MEDIA_TYPE };
+}
+
+/** Outline level to draw at `zoom`, or null when full geometry should be drawn. */
+export function outlineLevelForZoom(zoom: number): number | null {
+  return DISTRICT_OUTLINE_LEVELS.find((band) => zoom < band.maxZoom)?.level ?? null;
+}
+
+async function loadDistrictOutlines(level: number): Promise<DistrictOutlines> {
+  if (!supabase) {
+    throw new Error('Supabase is not configured.');
+  }
+
+  const { data, error } = await withTimeout<{
+    data: DistrictOutlineRow[] | null;
+    error: { message: string } | null;
+  }>(
+    supabase
+      .from('district_outlines')
+      .select('district_id,geometry,revision')
+      .eq('level', level) as unknown as Promise<{
+      data: DistrictOutlineRow[] | null;
+      error: { message: string } | null;
+    }>,
+    SUPABASE_READ_TIMEOUT_MS,
+    'Supabase district outlines query',
+  );
+
+  if (error) {
+    throw new Error(error.message || 'Supabase outline read failed.');
+  }
+
+  const outlines: DistrictOutlines = new Map();
+  for (const row of data ?? []) {
+    const geometry = parseMaybeJson(row.geometry);
+    if (isValidGeometry(geometry)) {
+      outlines.set(row.district_id, { geometry, revision: row.revision });
+    }
+  }
+  return outlines;
+}
+
+/**
+ * Simplified geometry by district id for one outline level, cached per district revision.
+ * Outlines are rebuilt in the background after saves, so a read can trail the districts; check
+ * districtOutlinesCurrent and dropDistrictOutlines before reading again. Throws on read failure.
+ */
+export function fetchDistrictOutlines(level: number, revision: number): Promise<DistrictOutlines> {
+  const key = `${level}:${revision}`;
+  const cached = outlinesCache.get(key);
+  if (cached) {
+    return cached;
+  }
+
+  for (const staleKey of outlinesCache.keys()) {
+    if (!staleKey.endsWith(`:${revision}`)) {
+      outlinesCache.delete(staleKey);
+    }
+  }
+  const pending = loadDistrictOutlines(level);
+  outlinesCache.set(key, pending);
+  pending.catch(() => outlinesCache.delete(key));
+  return pending;
+}
+
+/** Forget a cached outline read, so the next fetch picks up a finished rebuild. */
+export function dropDistrictOutlines(level: number, revision: number): void {
+  outlinesCache.delete(`${level}:${revision}`);
+}
+
+/**
+ * Whether every district has an outline built from its current revision. Neighbors are
+ * simplified together, so one outdated or missing outline makes the whole level unusable:
+ * a full-detail district next to simplified ones shows gaps along their shared edges.
+ */
+export function districtOutlinesCurrent(collection: DistrictFeatureCollection, outlines: DistrictOutlines): boolean {
+  return collection.features.every(
+    (feature) => outlines.get(feature.properties.id)?.revision === feature.properties.revision,
+  );
+}
+
+/**
+ * Swap in outline geometry for every district, or for none if any outline is out of date;
+ * properties always come from `collection`, so renames show up without waiting for new outlines.
+ */
+export function withDistrictOutlines(
+  collection: DistrictFeatureCollection,
+  outlines: DistrictOutlines,
+): DistrictFeatureCollection {
+  if (!districtOutlinesCurrent(collection, outlines)) {
+    return collection;
+  }
+  const derived = outlineFeatureCache.get(outlines) ?? new WeakMap<DistrictFeature, DistrictFeature>();
+  outlineFeatureCache.set(outlines, derived);
+
+  const features = collection.features.map((feature) => {
+    const outline = outlines.get(feature.properties.id);
+    if (!outline) {
+      return feature;
+    }
+    let outlined = derived.get(feature);
+    if (!outlined) {
+      outlined = { ...feature, geometry: outline.geometry };
+      derived.set(feature, outlined);
+    }
+    return outlined;
+  });
+
+  return { type: 'FeatureCollection', features };
+}
+
+/** Last good Supabase collection persisted in IndexedDB, or null if none is usable. */
+export async function loadDistrictSnapshot(): Promise<DistrictSnapshot | null> {
+  try {
+    const stored = await withStores([SNAPSHOT_STORE, SNAPSHOT_FEATURE_STORE], 'readonly', ([meta, features]) =>
+      Promise.all([
+        requestToPromise(meta.get(SNAPSHOT_KEY) as IDBRequest<DistrictSnapshotRecord | undefined>),
+        requestToPromise(features.getAll() as IDBRequest<DistrictFeature[]>),
+      ]),
+    );
+    const [record, features] = stored ?? [];
+    if (!record || record.version !== SNAPSHOT_VERSION || !record.ids?.length || !features) {
+      return null;
+    }
+    const byId = new Map(features.map((feature) => [feature.properties.id, feature]));
+    const ordered = record.ids.map((id) => byId.get(id));
+    if (ordered.some((feature) => !feature)) {
+      return null;
+    }
+    storedSnapshotFeatures = byId;
+    return {
+      data: { type: 'FeatureCollection', features: ordered as DistrictFeature[] },
+      revision: record.revision,
+      cursor: record.cursor ?? null,
+      savedAt: record.savedAt,
     };
+  } catch (err) {
+    console.warn('District snapshot read failed:', err);
+    return null;
+  }
+}
+
+function whenIdle(callback: () => void): void {
+  if (typeof requestIdleCallback === 'function') {
+    requestIdleCallback(callback, { timeout: SNAPSHOT_IDLE_TIMEOUT_MS });
+  } else {
+    setTimeout(callback, 0);
+  }
+}
+
+/**
+ * Persist `data` as the last good Supabase snapshot once the main thread is idle. Calls made
+ * before then coalesce into one write of the latest collection.
+ */
+export function scheduleDistrictSnapshot(
+  data: DistrictFeatureCollection,
+  revision: number,
+  cursor: number | null,
+): void {
+  const scheduled = pendingSnapshot !== null;
+  pendingSnapshot = { data, revision, cursor };
+  if (scheduled) {
+    return;
+  }
+  whenIdle(() => {
+    snapshotWrites = snapshotWrites.then(() => {
+      const snapshot = pendingSnapshot;
+      pendingSnapshot = null;
+      return snapshot ? writeDistrictSnapshot(snapshot) : undefined;
+    });
+  });
+}
+
+// Writes only features whose revision differs from the stored copy, so a one-district delta
+// costs one record rather than a clone of every geometry.
+async function writeDistrictSnapshot({ data, revision, cursor }: PendingSnapshot): Promise<void> {
+  const previous = storedSnapshotFeatures;
+  const next = new Map(data.features.map((feature) => [feature.properties.id, feature]));
+  const changed = data.features.filter((feature) => {
+    const stored = previous?.get(feature.properties.id);
+    if (!stored || stored === feature) {
+      return !stored;
+    }
+    return stored.properties.revision == null || stored.properties.revision !== feature.properties.revision;
+  });
+  const removedIds = previous ? [...previous.keys()].filter((id) => !next.has(id)) : [];
+  const record: DistrictSnapshotRecord = {
+    key: SNAPSHOT_KEY,
+    version: SNAPSHOT_VERSION,
+    ids: [...next.keys()],
+    revision,
+    cursor,
+    savedAt: Date.now(),
+  };
+  try {
+    await withStores([SNAPSHOT_STORE, SNAPSHOT_FEATURE_STORE], 'readwrite', ([meta, features]) => {
+      if (!previous) {
+        features.clear();
+      }
+      changed.forEach((feature) => features.put(feature));
+      removedIds.forEach((id) => features.delete(id));
+      meta.put(record);
+    });
+    storedSnapshotFeatures = next;
+  } catch (err) {
+    storedSnapshotFeatures = null;
+    console.warn('District snapshot write failed:', err);
   }
 }
 
@@ -1,17 +1,178 @@
-type GeocodingResult = {
+import { abortError, wait } from './async';
+import { requestToPromise, withStore } from './idb';
+
+export type GeocodingResult = {
   lat: number;
   lon: number;
   displayName: string;
 };
 
-export async function geocodeAddress(query: string): Promise<GeocodingResult | null> {
-  const trimmed = query.trim();
-  if (!trimmed) {
+export type Geocoder = (query: string, options?: { signal?: AbortSignal }) => Promise<GeocodingResult | null>;
+
+export type GeocodeCacheStats = {
+  hits: number;
+  misses: number;
+  // Lookups that joined an identical request already in flight.
+  deduped: number;
+};
+
+type GeocodeCacheEntry = {
+  key: string;
+  // `null` records a "not found" answer so misspelled addresses don't hit the network again.
+  result: GeocodingResult | null;
+  storedAt: number;
+  accessedAt: number;
+};
+
+// One network-or-cache lookup shared by every caller asking for the same key.
+type InFlightLookup = {
+  promise: Promise<GeocodingResult | null>;
+  controller: AbortController;
+  // Callers still waiting on the result; the lookup is cancelled when this drops to zero.
+  waiters: number;
+};
+
+const CACHE_STORE = 'geocode';
+const POSITIVE_TTL_MS = 30 * 24 * 60 * 60 * 1000;
+const NEGATIVE_TTL_MS = 24 * 60 * 60 * 1000;
+const MAX_PERSISTED_ENTRIES = 5000;
+const MAX_MEMORY_ENTRIES = 500;
+// Nominatim's usage policy allows at most one request per second per application.
+const NOMINATIM_MIN_INTERVAL_MS = 1000;
+
+// Map insertion order doubles as LRU order for the in-memory tier.
+const memoryCache = new Map<string, GeocodeCacheEntry>();
+const inFlight = new Map<string, InFlightLookup>();
+const stats: GeocodeCacheStats = { hits: 0, misses: 0, deduped: 0 };
+const statsListeners = new Set<(stats: GeocodeCacheStats) => void>();
+let nextNominatimSlotAt = 0;
+
+export function normalizeGeocodeQuery(query: string): string {
+  return query
+    .normalize('NFKC')
+    .toLowerCase()
+    .replace(/[.,;:!?'"()]+/g, ' ')
+    .replace(/\s+/g, ' ')
+    .trim();
+}
+
+export function getGeocodeCacheStats(): GeocodeCacheStats {
+  return { ...stats };
+}
+
+export function subscribeGeocodeCacheStats(listener: (stats: GeocodeCacheStats) => void): () => void {
+  statsListeners.add(listener);
+  return () => {
+    statsListeners.delete(listener);
+  };
+}
+
+function bumpStat(name: keyof GeocodeCacheStats): void {
+  stats[name] += 1;
+  const snapshot = getGeocodeCacheStats();
+  statsListeners.forEach((listener) => listener(snapshot));
+}
+
+function isFresh(entry: GeocodeCacheEntry, now: number): boolean {
+  const ttl = entry.result ? POSITIVE_TTL_MS : NEGATIVE_TTL_MS;
+  return now - entry.storedAt < ttl;
+}
+
+function rememberInMemory(entry: GeocodeCacheEntry): void {
+  memoryCache.delete(entry.key);
+  memoryCache.set(entry.key, entry);
+  while (memoryCache.size > MAX_MEMORY_ENTRIES) {
+    const oldest = memoryCache.keys().next().value;
+    if (oldest === undefined) {
+      break;
+    }
+    memoryCache.delete(oldest);
+  }
+}
+
+async function readPersisted(key: string): Promise<GeocodeCacheEntry | null> {
+  try {
+    const entry = await withStore(CACHE_STORE, 'readonly', (store) =>
+      requestToPromise(store.get(key) as IDBRequest<GeocodeCacheEntry | undefined>),
+    );
+    return entry ?? null;
+  } catch (err) {
+    console.warn('Geocode cache read failed:', err);
+    return null;
+  }
+}
+
+async function writePersisted(entry: GeocodeCacheEntry, evict: boolean): Promise<void> {
+  try {
+    await withStore(CACHE_STORE, 'readwrite', async (store) => {
+      store.put(entry);
+      if (!evict) {
+        return;
+      }
+      const count = await requestToPromise(store.count());
+      let excess = count - MAX_PERSISTED_ENTRIES;
+      if (excess <= 0) {
+        return;
+      }
+      // Oldest `accessedAt` first.
+      const cursorRequest = store.index('accessedAt').openCursor();
+      await new Promise<void>((resolve, reject) => {
+        cursorRequest.onsuccess = () => {
+          const cursor = cursorRequest.result;
+          if (!cursor || excess <= 0) {
+            resolve();
+            return;
+          }
+          cursor.delete();
+          excess -= 1;
+          cursor.continue();
+        };
+        cursorRequest.onerror = () => reject(cursorRequest.error);
+      });
+    });
+  } catch (err) {
+    console.warn('Geocode cache write failed:', err);
+  }
+}
+
+async function lookupCache(key: string): Promise<GeocodeCacheEntry | null> {
+  const now = Date.now();
+  const entry = memoryCache.get(key) ?? (await readPersisted(key));
+  if (!entry) {
+    return null;
+  }
+  if (!isFresh(entry, now)) {
+    memoryCache.delete(key);
     return null;
   }
+  const touched = { ...entry, accessedAt: now };
+  rememberInMemory(touched);
+  void writePersisted(touched, false);
+  return touched;
+}
 
+async function waitForNominatimSlot(signal: AbortSignal): Promise<void> {
+  const now = Date.now();
+  const startAt = Math.max(now, nextNominatimSlotAt);
+  nextNominatimSlotAt = startAt + NOMINATIM_MIN_INTERVAL_MS;
+  if (startAt <= now) {
+    return;
+  }
+  try {
+    await wait(startAt - now, signal);
+  } catch (error) {
+    // Hand the slot back if nobody has queued behind it.
+    if (nextNominatimSlotAt === startAt + NOMINATIM_MIN_INTERVAL_MS) {
+      nextNominatimSlotAt = startAt;
+    }
+    throw error;
+  }
+}
+
+async function fetchFromNominatim(query: string, signal: AbortSignal): Promise<GeocodingResult | null> {
+  await waitForNominatimSlot(signal);
   const params = new URLSearchParams({
-    q: trimmed,
+    q: query,
     format: 'json',
     limit: '1',
     addressdetails: '0',
@@ -19,6 +180,7 @@ export async function geocodeAddress(query: string): Promise<GeocodingResult | n
 
   const response = await fetch(`https://nominatim.openstreetmap.org/search?${params.toString()}`, {
     headers: { 'User-Agent': 'CTXDistrictMap/1.0' },
+    signal,
   });
 
   if (!response.ok) {
@@ -37,3 +199,81 @@ export async function geocodeAddress(query: string): Promise<GeocodingResult | n
     displayName: first.display_name,
   };
 }
+
+function joinLookup(key: string, lookup: InFlightLookup, signal?: AbortSignal): Promise<GeocodingResult | null> {
+  lookup.waiters += 1;
+  if (!signal) {
+    return lookup.promise;
+  }
+  return new Promise((resolve, reject) => {
+    const onAbort = () => {
+      lookup.waiters -= 1;
+      if (lookup.waiters === 0) {
+        // Nobody wants the answer any more: free the rate-limit slot or cancel the fetch.
+        if (inFlight.get(key) === lookup) {
+          inFlight.delete(key);
+        }
+        lookup.controller.abort();
+      }
+      reject(abortError());
+    };
+    signal.addEventListener('abort', onAbort, { once: true });
+    lookup.promise.then(resolve, reject).finally(() => signal.removeEventListener('abort', onAbort));
+  });
+}
+
+/**
+ * Geocode through a two-tier cache (memory, then IndexedDB) keyed by the
+ * normalized query. Concurrent lookups of the same key share one request.
+ * An aborted caller stops waiting at once; the shared request is cancelled
+ * (queued or mid-fetch) only when every caller waiting on it has aborted.
+ * Network requests are spaced to respect Nominatim's rate limit; cache hits are not.
+ */
+export async function geocodeAddress(
+  query: string,
+  options: { signal?: AbortSignal } = {},
+): Promise<GeocodingResult | null> {
+  if (options.signal?.aborted) {
+    throw abortError();
+  }
+  const trimmed = query.trim();
+  const key = normalizeGeocodeQuery(trimmed);
+  if (!key) {
+    return null;
+  }
+
+  const pending = inFlight.get(key);
+  if (pending) {
+    bumpStat('deduped');
+    return joinLookup(key, pending, options.signal);
+  }
+
+  const controller = new AbortController();
+  const promise = (async () => {
+    const cached = await lookupCache(key);
+    if (cached) {
+      bumpStat('hits');
+      return cached.result;
+    }
+    if (controller.signal.aborted) {
+      throw abortError();
+    }
+    bumpStat('misses');
+    const result = await fetchFromNominatim(trimmed, controller.signal);
+    const now = Date.now();
+    const entry: GeocodeCacheEntry = { key, result, storedAt: now, accessedAt: now };
+    rememberInMemory(entry);
+    void writePersisted(entry, true);
+    return result;
+  })();
+
+  const lookup: InFlightLookup = { promise, controller, waiters: 0 };
+  inFlight.set(key, lookup);
+  const settle = () => {
+    if (inFlight.get(key) === lookup) {
+      inFlight.delete(key);
+    }
+  };
+  void promise.then(settle, settle);
+  return joinLookup(key, lookup, options.signal);
+}
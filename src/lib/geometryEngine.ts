@@ -0,0 +1,145 @@
+import {
+  describeGeometryProblem,
+  normalizeFallbackDistricts,
+  rowsToFeatureCollection,
+  type DistrictRow,
+  type FallbackCollectionLike,
+} from './districtData';
+import { unpackGeometry, type PackedFeature } from './packedGeometry';
+import {
+  assembleDistrictIndex,
+  buildDistrictIndexEntry,
+  findDistrictInIndex,
+  type DistrictIndex,
+  type DistrictIndexEntry,
+} from './pointInPolygon';
+import { districtLabelPoint } from './polylabel';
+import type { DistrictFeatureCollection } from '../types/domain';
+
+export type GeometryRequest =
+  // Bring the engine's copy of the districts up to date; `order` is the full id list, or null
+  // when it is unchanged.
+  | { type: 'sync'; upserts: PackedFeature[]; removedIds: string[]; order: string[] | null }
+  // Build the lookup index ahead of the first query.
+  | { type: 'warm' }
+  | { type: 'locate'; points: Array<[number, number]> }
+  | { type: 'label'; id: string }
+  | { type: 'validate'; geometry: unknown }
+  | { type: 'parseRows'; rows: DistrictRow[] }
+  | { type: 'parseFallback'; url: string };
+
+export type GeometryResults = {
+  sync: null;
+  warm: null;
+  locate: Array<string | null>;
+  label: [number, number] | null;
+  validate: string | null;
+  parseRows: DistrictFeatureCollection;
+  parseFallback: DistrictFeatureCollection;
+};
+
+export type GeometryRequestMessage = { id: number; request: GeometryRequest };
+
+export type GeometryResponseMessage = { id: number; result?: unknown; error?: string };
+
+export type GeometryEngine = {
+  handle: <T extends GeometryRequest>(request: T) => Promise<GeometryResults[T['type']]>;
+};
+
+type EngineDistrict = {
+  packed: PackedFeature;
+  // Built on first use; null when the district has no usable polygon.
+  entry?: DistrictIndexEntry<string> | null;
+  label?: [number, number] | null;
+};
+
+/**
+ * District geometry state plus the operations run against it. The same engine backs the
+ * geometry worker and, where workers are unavailable, runs inline on the main thread.
+ */
+export function createGeometryEngine(): GeometryEngine {
+  const districts = new Map<string, EngineDistrict>();
+  let order: string[] = [];
+  // Null when a sync changed anything since the last lookup.
+  let index: DistrictIndex<string> | null = null;
+
+  const sync = (upserts: PackedFeature[], removedIds: string[], nextOrder: string[] | null) => {
+    removedIds.forEach((id) => districts.delete(id));
+    upserts.forEach((packed) => districts.set(packed.properties.id, { packed }));
+    if (nextOrder) {
+      order = nextOrder;
+    }
+    if (upserts.length || removedIds.length || nextOrder) {
+      index = null;
+    }
+  };
+
+  // Only districts replaced since the last build get new entries; the rest are reused, and just
+  // the grid over them is rebuilt.
+  const currentIndex = (): DistrictIndex<string> => {
+    if (!index) {
+      const entries: DistrictIndexEntry<string>[] = [];
+      for (const id of order) {
+        const district = districts.get(id);
+        if (!district) {
+          continue;
+        }
+        if (district.entry === undefined) {
+          district.entry = buildDistrictIndexEntry(id, district.packed.geometry);
+        }
+        if (district.entry) {
+          entries.push(district.entry);
+        }
+      }
+      index = assembleDistrictIndex(entries);
+    }
+    return index;
+  };
+
+  const label = (id: string): [number, number] | null => {
+    const district = districts.get(id);
+    if (!district) {
+      return null;
+    }
+    if (district.label === undefined) {
+      district.label = districtLabelPoint(unpackGeometry(district.packed.geometry));
+    }
+    return district.label;
+  };
+
+  const parseFallback = async (url: string): Promise<DistrictFeatureCollection> => {
+    const response = await fetch(url);
+    if (!response.ok) {
+      throw new Error(`Fallback geojson fetch failed: ${response.status}`);
+    }
+    return normalizeFallbackDistricts(JSON.parse(await response.text()) as FallbackCollectionLike);
+  };
+
+  // Everything except parseFallback runs synchronously, so requests are applied in arrival order.
+  const run = (request: GeometryRequest): unknown => {
+    switch (request.type) {
+      case 'sync':
+        sync(request.upserts, request.removedIds, request.order);
+        return null;
+      case 'warm':
+        currentIndex();
+        return null;
+      case 'locate': {
+        const lookup = currentIndex();
+        return request.points.map((point) => findDistrictInIndex(point, lookup));
+      }
+      case 'label':
+        return label(request.id);
+      case 'validate':
+        return describeGeometryProblem(request.geometry);
+      case 'parseRows':
+        return rowsToFeatureCollection(request.rows);
+      case 'parseFallback':
+        return parseFallback(request.url);
+    }
+  };
+
+  return {
+    handle: async <T extends GeometryRequest>(request: T) => (await run(request)) as GeometryResults[T['type']],
+  };
+}
@@ -0,0 +1,261 @@
+// Main-thread client for the geometry worker. District geometry is mirrored into the worker as
+// packed typed arrays whose buffers are transferred, not cloned; the worker owns them along with
+// the lookup index and label points, so index builds and hit tests never run on the UI thread.
+// Full loads and delta syncs alike send rows with string geometry here to be parsed; jsonb rows
+// arrive already parsed and are only normalized inline. Parsed collections come back packed the
+// same way. The main thread still unpacks them into GeoJSON, which MapLibre and the editor need,
+// and hands those same buffers back on the next sync. Without Worker support (SSR, benches, a
+// worker that failed to start) the same engine runs inline.
+import { rowsToFeatureCollection, type DistrictRow } from './districtData';
+import {
+  createGeometryEngine,
+  type GeometryEngine,
+  type GeometryRequest,
+  type GeometryResponseMessage,
+  type GeometryResults,
+} from './geometryEngine';
+import { packFeature, packedTransferables, unpackFeature, type PackedFeature } from './packedGeometry';
+import type { DistrictFeature, DistrictFeatureCollection, DistrictGeometry } from '../types/domain';
+
+type PendingRequest = {
+  request: GeometryRequest;
+  resolve: (result: unknown) => void;
+  reject: (error: Error) => void;
+};
+
+type QueuedLookup = {
+  point: [number, number];
+  resolve: (feature: DistrictFeature | null) => void;
+  reject: (error: Error) => void;
+};
+
+let worker: Worker | null = null;
+let inlineEngine: GeometryEngine | null = null;
+const pending = new Map<number, PendingRequest>();
+let nextRequestId = 1;
+// The collection last mirrored into the engine; lookup results are ids mapped back through it.
+let syncedCollection: DistrictFeatureCollection | null = null;
+let syncedById = new Map<string, DistrictFeature>();
+let syncedOrder: string[] = [];
+// Packed form of features unpacked from a worker parse, so syncing them sends those buffers
+// back instead of packing again. Dropped once sent, since sending detaches them.
+const packedByFeature = new WeakMap<DistrictFeature, PackedFeature>();
+// Single-point lookups made in the same tick go to the engine as one batch.
+let lookupQueue: QueuedLookup[] = [];
+let lookupFlushScheduled = false;
+
+function fallBackToInline(): void {
+  worker?.terminate();
+  worker = null;
+  const engine = createGeometryEngine();
+  inlineEngine = engine;
+  if (syncedCollection) {
+    void engine.handle({
+      type: 'sync',
+      upserts: syncedCollection.features.map(packFeature),
+      removedIds: [],
+      order: syncedOrder,
+    });
+  }
+
+  // Replay whatever the worker never answered; its syncs are covered by the full resync above.
+  const stranded = [...pending.values()];
+  pending.clear();
+  stranded.forEach(({ request, resolve, reject }) => {
+    if (request.type === 'sync') {
+      resolve(null);
+      return;
+    }
+    engine.handle(request).then(resolve, reject);
+  });
+}
+
+function startWorker(): Worker | null {
+  if (worker || inlineEngine) {
+    return worker;
+  }
+  if (typeof Worker === 'undefined') {
+    inlineEngine = createGeometryEngine();
+    return null;
+  }
+
+  try {
+    worker = new Worker(new URL('../workers/geometry.worker.ts', import.meta.url), { type: 'module' });
+  } catch (err) {
+    console.warn('Geometry worker unavailable. Running geometry on the main thread:', err);
+    inlineEngine = createGeometryEngine();
+    return null;
+  }
+
+  worker.onmessage = (event: MessageEvent<GeometryResponseMessage>) => {
+    const { id, result, error } = event.data;
+    const entry = pending.get(id);
+    if (!entry) {
+      return;
+    }
+    pending.delete(id);
+    if (error !== undefined) {
+      entry.reject(new Error(error));
+    } else if (entry.request.type === 'parseRows' || entry.request.type === 'parseFallback') {
+      entry.resolve(unpackCollection(result as PackedFeature[]));
+    } else {
+      entry.resolve(result);
+    }
+  };
+  worker.onerror = (event) => {
+    event.preventDefault();
+    console.warn('Geometry worker failed. Running geometry on the main thread:', event.message);
+    fallBackToInline();
+  };
+  return worker;
+}
+
+function unpackCollection(packed: PackedFeature[]): DistrictFeatureCollection {
+  const features = packed.map((entry) => {
+    const feature = unpackFeature(entry);
+    packedByFeature.set(feature, entry);
+    return feature;
+  });
+  return { type: 'FeatureCollection', features };
+}
+
+function packForSync(feature: DistrictFeature): PackedFeature {
+  const packed = packedByFeature.get(feature);
+  if (!packed) {
+    return packFeature(feature);
+  }
+  packedByFeature.delete(feature);
+  return packed;
+}
+
+function send<T extends GeometryRequest>(request: T): Promise<GeometryResults[T['type']]> {
+  const target = startWorker();
+  if (!target) {
+    return (inlineEngine as GeometryEngine).handle(request);
+  }
+  const id = nextRequestId++;
+  return new Promise((resolve, reject) => {
+    pending.set(id, { request, resolve: resolve as (result: unknown) => void, reject });
+    target.postMessage({ id, request }, request.type === 'sync' ? packedTransferables(request.upserts) : []);
+  });
+}
+
+function sameOrder(a: string[], b: string[]): boolean {
+  return a.length === b.length && a.every((id, index) => id === b[index]);
+}
+
+function flushLookups(): void {
+  lookupFlushScheduled = false;
+  if (!lookupQueue.length) {
+    return;
+  }
+  const batch = lookupQueue;
+  const byId = syncedById;
+  lookupQueue = [];
+  send({ type: 'locate', points: batch.map((entry) => entry.point) }).then(
+    (ids) => batch.forEach((entry, index) => entry.resolve(byId.get(ids[index] ?? '') ?? null)),
+    (error: Error) => batch.forEach((entry) => entry.reject(error)),
+  );
+}
+
+/**
+ * Mirror `districts` into the engine. Features are compared by identity, as with MapView's
+ * source updates, so a delta merge only ships the districts that actually changed, and a new
+ * collection object holding the same features ships nothing.
+ */
+function syncDistricts(districts: DistrictFeatureCollection): void {
+  if (districts === syncedCollection) {
+    return;
+  }
+  // Lookups already queued were asked against the previous collection.
+  flushLookups();
+
+  const nextById = new Map<string, DistrictFeature>();
+  const upserts: PackedFeature[] = [];
+  for (const feature of districts.features) {
+    const id = feature.properties.id;
+    nextById.set(id, feature);
+    if (syncedById.get(id) !== feature) {
+      upserts.push(packForSync(feature));
+    }
+  }
+  const removedIds = [...syncedById.keys()].filter((id) => !nextById.has(id));
+  const order = districts.features.map((feature) => feature.properties.id);
+  const orderChanged = !sameOrder(order, syncedOrder);
+
+  syncedCollection = districts;
+  syncedById = nextById;
+  syncedOrder = order;
+  if (!upserts.length && !removedIds.length && !orderChanged) {
+    return;
+  }
+  void send({
+    type: 'sync',
+    upserts,
+    removedIds,
+    order: orderChanged ? order : null,
+  }).catch((err) => console.warn('Geometry sync failed:', err));
+}
+
+/** Hand `districts` to the worker and build its lookup index in the background. */
+export function preloadDistrictGeometry(districts: DistrictFeatureCollection): void {
+  // Inline, an eager build would be exactly the main-thread work this module exists to avoid.
+  if (!startWorker()) {
+    return;
+  }
+  syncDistricts(districts);
+  void send({ type: 'warm' }).catch((err) => console.warn('Geometry index build failed:', err));
+}
+
+/** District containing a [lon, lat] point, or null. Calls made in the same tick share one round trip. */
+export function locateDistrict(
+  point: [number, number],
+  districts: DistrictFeatureCollection,
+): Promise<DistrictFeature | null> {
+  syncDistricts(districts);
+  return new Promise((resolve, reject) => {
+    lookupQueue.push({ point, resolve, reject });
+    if (!lookupFlushScheduled) {
+      lookupFlushScheduled = true;
+      queueMicrotask(flushLookups);
+    }
+  });
+}
+
+/** Classify many [lon, lat] points at once; results line up with the input order. */
+export async function locateDistricts(
+  points: Array<[number, number]>,
+  districts: DistrictFeatureCollection,
+): Promise<Array<DistrictFeature | null>> {
+  syncDistricts(districts);
+  const byId = syncedById;
+  const ids = await send({ type: 'locate', points });
+  return ids.map((id) => byId.get(id ?? '') ?? null);
+}
+
+/** Where to center or label a district: the pole of inaccessibility of its largest polygon. */
+export function findDistrictLabelPoint(
+  districtId: string,
+  districts: DistrictFeatureCollection,
+): Promise<[number, number] | null> {
+  syncDistricts(districts);
+  return send({ type: 'label', id: districtId });
+}
+
+/** Reason a drawn geometry can't be saved, or null if it is structurally sound. */
+export function validateDistrictGeometry(geometry: DistrictGeometry): Promise<string | null> {
+  return send({ type: 'validate', geometry });
+}
+
+export function parseDistrictRows(rows: DistrictRow[]): Promise<DistrictFeatureCollection> {
+  // jsonb geometry arrives already parsed; only string geometry is worth shipping off-thread.
+  if (!rows.some((row) => typeof row.geometry === 'string')) {
+    return Promise.resolve(rowsToFeatureCollection(rows));
+  }
+  return send({ type: 'parseRows', rows });
+}
+
+/** Fetch and normalize the bundled fallback GeoJSON without parsing it on the main thread. */
+export function parseFallbackDistricts(url: string): Promise<DistrictFeatureCollection> {
+  return send({ type: 'parseFallback', url });
+}
@@ -0,0 +1,110 @@
+// Thin promise wrapper around the app's IndexedDB database. Every caller must
+// cope with `null` (private browsing, SSR, blocked storage) by skipping persistence.
+
+const DB_NAME = 'ctx-district-map';
+const DB_VERSION = 4;
+
+type StoreDefinition = {
+  keyPath: string | string[];
+  indexes?: Record<string, string>;
+};
+
+// Adding a store (or index) requires bumping DB_VERSION.
+const STORES: Record<string, StoreDefinition> = {
+  geocode: { keyPath: 'key', indexes: { accessedAt: 'accessedAt' } },
+  snapshots: { keyPath: 'key' },
+  snapshotFeatures: { keyPath: 'properties.id' },
+  batchRows: { keyPath: ['fileKey', 'rowIndex'] },
+};
+
+let databasePromise: Promise<IDBDatabase | null> | null = null;
+
+export function requestToPromise<T>(request: IDBRequest<T>): Promise<T> {
+  return new Promise((resolve, reject) => {
+    request.onsuccess = () => resolve(request.result);
+    request.onerror = () => reject(request.error);
+  });
+}
+
+export function openDatabase(): Promise<IDBDatabase | null> {
+  if (databasePromise) {
+    return databasePromise;
+  }
+  if (typeof indexedDB === 'undefined') {
+    databasePromise = Promise.resolve(null);
+    return databasePromise;
+  }
+
+  databasePromise = new Promise((resolve) => {
+    let request: IDBOpenDBRequest;
+    try {
+      request = indexedDB.open(DB_NAME, DB_VERSION);
+    } catch (err) {
+      console.warn('IndexedDB unavailable:', err);
+      resolve(null);
+      return;
+    }
+
+    request.onupgradeneeded = () => {
+      const db = request.result;
+      const transaction = request.transaction;
+      for (const [name, definition] of Object.entries(STORES)) {
+        const store = db.objectStoreNames.contains(name)
+          ? transaction?.objectStore(name)
+          : db.createObjectStore(name, { keyPath: definition.keyPath });
+        for (const [indexName, keyPath] of Object.entries(definition.indexes || {})) {
+          if (store && !store.indexNames.contains(indexName)) {
+            store.createIndex(indexName, keyPath);
+          }
+        }
+      }
+    };
+    request.onsuccess = () => {
+      const db = request.result;
+      // Let a newer tab upgrade the schema instead of blocking it.
+      db.onversionchange = () => {
+        db.close();
+        databasePromise = null;
+      };
+      resolve(db);
+    };
+    request.onerror = () => {
+      console.warn('IndexedDB open failed:', request.error);
+      resolve(null);
+    };
+    request.onblocked = () => {
+      console.warn('IndexedDB upgrade blocked by another tab.');
+    };
+  });
+  return databasePromise;
+}
+
+/** Run `fn` against one object store and resolve once the transaction commits. */
+export function withStore<T>(
+  storeName: string,
+  mode: IDBTransactionMode,
+  fn: (store: IDBObjectStore) => Promise<T> | T,
+): Promise<T | null> {
+  return withStores([storeName], mode, ([store]) => fn(store));
+}
+
+/** Like withStore, with several stores in one transaction; `fn` gets them in `storeNames` order. */
+export async function withStores<T>(
+  storeNames: string[],
+  mode: IDBTransactionMode,
+  fn: (stores: IDBObjectStore[]) => Promise<T> | T,
+): Promise<T | null> {
+  const db = await openDatabase();
+  if (!db) {
+    return null;
+  }
+  const transaction = db.transaction(storeNames, mode);
+  const done = new Promise<void>((resolve, reject) => {
+    transaction.oncomplete = () => resolve();
+    transaction.onerror = () => reject(transaction.error);
+    transaction.onabort = () => reject(transaction.error);
+  });
+  const result = await fn(storeNames.map((name) => transaction.objectStore(name)));
+  await done;
+  return result;
+}
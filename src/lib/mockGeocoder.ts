@@ -0,0 +1,67 @@
+import { wait } from './async';
+import type { Geocoder, GeocodingResult } from './geocode';
+
+type MockGeocoderOptions = {
+  // [minLon, minLat, maxLon, maxLat] that generated coordinates fall inside.
+  bbox?: [number, number, number, number];
+  latencyMs?: number;
+  // Fraction of queries (chosen deterministically by query text) that throw, to exercise retry/resume.
+  failureRate?: number;
+  // Fraction of queries that resolve to "not found".
+  notFoundRate?: number;
+  // Fixed answers that take precedence over the hashed coordinates, keyed by query text.
+  knownAddresses?: Record<string, [lon: number, lat: number]>;
+};
+
+const DEFAULT_BBOX: [number, number, number, number] = [-98.1, 29.95, -97.3, 30.75];
+
+// FNV-1a, folded into [0, 1).
+function hashToUnit(text: string, salt: number): number {
+  let hash = 0x811c9dc5 ^ salt;
+  for (let i = 0; i < text.length; i++) {
+    hash ^= text.charCodeAt(i);
+    hash = Math.imul(hash, 0x01000193);
+  }
+  return (hash >>> 0) / 4294967296;
+}
+
+/**
+ * Offline stand-in for Nominatim. The same query always yields the same
+ * coordinates, so batch runs are reproducible without network access.
+ */
+export function createMockGeocoder({
+  bbox = DEFAULT_BBOX,
+  latencyMs = 20,
+  failureRate = 0,
+  notFoundRate = 0,
+  knownAddresses = {},
+}: MockGeocoderOptions = {}): Geocoder {
+  return async (query, options = {}) => {
+    const trimmed = query.trim();
+    if (!trimmed) {
+      return null;
+    }
+    await wait(latencyMs, options.signal);
+
+    const known = knownAddresses[trimmed];
+    if (known) {
+      return { lon: known[0], lat: known[1], displayName: `${trimmed} (mock)` };
+    }
+
+    const key = trimmed.toLowerCase();
+    if (hashToUnit(key, 1) < failureRate) {
+      throw new Error('Geocoding failed: 503');
+    }
+    if (hashToUnit(key, 2) < notFoundRate) {
+      return null;
+    }
+
+    const [minLon, minLat, maxLon, maxLat] = bbox;
+    const result: GeocodingResult = {
+      lon: minLon + hashToUnit(key, 3) * (maxLon - minLon),
+      lat: minLat + hashToUnit(key, 4) * (maxLat - minLat),
+      displayName: `${trimmed} (mock)`,
+    };
+    return result;
+  };
+}
@@ -0,0 +1,109 @@
+// District geometry flattened into typed arrays, the form the geometry worker keeps and the form
+// geometry crosses the worker boundary in: the buffers are transferred rather than structured-
+// cloned, and the lookup index reads rings straight out of `coords` without copying them.
+import type { Position } from 'geojson';
+import type {
+  DistrictFeature,
+  DistrictFeatureCollection,
+  DistrictGeometry,
+  DistrictProperties,
+} from '../types/domain';
+
+export type PackedGeometry = {
+  type: DistrictGeometry['type'];
+  // x, y pairs for every ring, back to back.
+  coords: Float64Array;
+  // Vertex offset where each ring starts, plus a final end offset.
+  ringOffsets: Uint32Array;
+  // Ring offset where each polygon starts, plus a final end offset.
+  polygonOffsets: Uint32Array;
+};
+
+export type PackedFeature = {
+  properties: DistrictProperties;
+  geometry: PackedGeometry;
+};
+
+function polygonsOf(geometry: DistrictGeometry | null | undefined): Position[][][] {
+  if (geometry?.type === 'Polygon') {
+    return [geometry.coordinates];
+  }
+  return geometry?.type === 'MultiPolygon' ? geometry.coordinates : [];
+}
+
+export function packGeometry(geometry: DistrictGeometry): PackedGeometry {
+  const polygons = polygonsOf(geometry);
+  let ringCount = 0;
+  let vertexCount = 0;
+  for (const polygon of polygons) {
+    ringCount += polygon.length;
+    for (const ring of polygon) {
+      vertexCount += ring.length;
+    }
+  }
+
+  const coords = new Float64Array(vertexCount * 2);
+  const ringOffsets = new Uint32Array(ringCount + 1);
+  const polygonOffsets = new Uint32Array(polygons.length + 1);
+  let vertex = 0;
+  let ringIndex = 0;
+  polygons.forEach((polygon, polygonIndex) => {
+    for (const ring of polygon) {
+      ringOffsets[ringIndex++] = vertex;
+      for (const position of ring) {
+        coords[vertex * 2] = position[0];
+        coords[vertex * 2 + 1] = position[1];
+        vertex++;
+      }
+    }
+    polygonOffsets[polygonIndex + 1] = ringIndex;
+  });
+  ringOffsets[ringCount] = vertex;
+
+  return { type: geometry?.type === 'MultiPolygon' ? 'MultiPolygon' : 'Polygon', coords, ringOffsets, polygonOffsets };
+}
+
+/** The flat [x0, y0, x1, y1, ...] coordinates of one ring, as a view into `packed.coords`. */
+export function packedRing(packed: PackedGeometry, ring: number): Float64Array {
+  return packed.coords.subarray(packed.ringOffsets[ring] * 2, packed.ringOffsets[ring + 1] * 2);
+}
+
+export function unpackGeometry(packed: PackedGeometry): DistrictGeometry {
+  const polygons: Position[][][] = [];
+  for (let polygon = 0; polygon + 1 < packed.polygonOffsets.length; polygon++) {
+    const rings: Position[][] = [];
+    for (let ring = packed.polygonOffsets[polygon]; ring < packed.polygonOffsets[polygon + 1]; ring++) {
+      const coords = packedRing(packed, ring);
+      const positions: Position[] = new Array(coords.length / 2);
+      for (let i = 0; i < positions.length; i++) {
+        positions[i] = [coords[i * 2], coords[i * 2 + 1]];
+      }
+      rings.push(positions);
+    }
+    polygons.push(rings);
+  }
+  return packed.type === 'MultiPolygon'
+    ? { type: 'MultiPolygon', coordinates: polygons }
+    : { type: 'Polygon', coordinates: polygons[0] ?? [] };
+}
+
+export function packFeature(feature: DistrictFeature): PackedFeature {
+  return { properties: feature.properties, geometry: packGeometry(feature.geometry) };
+}
+
+export function unpackFeature(packed: PackedFeature): DistrictFeature {
+  return { type: 'Feature', properties: packed.properties, geometry: unpackGeometry(packed.geometry) };
+}
+
+export function packCollection(collection: DistrictFeatureCollection): PackedFeature[] {
+  return collection.features.map(packFeature);
+}
+
+/** Buffers to list in postMessage's transfer argument; each packed geometry owns its own. */
+export function packedTransferables(features: PackedFeature[]): ArrayBuffer[] {
+  return features.flatMap(({ geometry }) => [
+    geometry.coords.buffer as ArrayBuffer,
+    geometry.ringOffsets.buffer as ArrayBuffer,
+    geometry.polygonOffsets.buffer as ArrayBuffer,
+  ]);
+}
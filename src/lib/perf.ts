@@ -0,0 +1,180 @@
+// Timing hooks for the load and render path. Each stage is recorded as a `performance.measure`,
+// so it lines up with MapLibre's own work in a DevTools performance recording, and is also
+// aggregated here for the debug panel and its JSON export.
+
+export type PerfStageStats = {
+  stage: string;
+  count: number;
+  lastMs: number;
+  medianMs: number;
+  p95Ms: number;
+  maxMs: number;
+  totalMs: number;
+};
+
+export type PerfReport = {
+  generatedAt: string;
+  userAgent: string | null;
+  stages: Array<PerfStageStats & { samplesMs: number[] }>;
+};
+
+type StageRecord = {
+  count: number;
+  totalMs: number;
+  maxMs: number;
+  lastMs: number;
+  // Most recent durations, oldest first; bounded because hover queries fire on every mousemove.
+  samples: number[];
+};
+
+const MEASURE_PREFIX = 'district-map:';
+const MAX_SAMPLES_PER_STAGE = 200;
+const PANEL_FLAG_PARAM = 'perf';
+const PANEL_FLAG_STORAGE_KEY = 'district-map:perf';
+
+const stages = new Map<string, StageRecord>();
+const statsListeners = new Set<(stats: PerfStageStats[]) => void>();
+const hasUserTiming =
+  typeof performance !== 'undefined' &&
+  typeof performance.mark === 'function' &&
+  typeof performance.measure === 'function';
+let nextMarkId = 1;
+
+/** The debug panel is opt-in: `?perf` in the URL, or `district-map:perf` set in localStorage. */
+export function isPerfPanelEnabled(): boolean {
+  if (typeof window === 'undefined') {
+    return false;
+  }
+  try {
+    return (
+      new URLSearchParams(window.location.search).has(PANEL_FLAG_PARAM) ||
+      Boolean(window.localStorage?.getItem(PANEL_FLAG_STORAGE_KEY))
+    );
+  } catch {
+    return false;
+  }
+}
+
+function percentile(sorted: number[], fraction: number): number {
+  if (!sorted.length) {
+    return 0;
+  }
+  return sorted[Math.min(sorted.length - 1, Math.floor(sorted.length * fraction))];
+}
+
+function stageStats(stage: string, record: StageRecord): PerfStageStats {
+  const sorted = [...record.samples].sort((a, b) => a - b);
+  return {
+    stage,
+    count: record.count,
+    lastMs: record.lastMs,
+    medianMs: percentile(sorted, 0.5),
+    p95Ms: percentile(sorted, 0.95),
+    maxMs: record.maxMs,
+    totalMs: record.totalMs,
+  };
+}
+
+/** Per-stage summary, in the order stages were first recorded. */
+export function getPerfStats(): PerfStageStats[] {
+  return [...stages].map(([stage, record]) => stageStats(stage, record));
+}
+
+export function subscribePerfStats(listener: (stats: PerfStageStats[]) => void): () => void {
+  statsListeners.add(listener);
+  return () => {
+    statsListeners.delete(listener);
+  };
+}
+
+function notify(): void {
+  if (!statsListeners.size) {
+    return;
+  }
+  const snapshot = getPerfStats();
+  statsListeners.forEach((listener) => listener(snapshot));
+}
+
+export function recordPerf(stage: string, durationMs: number): void {
+  let record = stages.get(stage);
+  if (!record) {
+    record = { count: 0, totalMs: 0, maxMs: 0, lastMs: 0, samples: [] };
+    stages.set(stage, record);
+  }
+  record.count += 1;
+  record.totalMs += durationMs;
+  record.maxMs = Math.max(record.maxMs, durationMs);
+  record.lastMs = durationMs;
+  record.samples.push(durationMs);
+  if (record.samples.length > MAX_SAMPLES_PER_STAGE) {
+    record.samples.shift();
+  }
+  notify();
+}
+
+/**
+ * Start timing `stage`; call the returned function when it ends. Only the first call counts,
+ * so it is safe to wire the same stop to several completion events.
+ */
+export function startPerfMeasure(stage: string): () => void {
+  const start = performance.now();
+  const markName = hasUserTiming ? `${MEASURE_PREFIX}${stage}:start:${nextMarkId++}` : null;
+  if (markName) {
+    performance.mark(markName);
+  }
+
+  let stopped = false;
+  return () => {
+    if (stopped) {
+      return;
+    }
+    stopped = true;
+    const duration = performance.now() - start;
+    if (markName) {
+      const measureName = `${MEASURE_PREFIX}${stage}`;
+      try {
+        performance.measure(measureName, markName);
+      } catch {
+        // A mark cleared by someone else only costs us the timeline entry.
+      }
+      // The user-timing buffer is unbounded; the recording has the entry, the buffer needn't keep it.
+      performance.clearMarks(markName);
+      performance.clearMeasures(measureName);
+    }
+    recordPerf(stage, duration);
+  };
+}
+
+export function measurePerf<T>(stage: string, fn: () => T): T {
+  const stop = startPerfMeasure(stage);
+  try {
+    return fn();
+  } finally {
+    stop();
+  }
+}
+
+export async function measurePerfAsync<T>(stage: string, fn: () => PromiseLike<T>): Promise<T> {
+  const stop = startPerfMeasure(stage);
+  try {
+    return await fn();
+  } finally {
+    stop();
+  }
+}
+
+export function clearPerfStats(): void {
+  stages.clear();
+  notify();
+}
+
+export function exportPerfReport(): PerfReport {
+  return {
+    generatedAt: new Date().toISOString(),
+    userAgent: typeof navigator === 'undefined' ? null : navigator.userAgent,
+    stages: [...stages].map(([stage, record]) => ({
+      ...stageStats(stage, record),
+      samplesMs: [...record.samples],
+    })),
+  };
+}
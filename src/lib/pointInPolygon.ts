@@ -1,13 +1,143 @@
+import { packGeometry, packedRing, type PackedGeometry } from './packedGeometry';
 import type { DistrictFeature, DistrictFeatureCollection } from '../types/domain';
 
-// Ray-casting algorithm for point-in-polygon
-function isInsideRing(point: [number, number], ring: number[][]): boolean {
-  const [px, py] = point;
+type BBox = [minX: number, minY: number, maxX: number, maxY: number];
+
+// A ring's flat coordinate array with its edges bucketed into horizontal bands,
+// so a ray cast only walks the edges that straddle the query latitude.
+type RingIndex = {
+  coords: Float64Array;
+  minY: number;
+  bandHeight: number;
+  bandOffsets: Uint32Array;
+  bandEdges: Uint32Array;
+};
+
+type PolygonIndex = {
+  bbox: BBox;
+  outer: RingIndex;
+  holes: RingIndex[];
+};
+
+// `feature` is whatever the caller wants a hit to return: the feature itself, or just its id.
+export type DistrictIndexEntry<T> = {
+  feature: T;
+  bbox: BBox;
+  polygons: PolygonIndex[];
+};
+
+export type DistrictIndex<T = DistrictFeature> = {
+  features: DistrictIndexEntry<T>[];
+  bbox: BBox;
+  columns: number;
+  rows: number;
+  cellWidth: number;
+  cellHeight: number;
+  cellOffsets: Uint32Array;
+  cellFeatures: Uint32Array;
+};
+
+const EDGES_PER_BAND = 8;
+const MAX_BANDS_PER_RING = 512;
+const MAX_GRID_SIDE = 256;
+
+const indexCache = new WeakMap<DistrictFeatureCollection, DistrictIndex>();
+
+function emptyBBox(): BBox {
+  return [Infinity, Infinity, -Infinity, -Infinity];
+}
+
+function extendBBox(target: BBox, source: BBox): void {
+  if (source[0] < target[0]) target[0] = source[0];
+  if (source[1] < target[1]) target[1] = source[1];
+  if (source[2] > target[2]) target[2] = source[2];
+  if (source[3] > target[3]) target[3] = source[3];
+}
+
+function bboxContains(bbox: BBox, x: number, y: number): boolean {
+  return x >= bbox[0] && x <= bbox[2] && y >= bbox[1] && y <= bbox[3];
+}
+
+// Counting-sort style bucketing: count entries per bucket, prefix-sum into offsets, then fill.
+function bucketize(
+  bucketCount: number,
+  itemCount: number,
+  rangeOf: (item: number) => [first: number, last: number],
+): { offsets: Uint32Array; items: Uint32Array } {
+  const offsets = new Uint32Array(bucketCount + 1);
+  const ranges = new Int32Array(itemCount * 2);
+  for (let item = 0; item < itemCount; item++) {
+    const [first, last] = rangeOf(item);
+    ranges[item * 2] = first;
+    ranges[item * 2 + 1] = last;
+    for (let bucket = first; bucket <= last; bucket++) {
+      offsets[bucket + 1]++;
+    }
+  }
+  for (let bucket = 0; bucket < bucketCount; bucket++) {
+    offsets[bucket + 1] += offsets[bucket];
+  }
+  const cursor = offsets.slice(0, bucketCount);
+  const items = new Uint32Array(offsets[bucketCount]);
+  for (let item = 0; item < itemCount; item++) {
+    for (let bucket = ranges[item * 2]; bucket <= ranges[item * 2 + 1]; bucket++) {
+      items[cursor[bucket]++] = item;
+    }
+  }
+  return { offsets, items };
+}
+
+function clampIndex(value: number, count: number): number {
+  if (!(value > 0)) return 0;
+  return value >= count ? count - 1 : Math.floor(value);
+}
+
+function buildRingIndex(coords: Float64Array, bbox: BBox): RingIndex {
+  const vertexCount = coords.length / 2;
+  for (let i = 0; i < vertexCount; i++) {
+    const x = coords[i * 2];
+    const y = coords[i * 2 + 1];
+    if (x < bbox[0]) bbox[0] = x;
+    if (y < bbox[1]) bbox[1] = y;
+    if (x > bbox[2]) bbox[2] = x;
+    if (y > bbox[3]) bbox[3] = y;
+  }
+
+  const minY = bbox[1];
+  const bandCount = Math.max(1, Math.min(MAX_BANDS_PER_RING, Math.ceil(vertexCount / EDGES_PER_BAND)));
+  const bandHeight = (bbox[3] - minY) / bandCount || 1;
+
+  // Edge i runs from vertex i to its predecessor, matching the classic ray-cast loop.
+  const { offsets, items } = bucketize(bandCount, vertexCount, (i) => {
+    const j = i === 0 ? vertexCount - 1 : i - 1;
+    const yi = coords[i * 2 + 1];
+    const yj = coords[j * 2 + 1];
+    return [
+      clampIndex((Math.min(yi, yj) - minY) / bandHeight, bandCount),
+      clampIndex((Math.max(yi, yj) - minY) / bandHeight, bandCount),
+    ];
+  });
+
+  return { coords, minY, bandHeight, bandOffsets: offsets, bandEdges: items };
+}
+
+// Ray-casting algorithm for point-in-polygon, restricted to the edges of one band.
+function isInsideRing(px: number, py: number, ring: RingIndex): boolean {
+  const { coords, bandOffsets, bandEdges } = ring;
+  const vertexCount = coords.length / 2;
+  if (!vertexCount) {
+    return false;
+  }
+  const band = clampIndex((py - ring.minY) / ring.bandHeight, bandOffsets.length - 1);
   let inside = false;
 
-  for (let i = 0, j = ring.length - 1; i < ring.length; j = i++) {
-    const [xi, yi] = ring[i];
-    const [xj, yj] = ring[j];
+  for (let k = bandOffsets[band], end = bandOffsets[band + 1]; k < end; k++) {
+    const i = bandEdges[k];
+    const j = i === 0 ? vertexCount - 1 : i - 1;
+    const xi = coords[i * 2];
+    const yi = coords[i * 2 + 1];
+    const xj = coords[j * 2];
+    const yj = coords[j * 2 + 1];
 
     if (yi > py !== yj > py && px < ((xj - xi) * (py - yi)) / (yj - yi) + xi) {
       inside = !inside;
@@ -17,36 +147,151 @@ function isInsideRing(point: [number, number], ring: number[][]): boolean {
   return inside;
 }
 
-function isInsidePolygon(point: [number, number], coordinates: number[][][]): boolean {
-  if (!isInsideRing(point, coordinates[0])) {
+function isInsidePolygon(px: number, py: number, polygon: PolygonIndex): boolean {
+  if (!bboxContains(polygon.bbox, px, py) || !isInsideRing(px, py, polygon.outer)) {
     return false;
   }
   // Check holes
-  for (let i = 1; i < coordinates.length; i++) {
-    if (isInsideRing(point, coordinates[i])) {
+  for (const hole of polygon.holes) {
+    if (isInsideRing(px, py, hole)) {
       return false;
     }
   }
   return true;
 }
 
-export function findDistrictAtPoint(
-  point: [number, number],
-  districts: DistrictFeatureCollection,
-): DistrictFeature | null {
-  for (const feature of districts.features) {
-    const geometry = feature.geometry;
-    if (geometry.type === 'Polygon') {
-      if (isInsidePolygon(point, geometry.coordinates)) {
-        return feature;
+function buildPolygonIndex(geometry: PackedGeometry, polygon: number): PolygonIndex | null {
+  const firstRing = geometry.polygonOffsets[polygon];
+  const endRing = geometry.polygonOffsets[polygon + 1];
+  const outerCoords = firstRing < endRing ? packedRing(geometry, firstRing) : null;
+  if (!outerCoords?.length) {
+    return null;
+  }
+  const bbox = emptyBBox();
+  const outer = buildRingIndex(outerCoords, bbox);
+  const holes: RingIndex[] = [];
+  for (let ring = firstRing + 1; ring < endRing; ring++) {
+    holes.push(buildRingIndex(packedRing(geometry, ring), emptyBBox()));
+  }
+  return { bbox, outer, holes };
+}
+
+/**
+ * Bounding boxes and edge bands for one district, reading rings in place from `geometry`.
+ * Null if it has no usable polygon. Entries are independent of each other, so callers that
+ * keep them can rebuild only the districts that changed and re-run assembleDistrictIndex.
+ */
+export function buildDistrictIndexEntry<T>(feature: T, geometry: PackedGeometry): DistrictIndexEntry<T> | null {
+  const polygons: PolygonIndex[] = [];
+  for (let polygon = 0; polygon + 1 < geometry.polygonOffsets.length; polygon++) {
+    const index = buildPolygonIndex(geometry, polygon);
+    if (index) {
+      polygons.push(index);
+    }
+  }
+  if (!polygons.length) {
+    return null;
+  }
+  const bbox = emptyBBox();
+  polygons.forEach((polygon) => extendBBox(bbox, polygon.bbox));
+  return { feature, bbox, polygons };
+}
+
+/**
+ * Build a lookup index for a district collection: per-feature and per-polygon
+ * bounding boxes, a uniform grid over the collection extent, and per-ring edge bands.
+ * Prefer `getDistrictIndex`, which builds once per collection and memoizes the result.
+ */
+export function buildDistrictIndex(districts: DistrictFeatureCollection): DistrictIndex {
+  return assembleDistrictIndex(
+    districts.features
+      .map((feature) => buildDistrictIndexEntry(feature, packGeometry(feature.geometry)))
+      .filter((entry): entry is DistrictIndexEntry<DistrictFeature> => Boolean(entry)),
+  );
+}
+
+/** Grid the entries over their combined extent; a hit returns the first entry, in array order. */
+export function assembleDistrictIndex<T>(features: DistrictIndexEntry<T>[]): DistrictIndex<T> {
+  const bbox = emptyBBox();
+  features.forEach((entry) => extendBBox(bbox, entry.bbox));
+
+  // Aim for roughly one feature per cell.
+  const side = Math.max(1, Math.min(MAX_GRID_SIDE, Math.ceil(Math.sqrt(features.length))));
+  const cellWidth = (bbox[2] - bbox[0]) / side || 1;
+  const cellHeight = (bbox[3] - bbox[1]) / side || 1;
+
+  // Features are appended in collection order so the first hit in a cell matches the linear scan.
+  const cellFeatureLists: number[][] = Array.from({ length: side * side }, () => []);
+  features.forEach((entry, featureIndex) => {
+    const firstColumn = clampIndex((entry.bbox[0] - bbox[0]) / cellWidth, side);
+    const lastColumn = clampIndex((entry.bbox[2] - bbox[0]) / cellWidth, side);
+    const firstRow = clampIndex((entry.bbox[1] - bbox[1]) / cellHeight, side);
+    const lastRow = clampIndex((entry.bbox[3] - bbox[1]) / cellHeight, side);
+    for (let row = firstRow; row <= lastRow; row++) {
+      for (let column = firstColumn; column <= lastColumn; column++) {
+        cellFeatureLists[row * side + column].push(featureIndex);
       }
-    } else if (geometry.type === 'MultiPolygon') {
-      for (const polygon of geometry.coordinates) {
-        if (isInsidePolygon(point, polygon)) {
-          return feature;
-        }
+    }
+  });
+
+  const cellOffsets = new Uint32Array(side * side + 1);
+  cellFeatureLists.forEach((list, cell) => {
+    cellOffsets[cell + 1] = cellOffsets[cell] + list.length;
+  });
+  const cellFeatures = new Uint32Array(cellOffsets[side * side]);
+  cellFeatureLists.forEach((list, cell) => cellFeatures.set(list, cellOffsets[cell]));
+
+  return { features, bbox, columns: side, rows: side, cellWidth, cellHeight, cellOffsets, cellFeatures };
+}
+
+/**
+ * Return the memoized index for a collection, building it on first use.
+ * Collections are treated as immutable: a new collection object gets a new index.
+ */
+export function getDistrictIndex(districts: DistrictFeatureCollection): DistrictIndex {
+  let index = indexCache.get(districts);
+  if (!index) {
+    index = buildDistrictIndex(districts);
+    indexCache.set(districts, index);
+  }
+  return index;
+}
+
+export function findDistrictInIndex<T>(point: [number, number], index: DistrictIndex<T>): T | null {
+  const [px, py] = point;
+  if (!bboxContains(index.bbox, px, py)) {
+    return null;
+  }
+  const column = clampIndex((px - index.bbox[0]) / index.cellWidth, index.columns);
+  const row = clampIndex((py - index.bbox[1]) / index.cellHeight, index.rows);
+  const cell = row * index.columns + column;
+
+  for (let k = index.cellOffsets[cell], end = index.cellOffsets[cell + 1]; k < end; k++) {
+    const entry = index.features[index.cellFeatures[k]];
+    if (!bboxContains(entry.bbox, px, py)) {
+      continue;
+    }
+    for (const polygon of entry.polygons) {
+      if (isInsidePolygon(px, py, polygon)) {
+        return entry.feature;
       }
     }
   }
   return null;
 }
+
+export function findDistrictAtPoint(
+  point: [number, number],
+  districts: DistrictFeatureCollection,
+): DistrictFeature | null {
+  return findDistrictInIndex(point, getDistrictIndex(districts));
+}
+
+/** Classify many [lon, lat] points in one call; results line up with the input order. */
+export function findDistrictsAtPoints(
+  points: Array<[number, number]>,
+  districts: DistrictFeatureCollection,
+): Array<DistrictFeature | null> {
+  const index = getDistrictIndex(districts);
+  return points.map((point) => findDistrictInIndex(point, index));
+}
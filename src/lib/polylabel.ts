@@ -0,0 +1,208 @@
+import type { Position } from 'geojson';
+import type { DistrictGeometry } from '../types/domain';
+
+// A square cell of the search grid: `distance` is from its center to the polygon edge
+// (negative outside), `max` the best distance any point inside the cell could reach.
+type Cell = {
+  x: number;
+  y: number;
+  half: number;
+  distance: number;
+  max: number;
+};
+
+// Search stops once no cell can beat the best point by more than this share of the bbox size.
+const RELATIVE_PRECISION = 0.001;
+
+function segmentDistanceSq(px: number, py: number, a: Position, b: Position): number {
+  let x = a[0];
+  let y = a[1];
+  let dx = b[0] - x;
+  let dy = b[1] - y;
+  if (dx !== 0 || dy !== 0) {
+    const t = ((px - x) * dx + (py - y) * dy) / (dx * dx + dy * dy);
+    if (t > 1) {
+      x = b[0];
+      y = b[1];
+    } else if (t > 0) {
+      x += dx * t;
+      y += dy * t;
+    }
+  }
+  dx = px - x;
+  dy = py - y;
+  return dx * dx + dy * dy;
+}
+
+// Signed distance from a point to the polygon outline: positive inside, negative outside.
+function pointToPolygonDistance(x: number, y: number, rings: Position[][]): number {
+  let inside = false;
+  let minDistanceSq = Infinity;
+  for (const ring of rings) {
+    for (let i = 0, j = ring.length - 1; i < ring.length; j = i++) {
+      const a = ring[i];
+      const b = ring[j];
+      if (a[1] > y !== b[1] > y && x < ((b[0] - a[0]) * (y - a[1])) / (b[1] - a[1]) + a[0]) {
+        inside = !inside;
+      }
+      minDistanceSq = Math.min(minDistanceSq, segmentDistanceSq(x, y, a, b));
+    }
+  }
+  return minDistanceSq === Infinity ? 0 : (inside ? 1 : -1) * Math.sqrt(minDistanceSq);
+}
+
+function makeCell(x: number, y: number, half: number, rings: Position[][]): Cell {
+  const distance = pointToPolygonDistance(x, y, rings);
+  return { x, y, half, distance, max: distance + half * Math.SQRT2 };
+}
+
+function ringArea(ring: Position[]): number {
+  let area = 0;
+  for (let i = 0, j = ring.length - 1; i < ring.length; j = i++) {
+    area += ring[j][0] * ring[i][1] - ring[i][0] * ring[j][1];
+  }
+  return area / 2;
+}
+
+/** Area-weighted centroid of a polygon's outer ring; may fall outside concave shapes. */
+export function polygonCentroid(rings: Position[][]): [number, number] | null {
+  const ring = rings[0];
+  if (!ring?.length) {
+    return null;
+  }
+  let x = 0;
+  let y = 0;
+  let area = 0;
+  for (let i = 0, j = ring.length - 1; i < ring.length; j = i++) {
+    const a = ring[i];
+    const b = ring[j];
+    const f = a[0] * b[1] - b[0] * a[1];
+    x += (a[0] + b[0]) * f;
+    y += (a[1] + b[1]) * f;
+    area += f * 3;
+  }
+  if (area === 0) {
+    return [ring[0][0], ring[0][1]];
+  }
+  return [x / area, y / area];
+}
+
+// Max-heap on `max`, so the most promising cell is always split next.
+function pushCell(heap: Cell[], cell: Cell): void {
+  heap.push(cell);
+  let index = heap.length - 1;
+  while (index > 0) {
+    const parent = (index - 1) >> 1;
+    if (heap[parent].max >= cell.max) {
+      break;
+    }
+    heap[index] = heap[parent];
+    index = parent;
+  }
+  heap[index] = cell;
+}
+
+function popCell(heap: Cell[]): Cell | undefined {
+  const top = heap[0];
+  const last = heap.pop();
+  if (!heap.length || !last) {
+    return top;
+  }
+  let index = 0;
+  for (;;) {
+    const left = index * 2 + 1;
+    if (left >= heap.length) {
+      break;
+    }
+    const right = left + 1;
+    const child = right < heap.length && heap[right].max > heap[left].max ? right : left;
+    if (heap[child].max <= last.max) {
+      break;
+    }
+    heap[index] = heap[child];
+    index = child;
+  }
+  heap[index] = last;
+  return top;
+}
+
+/**
+ * Pole of inaccessibility: the interior point farthest from the polygon's edges, which is
+ * where a label reads best. Grid-and-refine search after Mapbox's polylabel, in degrees.
+ */
+export function polylabel(rings: Position[][]): [number, number] | null {
+  const outer = rings[0];
+  if (!outer?.length) {
+    return null;
+  }
+
+  let minX = Infinity;
+  let minY = Infinity;
+  let maxX = -Infinity;
+  let maxY = -Infinity;
+  for (const [x, y] of outer) {
+    if (x < minX) minX = x;
+    if (y < minY) minY = y;
+    if (x > maxX) maxX = x;
+    if (y > maxY) maxY = y;
+  }
+  const width = maxX - minX;
+  const height = maxY - minY;
+  const cellSize = Math.min(width, height);
+  if (cellSize === 0) {
+    return [minX, minY];
+  }
+  const precision = Math.max(width, height) * RELATIVE_PRECISION;
+
+  const heap: Cell[] = [];
+  const half = cellSize / 2;
+  for (let x = minX; x < maxX; x += cellSize) {
+    for (let y = minY; y < maxY; y += cellSize) {
+      pushCell(heap, makeCell(x + half, y + half, half, rings));
+    }
+  }
+
+  const centroid = polygonCentroid(rings);
+  let best = centroid ? makeCell(centroid[0], centroid[1], 0, rings) : makeCell(minX, minY, 0, rings);
+  const bboxCell = makeCell(minX + width / 2, minY + height / 2, 0, rings);
+  if (bboxCell.distance > best.distance) {
+    best = bboxCell;
+  }
+
+  for (let cell = popCell(heap); cell; cell = popCell(heap)) {
+    if (cell.distance > best.distance) {
+      best = cell;
+    }
+    if (cell.max - best.distance <= precision) {
+      continue;
+    }
+    const quarter = cell.half / 2;
+    pushCell(heap, makeCell(cell.x - quarter, cell.y - quarter, quarter, rings));
+    pushCell(heap, makeCell(cell.x + quarter, cell.y - quarter, quarter, rings));
+    pushCell(heap, makeCell(cell.x - quarter, cell.y + quarter, quarter, rings));
+    pushCell(heap, makeCell(cell.x + quarter, cell.y + quarter, quarter, rings));
+  }
+
+  return [best.x, best.y];
+}
+
+/**
+ * Label point for a district: the pole of inaccessibility of its largest polygon, so
+ * MultiPolygons are labelled on their main body rather than whichever part comes first.
+ */
+export function districtLabelPoint(geometry: DistrictGeometry): [number, number] | null {
+  const polygons = geometry.type === 'Polygon' ? [geometry.coordinates] : geometry.coordinates;
+  let largest: Position[][] | null = null;
+  let largestArea = 0;
+  for (const polygon of polygons) {
+    if (!polygon[0]?.length) {
+      continue;
+    }
+    const area = polygon.reduce((sum, ring, index) => sum + (index === 0 ? 1 : -1) * Math.abs(ringArea(ring)), 0);
+    if (!largest || area > largestArea) {
+      largest = polygon;
+      largestArea = area;
+    }
+  }
+  return largest ? polylabel(largest) : null;
+}
@@ -7,3 +7,10 @@ const publishableKey =
 export const hasSupabaseConfig = Boolean(url && publishableKey);
 
 export const supabase = hasSupabaseConfig ? createClient(url, publishableKey) : null;
+
+// For requests made outside supabase-js, e.g. MapLibre fetching vector tiles.
+export const supabaseRestUrl = hasSupabaseConfig ? `${url}/rest/v1` : null;
+
+export function supabaseRequestHeaders(): Record<string, string> {
+  return { apikey: publishableKey, Authorization: `Bearer ${publishableKey}` };
+}
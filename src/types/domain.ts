@@ -7,6 +7,8 @@ export type DistrictProperties = {
   name: string;
   chapter_name?: string | null;
   color?: string | null;
+  // Row revision for Supabase-loaded districts; lets delta merges skip rows they already have.
+  revision?: number | null;
   [key: string]: unknown;
 };
 
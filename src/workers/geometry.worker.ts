@@ -0,0 +1,32 @@
+import {
+  createGeometryEngine,
+  type GeometryRequestMessage,
+  type GeometryResponseMessage,
+} from '../lib/geometryEngine';
+import { packCollection, packedTransferables } from '../lib/packedGeometry';
+import type { DistrictFeatureCollection } from '../types/domain';
+
+// The app's tsconfig only loads the DOM lib, so describe the slice of
+// DedicatedWorkerGlobalScope this worker uses.
+const scope = self as unknown as {
+  onmessage: ((event: MessageEvent<GeometryRequestMessage>) => void) | null;
+  postMessage: (message: GeometryResponseMessage, transfer?: Transferable[]) => void;
+};
+
+const engine = createGeometryEngine();
+
+scope.onmessage = (event) => {
+  const { id, request } = event.data;
+  engine.handle(request).then(
+    (result) => {
+      // Parsed collections go back as packed features with their buffers transferred.
+      if (request.type === 'parseRows' || request.type === 'parseFallback') {
+        const packed = packCollection(result as DistrictFeatureCollection);
+        scope.postMessage({ id, result: packed }, packedTransferables(packed));
+        return;
+      }
+      scope.postMessage({ id, result });
+    },
+    (error: unknown) => scope.postMessage({ id, error: error instanceof Error ? error.message : String(error) }),
+  );
+};
@@ -0,0 +1,37 @@
+-- Versioned district rows for incremental (delta) sync.
+-- Every insert/update stamps the row with a new global revision so clients can
+-- fetch only the rows that changed since the revision they last saw.
+create sequence if not exists public.district_revision_seq;
+grant usage on sequence public.district_revision_seq to authenticated;
+alter table public.districts
+add column if not exists revision bigint not null default nextval('public.district_revision_seq');
+create index if not exists idx_districts_revision on public.districts(revision);
+
+create or replace function public.bump_district_revision()
+returns trigger
+language plpgsql
+as $$
+begin
+  new.revision := nextval('public.district_revision_seq');
+  new.updated_at := now();
+  return new;
+end;
+$$;
+
+drop trigger if exists trg_districts_revision on public.districts;
+create trigger trg_districts_revision
+before insert or update on public.districts
+for each row execute function public.bump_district_revision();
+
+-- Broadcast district changes to other editors over Supabase Realtime.
+do $$
+begin
+  if exists (select 1 from pg_publication where pubname = 'supabase_realtime')
+    and not exists (
+      select 1 from pg_publication_tables
+      where pubname = 'supabase_realtime' and schemaname = 'public' and tablename = 'districts'
+    ) then
+    alter publication supabase_realtime add table public.districts;
+  end if;
+end;
+$$;
@@ -0,0 +1,100 @@
+-- PostGIS geometry column + GiST index for districts; clean_district_geometry now uses it.
+alter table public.districts add column if not exists geom geometry(MultiPolygon, 4326);
+create index if not exists idx_districts_geom_active on public.districts using gist (geom) where is_active;
+
+create or replace function public.district_geom_from_geojson(p_geometry jsonb)
+returns geometry
+language sql
+immutable
+set search_path = public, extensions
+as $$
+  select st_multi(
+    st_collectionextract(st_makevalid(st_setsrid(st_geomfromgeojson(p_geometry::text), 4326)), 3)
+  )::geometry(MultiPolygon, 4326);
+$$;
+
+create or replace function public.sync_district_geom()
+returns trigger
+language plpgsql
+set search_path = public, extensions
+as $$
+begin
+  if tg_op = 'INSERT' or new.geometry is distinct from old.geometry or new.geom is null then
+    new.geom := public.district_geom_from_geojson(new.geometry);
+  end if;
+  return new;
+end;
+$$;
+
+drop trigger if exists trg_districts_geom on public.districts;
+create trigger trg_districts_geom
+before insert or update on public.districts
+for each row execute function public.sync_district_geom();
+
+-- Backfill without bumping revisions: the GeoJSON clients see is unchanged.
+alter table public.districts disable trigger trg_districts_revision;
+update public.districts
+set geom = public.district_geom_from_geojson(geometry)
+where geom is null;
+alter table public.districts enable trigger trg_districts_revision;
+
+create or replace function public.clean_district_geometry(p_geometry jsonb, p_district_id text default null)
+returns jsonb
+language plpgsql
+security definer
+set search_path = public, extensions
+as $$
+declare
+  candidate geometry;
+  neighbors geometry;
+  overlap_count integer;
+begin
+  if p_geometry is null then
+    raise exception 'Geometry is required.';
+  end if;
+
+  candidate := st_setsrid(st_geomfromgeojson(p_geometry::text), 4326);
+  if candidate is null then
+    raise exception 'Invalid GeoJSON geometry.';
+  end if;
+
+  candidate := st_makevalid(candidate);
+  candidate := st_collectionextract(candidate, 3);
+  candidate := st_unaryunion(candidate);
+  candidate := st_snaptogrid(candidate, 0.000001);
+
+  if st_isempty(candidate) then
+    raise exception 'Geometry must contain at least one polygon.';
+  end if;
+
+  -- Snap candidate to neighbor edges to reduce slivers and dirty shared boundaries.
+  -- Only neighbors whose bbox comes within snapping distance matter; && is answered by the GiST index.
+  select st_unaryunion(st_collect(d.geom))
+  into neighbors
+  from public.districts d
+  where d.is_active = true
+    and (p_district_id is null or d.id <> p_district_id)
+    and d.geom && st_expand(candidate, 0.00005);
+
+  if neighbors is not null then
+    candidate := st_snap(candidate, neighbors, 0.00005);
+    candidate := st_makevalid(candidate);
+    candidate := st_collectionextract(candidate, 3);
+    candidate := st_unaryunion(candidate);
+  end if;
+
+  select count(*)
+  into overlap_count
+  from public.districts d
+  where d.is_active = true
+    and (p_district_id is null or d.id <> p_district_id)
+    and st_intersects(candidate, d.geom)
+    and st_area(st_intersection(candidate, d.geom)::geography) > 10;
+
+  if overlap_count > 0 then
+    raise exception 'Geometry overlaps neighboring district(s).';
+  end if;
+
+  return st_asgeojson(candidate)::jsonb;
+end;
+$$;
@@ -0,0 +1,81 @@
+-- Simplified district outlines for low zoom levels, rebuilt whenever district geometry changes.
+-- Level 1 is drawn below zoom 9 and level 2 below zoom 12 (see DISTRICT_OUTLINE_LEVELS in
+-- src/lib/districts.ts); the tolerances are about half a screen pixel at each band's top zoom.
+create table if not exists public.district_outlines (
+  district_id text not null references public.districts(id) on delete cascade,
+  level smallint not null,
+  geometry jsonb not null,
+  primary key (level, district_id)
+);
+
+create or replace function public.rebuild_district_outlines()
+returns void
+language plpgsql
+security definer
+set search_path = public, extensions
+as $$
+declare
+  tolerances constant double precision[] := array[0.001, 0.0001];
+  -- Coordinates are rounded no finer than the tolerance to keep payloads small.
+  decimals constant integer[] := array[4, 5];
+  has_coverage_simplify boolean;
+  lvl integer;
+begin
+  -- ST_CoverageSimplify (PostGIS 3.4+, GEOS 3.12+) simplifies each shared edge once, so
+  -- neighbors stay gap-free. Older installs snap to a grid instead: vertices that neighbors
+  -- share land on the same grid point, so shared edges stay shared at coarser detail.
+  select exists (select 1 from pg_proc where proname = 'st_coveragesimplify') into has_coverage_simplify;
+
+  delete from public.district_outlines;
+
+  for lvl in 1..array_length(tolerances, 1) loop
+    if has_coverage_simplify then
+      insert into public.district_outlines (district_id, level, geometry)
+      select id, lvl, st_asgeojson(simplified, decimals[lvl])::jsonb
+      from (
+        select d.id, st_coveragesimplify(d.geom, tolerances[lvl]) over () as simplified
+        from public.districts d
+        where d.is_active = true and d.geom is not null
+      ) s
+      where simplified is not null and not st_isempty(simplified);
+    else
+      insert into public.district_outlines (district_id, level, geometry)
+      select id, lvl, st_asgeojson(simplified, decimals[lvl])::jsonb
+      from (
+        select d.id, st_collectionextract(st_snaptogrid(d.geom, tolerances[lvl]), 3) as simplified
+        from public.districts d
+        where d.is_active = true and d.geom is not null
+      ) s
+      where not st_isempty(simplified);
+    end if;
+  end loop;
+end;
+$$;
+
+create or replace function public.refresh_district_outlines()
+returns trigger
+language plpgsql
+security definer
+set search_path = public, extensions
+as $$
+begin
+  -- Simplifying a shared edge moves both neighbors, so every level is rebuilt as a whole.
+  perform public.rebuild_district_outlines();
+  return null;
+end;
+$$;
+
+drop trigger if exists trg_districts_outlines on public.districts;
+create trigger trg_districts_outlines
+after insert or delete or update of geometry, is_active on public.districts
+for each statement execute function public.refresh_district_outlines();
+
+select public.rebuild_district_outlines();
+
+alter table public.district_outlines enable row level security;
+
+drop policy if exists "district outlines readable" on public.district_outlines;
+create policy "district outlines readable"
+on public.district_outlines
+for select
+using (true);
@@ -0,0 +1,52 @@
+-- District boundaries as Mapbox Vector Tiles, served by PostgREST as
+-- GET /rest/v1/rpc/district_tiles?z=&x=&y=&rev= with `Accept: application/vnd.mapbox-vector-tile`.
+do $$
+begin
+  if not exists (
+    select 1 from pg_type t join pg_namespace n on n.oid = t.typnamespace
+    where n.nspname = 'public' and t.typname = 'application/vnd.mapbox-vector-tile'
+  ) then
+    create domain public."application/vnd.mapbox-vector-tile" as bytea;
+  end if;
+end;
+$$;
+
+create or replace function public.district_tiles(z integer, x integer, y integer, rev bigint default null)
+returns public."application/vnd.mapbox-vector-tile"
+language plpgsql
+stable
+set search_path = public, extensions
+as $$
+declare
+  bounds geometry := st_tileenvelope(z, x, y);
+  tile bytea;
+begin
+  -- Clients put the current district revision in `rev`, so a tile URL never changes content
+  -- and browsers may cache it for as long as they like.
+  if rev is not null then
+    perform set_config(
+      'response.headers',
+      '[{"Cache-Control": "public, max-age=31536000, immutable"}]',
+      true
+    );
+  end if;
+
+  -- The layer name must match DISTRICT_TILE_LAYER in src/components/MapView.tsx.
+  select st_asmvt(t, 'districts', 4096, 'geom')
+  into tile
+  from (
+    select
+      d.id,
+      d.name,
+      d.chapter_name,
+      d.color,
+      st_asmvtgeom(st_transform(d.geom, 3857), bounds, 4096, 64, true) as geom
+    from public.districts d
+    where d.is_active = true
+      and d.geom && st_transform(bounds, 4326)
+  ) t
+  where t.geom is not null;
+
+  return coalesce(tile, ''::bytea);
+end;
+$$;
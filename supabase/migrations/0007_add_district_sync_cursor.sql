@@ -0,0 +1,60 @@
+-- Commit-safe delta sync. Revisions are numbered when a save starts but become visible when it
+-- commits, so two saves can commit out of revision order and "revision > last seen" can skip
+-- one for good. Clients now sync by transaction: each row records the transaction that wrote
+-- it, and district_changes_since() hands out a cursor below which every transaction has finished.
+alter table public.districts add column if not exists revision_xid xid8;
+create index if not exists idx_districts_revision_xid on public.districts(revision_xid);
+
+create or replace function public.bump_district_revision()
+returns trigger
+language plpgsql
+as $$
+begin
+  new.revision := nextval('public.district_revision_seq');
+  new.revision_xid := pg_current_xact_id();
+  new.updated_at := now();
+  return new;
+end;
+$$;
+
+-- Oldest transaction still running as of the caller's snapshot. Anything older has finished, so
+-- a read taken now has seen all of its rows; rows from this transaction on may still be unseen.
+create or replace function public.district_sync_cursor()
+returns bigint
+language sql
+stable
+as $$
+  select pg_snapshot_xmin(pg_current_snapshot())::text::bigint;
+$$;
+
+-- Rows (archived ones included) written by transactions at or after `p_cursor`, plus the cursor
+-- for the next call, both taken from the same snapshot. Rows the caller already has can come
+-- back again; clients skip them by revision.
+create or replace function public.district_changes_since(p_cursor bigint)
+returns jsonb
+language sql
+stable
+as $$
+  select jsonb_build_object(
+    'cursor', public.district_sync_cursor(),
+    'rows', coalesce(
+      (
+        select jsonb_agg(
+          jsonb_build_object(
+            'id', d.id,
+            'name', d.name,
+            'chapter_name', d.chapter_name,
+            'color', d.color,
+            'geometry', d.geometry,
+            'is_active', d.is_active,
+            'revision', d.revision
+          )
+          order by d.revision
+        )
+        from public.districts d
+        where d.revision_xid >= p_cursor::text::xid8
+      ),
+      '[]'::jsonb
+    )
+  );
+$$;
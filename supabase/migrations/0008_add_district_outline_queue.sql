@@ -0,0 +1,126 @@
+-- Move the outline rebuild off the save path: saves only queue it, and
+-- process_district_outline_queue() runs it in the background under an advisory lock. Drops the
+-- snap-to-grid fallback, which could open gaps between neighbors, and hides both rebuild
+-- functions from the PostgREST RPC surface.
+
+-- Simplified district outlines for low zoom levels. Viewing normally goes through
+-- district_tiles(); these are only drawn when tiles fail, so they are rebuilt by a background job
+-- rather than inside the save transaction. Level 1 is drawn below zoom 9 and level 2 below zoom 12 (see
+-- DISTRICT_OUTLINE_LEVELS in src/lib/districts.ts); the tolerances are about half a screen pixel
+-- at each band's top zoom. `revision` is the district revision an outline was built from, so
+-- clients draw full geometry for districts changed since the last rebuild.
+create table if not exists public.district_outlines (
+  district_id text not null references public.districts(id) on delete cascade,
+  level smallint not null,
+  geometry jsonb not null,
+  primary key (level, district_id)
+);
+
+alter table public.district_outlines add column if not exists revision bigint;
+
+-- One row per statement that changed district geometry since the last rebuild.
+create table if not exists public.district_outline_queue (
+  id bigserial primary key,
+  queued_at timestamptz not null default now()
+);
+
+create or replace function public.rebuild_district_outlines()
+returns void
+language plpgsql
+security definer
+set search_path = public, extensions
+as $$
+declare
+  tolerances constant double precision[] := array[0.001, 0.0001];
+  -- Coordinates are rounded no finer than the tolerance to keep payloads small.
+  decimals constant integer[] := array[4, 5];
+  lvl integer;
+begin
+  -- Concurrent rebuilds would each delete and reinsert the same keys; run them one at a time.
+  perform pg_advisory_xact_lock(hashtext('public.district_outlines'));
+
+  delete from public.district_outlines;
+
+  -- ST_CoverageSimplify (PostGIS 3.4+, GEOS 3.12+) simplifies each shared edge once, so
+  -- neighbors stay gap-free. Without it there is no cheap simplification that keeps shared
+  -- edges shared, so the table stays empty and clients draw full geometry.
+  if not exists (select 1 from pg_proc where proname = 'st_coveragesimplify') then
+    return;
+  end if;
+
+  for lvl in 1..array_length(tolerances, 1) loop
+    insert into public.district_outlines (district_id, level, geometry, revision)
+    select id, lvl, st_asgeojson(simplified, decimals[lvl])::jsonb, revision
+    from (
+      select d.id, d.revision, st_coveragesimplify(d.geom, tolerances[lvl]) over () as simplified
+      from public.districts d
+      where d.is_active = true and d.geom is not null
+    ) s
+    where simplified is not null and not st_isempty(simplified);
+  end loop;
+end;
+$$;
+
+create or replace function public.refresh_district_outlines()
+returns trigger
+language plpgsql
+security definer
+set search_path = public, extensions
+as $$
+begin
+  -- Simplifying a shared edge moves both neighbors, so outlines are rebuilt as a whole; saves
+  -- only record that a rebuild is due.
+  insert into public.district_outline_queue default values;
+  return null;
+end;
+$$;
+
+drop trigger if exists trg_districts_outlines on public.districts;
+create trigger trg_districts_outlines
+after insert or delete or update of geometry, is_active on public.districts
+for each statement execute function public.refresh_district_outlines();
+
+-- Rebuild outlines if any save queued one since the last run. Skips when another run holds the
+-- lock; whatever that run's snapshot missed stays queued for the next one.
+create or replace function public.process_district_outline_queue()
+returns boolean
+language plpgsql
+security definer
+set search_path = public, extensions
+as $$
+begin
+  if not pg_try_advisory_xact_lock(hashtext('public.district_outline_queue')) then
+    return false;
+  end if;
+
+  delete from public.district_outline_queue;
+  if not found then
+    return false;
+  end if;
+
+  perform public.rebuild_district_outlines();
+  return true;
+end;
+$$;
+
+-- Both rewrite the whole table past RLS; keep them off the PostgREST RPC surface.
+revoke execute on function public.rebuild_district_outlines() from public, anon, authenticated;
+revoke execute on function public.process_district_outline_queue() from public, anon, authenticated;
+
+-- With pg_cron enabled the queue drains every minute. Otherwise schedule
+-- `select public.process_district_outline_queue();` with whatever job runner the project uses.
+do $$
+begin
+  if exists (select 1 from pg_extension where extname = 'pg_cron') then
+    perform cron.schedule(
+      'process-district-outline-queue',
+      '* * * * *',
+      'select public.process_district_outline_queue()'
+    );
+  end if;
+end;
+$$;
+
+alter table public.district_outline_queue enable row level security;
+
+select public.rebuild_district_outlines();
@@ -0,0 +1,97 @@
+-- Label points for vector tiles. Labelling the clipped polygons repeats a district's name at every
+-- tile seam; district_tiles() now adds a separate point layer with one label point per district.
+
+-- Where vector tiles place a district's name: one point per district, so labels don't repeat
+-- in every tile the polygon crosses. The center of the largest inscribed circle sits well inside
+-- the shape, unlike a centroid.
+alter table public.districts add column if not exists label_point geometry(Point, 4326);
+
+create or replace function public.district_label_point(p_geom geometry)
+returns geometry
+language sql
+immutable
+set search_path = public, extensions
+as $$
+  select case
+    when p_geom is null or st_isempty(p_geom) then null
+    else st_setsrid(coalesce((st_maximuminscribedcircle(p_geom)).center, st_pointonsurface(p_geom)), 4326)
+  end::geometry(Point, 4326);
+$$;
+
+create or replace function public.sync_district_geom()
+returns trigger
+language plpgsql
+set search_path = public, extensions
+as $$
+begin
+  if tg_op = 'INSERT' or new.geometry is distinct from old.geometry or new.geom is null then
+    new.geom := public.district_geom_from_geojson(new.geometry);
+  end if;
+  if tg_op = 'INSERT' or new.geom is distinct from old.geom or new.label_point is null then
+    new.label_point := public.district_label_point(new.geom);
+  end if;
+  return new;
+end;
+$$;
+
+-- Backfill without bumping revisions: the GeoJSON clients see is unchanged.
+alter table public.districts disable trigger trg_districts_revision;
+update public.districts
+set label_point = public.district_label_point(geom)
+where label_point is null and geom is not null;
+alter table public.districts enable trigger trg_districts_revision;
+
+create or replace function public.district_tiles(z integer, x integer, y integer, rev bigint default null)
+returns public."application/vnd.mapbox-vector-tile"
+language plpgsql
+stable
+set search_path = public, extensions
+as $$
+declare
+  bounds geometry := st_tileenvelope(z, x, y);
+  tile bytea;
+begin
+  -- Clients put the current district revision in `rev`, so a tile URL never changes content
+  -- and browsers may cache it for as long as they like.
+  if rev is not null then
+    perform set_config(
+      'response.headers',
+      '[{"Cache-Control": "public, max-age=31536000, immutable"}]',
+      true
+    );
+  end if;
+
+  -- Layer names must match DISTRICT_TILE_LAYER and DISTRICT_TILE_LABEL_LAYER in
+  -- src/components/MapView.tsx. MVT layers concatenate, so the label points follow as a second one.
+  select st_asmvt(t, 'districts', 4096, 'geom')
+  into tile
+  from (
+    select
+      d.id,
+      d.name,
+      d.chapter_name,
+      d.color,
+      st_asmvtgeom(st_transform(d.geom, 3857), bounds, 4096, 64, true) as geom
+    from public.districts d
+    where d.is_active = true
+      and d.geom && st_transform(bounds, 4326)
+  ) t
+  where t.geom is not null;
+
+  -- No buffer, so each point lands in exactly one tile.
+  select coalesce(tile, ''::bytea) || coalesce(st_asmvt(l, 'district_labels', 4096, 'geom'), ''::bytea)
+  into tile
+  from (
+    select
+      d.id,
+      d.name,
+      st_asmvtgeom(st_transform(d.label_point, 3857), bounds, 4096, 0, true) as geom
+    from public.districts d
+    where d.is_active = true
+      and d.label_point && st_transform(bounds, 4326)
+  ) l
+  where l.geom is not null;
+
+  return tile;
+end;
+$$;
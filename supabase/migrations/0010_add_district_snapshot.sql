@@ -0,0 +1,36 @@
+-- Full district loads read rows and the sync cursor through one RPC instead of a cursor call
+-- followed by a table read. Requires 0007_add_district_sync_cursor.
+
+-- Active rows plus the sync cursor, from one snapshot, so a full load costs one round trip and
+-- its cursor can't miss a transaction the rows didn't see. `revision` is the highest over all
+-- rows, archived ones included, so a soft delete moves it too; clients key tile URLs on it.
+-- Hard deletes (never done by the app) can lower it; archive districts instead.
+create or replace function public.district_snapshot()
+returns jsonb
+language sql
+stable
+as $$
+  select jsonb_build_object(
+    'cursor', public.district_sync_cursor(),
+    'revision', (select max(d.revision) from public.districts d),
+    'rows', coalesce(
+      (
+        select jsonb_agg(
+          jsonb_build_object(
+            'id', d.id,
+            'name', d.name,
+            'chapter_name', d.chapter_name,
+            'color', d.color,
+            'geometry', d.geometry,
+            'is_active', d.is_active,
+            'revision', d.revision
+          )
+          order by d.name
+        )
+        from public.districts d
+        where d.is_active = true
+      ),
+      '[]'::jsonb
+    )
+  );
+$$;
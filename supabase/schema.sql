@@ -24,6 +24,379 @@ alter table public.districts add column if not exists chapter_name text;
 
 create index if not exists idx_districts_active on public.districts(is_active);
 
+-- Every insert/update stamps the row with a new global revision so clients can
+-- fetch only the rows that changed since the revision they last saw.
+create sequence if not exists public.district_revision_seq;
+grant usage on sequence public.district_revision_seq to authenticated;
+alter table public.districts
+add column if not exists revision bigint not null default nextval('public.district_revision_seq');
+create index if not exists idx_districts_revision on public.districts(revision);
+
+-- Revisions are numbered when a save starts but become visible when it commits, so two saves
+-- can commit out of revision order and "revision > last seen" can skip one for good. Clients
+-- therefore sync by transaction: each row records the transaction that wrote it, and
+-- district_changes_since() hands out a cursor below which every transaction has finished.
+alter table public.districts add column if not exists revision_xid xid8;
+create index if not exists idx_districts_revision_xid on public.districts(revision_xid);
+
+create or replace function public.bump_district_revision()
+returns trigger
+language plpgsql
+as $$
+begin
+  new.revision := nextval('public.district_revision_seq');
+  new.revision_xid := pg_current_xact_id();
+  new.updated_at := now();
+  return new;
+end;
+$$;
+
+drop trigger if exists trg_districts_revision on public.districts;
+create trigger trg_districts_revision
+before insert or update on public.districts
+for each row execute function public.bump_district_revision();
+
+-- Oldest transaction still running as of the caller's snapshot. Anything older has finished, so
+-- a read taken now has seen all of its rows; rows from this transaction on may still be unseen.
+create or replace function public.district_sync_cursor()
+returns bigint
+language sql
+stable
+as $$
+  select pg_snapshot_xmin(pg_current_snapshot())::text::bigint;
+$$;
+
+-- Rows (archived ones included) written by transactions at or after `p_cursor`, plus the cursor
+-- for the next call, both taken from the same snapshot. Rows the caller already has can come
+-- back again; clients skip them by revision.
+create or replace function public.district_changes_since(p_cursor bigint)
+returns jsonb
+language sql
+stable
+as $$
+  select jsonb_build_object(
+    'cursor', public.district_sync_cursor(),
+    'rows', coalesce(
+      (
+        select jsonb_agg(
+          jsonb_build_object(
+            'id', d.id,
+            'name', d.name,
+            'chapter_name', d.chapter_name,
+            'color', d.color,
+            'geometry', d.geometry,
+            'is_active', d.is_active,
+            'revision', d.revision
+          )
+          order by d.revision
+        )
+        from public.districts d
+        where d.revision_xid >= p_cursor::text::xid8
+      ),
+      '[]'::jsonb
+    )
+  );
+$$;
+
+-- Active rows plus the sync cursor, from one snapshot, so a full load costs one round trip and
+-- its cursor can't miss a transaction the rows didn't see. `revision` is the highest over all
+-- rows, archived ones included, so a soft delete moves it too; clients key tile URLs on it.
+-- Hard deletes (never done by the app) can lower it; archive districts instead.
+create or replace function public.district_snapshot()
+returns jsonb
+language sql
+stable
+as $$
+  select jsonb_build_object(
+    'cursor', public.district_sync_cursor(),
+    'revision', (select max(d.revision) from public.districts d),
+    'rows', coalesce(
+      (
+        select jsonb_agg(
+          jsonb_build_object(
+            'id', d.id,
+            'name', d.name,
+            'chapter_name', d.chapter_name,
+            'color', d.color,
+            'geometry', d.geometry,
+            'is_active', d.is_active,
+            'revision', d.revision
+          )
+          order by d.name
+        )
+        from public.districts d
+        where d.is_active = true
+      ),
+      '[]'::jsonb
+    )
+  );
+$$;
+
+-- Native geometry kept in sync with the jsonb column so spatial predicates can use a GiST index
+-- instead of re-parsing every district's GeoJSON on each save.
+alter table public.districts add column if not exists geom geometry(MultiPolygon, 4326);
+create index if not exists idx_districts_geom_active on public.districts using gist (geom) where is_active;
+
+create or replace function public.district_geom_from_geojson(p_geometry jsonb)
+returns geometry
+language sql
+immutable
+set search_path = public, extensions
+as $$
+  select st_multi(
+    st_collectionextract(st_makevalid(st_setsrid(st_geomfromgeojson(p_geometry::text), 4326)), 3)
+  )::geometry(MultiPolygon, 4326);
+$$;
+
+-- Where vector tiles place a district's name: one point per district, so labels don't repeat
+-- in every tile the polygon crosses. The center of the largest inscribed circle sits well inside
+-- the shape, unlike a centroid.
+alter table public.districts add column if not exists label_point geometry(Point, 4326);
+
+create or replace function public.district_label_point(p_geom geometry)
+returns geometry
+language sql
+immutable
+set search_path = public, extensions
+as $$
+  select case
+    when p_geom is null or st_isempty(p_geom) then null
+    else st_setsrid(coalesce((st_maximuminscribedcircle(p_geom)).center, st_pointonsurface(p_geom)), 4326)
+  end::geometry(Point, 4326);
+$$;
+
+create or replace function public.sync_district_geom()
+returns trigger
+language plpgsql
+set search_path = public, extensions
+as $$
+begin
+  if tg_op = 'INSERT' or new.geometry is distinct from old.geometry or new.geom is null then
+    new.geom := public.district_geom_from_geojson(new.geometry);
+  end if;
+  if tg_op = 'INSERT' or new.geom is distinct from old.geom or new.label_point is null then
+    new.label_point := public.district_label_point(new.geom);
+  end if;
+  return new;
+end;
+$$;
+
+drop trigger if exists trg_districts_geom on public.districts;
+create trigger trg_districts_geom
+before insert or update on public.districts
+for each row execute function public.sync_district_geom();
+
+-- Backfill without bumping revisions: the GeoJSON clients see is unchanged.
+alter table public.districts disable trigger trg_districts_revision;
+update public.districts
+set geom = public.district_geom_from_geojson(geometry)
+where geom is null;
+update public.districts
+set label_point = public.district_label_point(geom)
+where label_point is null and geom is not null;
+alter table public.districts enable trigger trg_districts_revision;
+
+-- Simplified district outlines for low zoom levels. Viewing normally goes through
+-- district_tiles(); these are only drawn when tiles fail, so they are rebuilt by a background job
+-- rather than inside the save transaction. Level 1 is drawn below zoom 9 and level 2 below zoom 12 (see
+-- DISTRICT_OUTLINE_LEVELS in src/lib/districts.ts); the tolerances are about half a screen pixel
+-- at each band's top zoom. `revision` is the district revision an outline was built from, so
+-- clients draw full geometry for districts changed since the last rebuild.
+create table if not exists public.district_outlines (
+  district_id text not null references public.districts(id) on delete cascade,
+  level smallint not null,
+  geometry jsonb not null,
+  primary key (level, district_id)
+);
+
+alter table public.district_outlines add column if not exists revision bigint;
+
+-- One row per statement that changed district geometry since the last rebuild.
+create table if not exists public.district_outline_queue (
+  id bigserial primary key,
+  queued_at timestamptz not null default now()
+);
+
+create or replace function public.rebuild_district_outlines()
+returns void
+language plpgsql
+security definer
+set search_path = public, extensions
+as $$
+declare
+  tolerances constant double precision[] := array[0.001, 0.0001];
+  -- Coordinates are rounded no finer than the tolerance to keep payloads small.
+  decimals constant integer[] := array[4, 5];
+  lvl integer;
+begin
+  -- Concurrent rebuilds would each delete and reinsert the same keys; run them one at a time.
+  perform pg_advisory_xact_lock(hashtext('public.district_outlines'));
+
+  delete from public.district_outlines;
+
+  -- ST_CoverageSimplify (PostGIS 3.4+, GEOS 3.12+) simplifies each shared edge once, so
+  -- neighbors stay gap-free. Without it there is no cheap simplification that keeps shared
+  -- edges shared, so the table stays empty and clients draw full geometry.
+  if not exists (select 1 from pg_proc where proname = 'st_coveragesimplify') then
+    return;
+  end if;
+
+  for lvl in 1..array_length(tolerances, 1) loop
+    insert into public.district_outlines (district_id, level, geometry, revision)
+    select id, lvl, st_asgeojson(simplified, decimals[lvl])::jsonb, revision
+    from (
+      select d.id, d.revision, st_coveragesimplify(d.geom, tolerances[lvl]) over () as simplified
+      from public.districts d
+      where d.is_active = true and d.geom is not null
+    ) s
+    where simplified is not null and not st_isempty(simplified);
+  end loop;
+end;
+$$;
+
+create or replace function public.refresh_district_outlines()
+returns trigger
+language plpgsql
+security definer
+set search_path = public, extensions
+as $$
+begin
+  -- Simplifying a shared edge moves both neighbors, so outlines are rebuilt as a whole; saves
+  -- only record that a rebuild is due.
+  insert into public.district_outline_queue default values;
+  return null;
+end;
+$$;
+
+drop trigger if exists trg_districts_outlines on public.districts;
+create trigger trg_districts_outlines
+after insert or delete or update of geometry, is_active on public.districts
+for each statement execute function public.refresh_district_outlines();
+
+-- Rebuild outlines if any save queued one since the last run. Skips when another run holds the
+-- lock; whatever that run's snapshot missed stays queued for the next one.
+create or replace function public.process_district_outline_queue()
+returns boolean
+language plpgsql
+security definer
+set search_path = public, extensions
+as $$
+begin
+  if not pg_try_advisory_xact_lock(hashtext('public.district_outline_queue')) then
+    return false;
+  end if;
+
+  delete from public.district_outline_queue;
+  if not found then
+    return false;
+  end if;
+
+  perform public.rebuild_district_outlines();
+  return true;
+end;
+$$;
+
+-- Both rewrite the whole table past RLS; keep them off the PostgREST RPC surface.
+revoke execute on function public.rebuild_district_outlines() from public, anon, authenticated;
+revoke execute on function public.process_district_outline_queue() from public, anon, authenticated;
+
+-- With pg_cron enabled the queue drains every minute. Otherwise schedule
+-- `select public.process_district_outline_queue();` with whatever job runner the project uses.
+do $$
+begin
+  if exists (select 1 from pg_extension where extname = 'pg_cron') then
+    perform cron.schedule(
+      'process-district-outline-queue',
+      '* * * * *',
+      'select public.process_district_outline_queue()'
+    );
+  end if;
+end;
+$$;
+
+select public.rebuild_district_outlines();
+
+-- District boundaries as Mapbox Vector Tiles, served by PostgREST as
+-- GET /rest/v1/rpc/district_tiles?z=&x=&y=&rev= with `Accept: application/vnd.mapbox-vector-tile`.
+do $$
+begin
+  if not exists (
+    select 1 from pg_type t join pg_namespace n on n.oid = t.typnamespace
+    where n.nspname = 'public' and t.typname = 'application/vnd.mapbox-vector-tile'
+  ) then
+    create domain public."application/vnd.mapbox-vector-tile" as bytea;
+  end if;
+end;
+$$;
+
+create or replace function public.district_tiles(z integer, x integer, y integer, rev bigint default null)
+returns public."application/vnd.mapbox-vector-tile"
+language plpgsql
+stable
+set search_path = public, extensions
+as $$
+declare
+  bounds geometry := st_tileenvelope(z, x, y);
+  tile bytea;
+begin
+  -- Clients put the current district revision in `rev`, so a tile URL never changes content
+  -- and browsers may cache it for as long as they like.
+  if rev is not null then
+    perform set_config(
+      'response.headers',
+      '[{"Cache-Control": "public, max-age=31536000, immutable"}]',
+      true
+    );
+  end if;
+
+  -- Layer names must match DISTRICT_TILE_LAYER and DISTRICT_TILE_LABEL_LAYER in
+  -- src/components/MapView.tsx. MVT layers concatenate, so the label points follow as a second one.
+  select st_asmvt(t, 'districts', 4096, 'geom')
+  into tile
+  from (
+    select
+      d.id,
+      d.name,
+      d.chapter_name,
+      d.color,
+      st_asmvtgeom(st_transform(d.geom, 3857), bounds, 4096, 64, true) as geom
+    from public.districts d
+    where d.is_active = true
+      and d.geom && st_transform(bounds, 4326)
+  ) t
+  where t.geom is not null;
+
+  -- No buffer, so each point lands in exactly one tile.
+  select coalesce(tile, ''::bytea) || coalesce(st_asmvt(l, 'district_labels', 4096, 'geom'), ''::bytea)
+  into tile
+  from (
+    select
+      d.id,
+      d.name,
+      st_asmvtgeom(st_transform(d.label_point, 3857), bounds, 4096, 0, true) as geom
+    from public.districts d
+    where d.is_active = true
+      and d.label_point && st_transform(bounds, 4326)
+  ) l
+  where l.geom is not null;
+
+  return tile;
+end;
+$$;
+
+-- Broadcast district changes to other editors over Supabase Realtime.
+do $$
+begin
+  if exists (select 1 from pg_publication where pubname = 'supabase_realtime')
+    and not exists (
+      select 1 from pg_publication_tables
+      where pubname = 'supabase_realtime' and schemaname = 'public' and tablename = 'districts'
+    ) then
+    alter publication supabase_realtime add table public.districts;
+  end if;
+end;
+$$;
+
 create table if not exists public.boundary_edits (
   id uuid primary key default gen_random_uuid(),
   district_id text not null references public.districts(id) on delete cascade,
@@ -90,11 +463,13 @@ begin
   end if;
 
   -- Snap candidate to neighbor edges to reduce slivers and dirty shared boundaries.
-  select st_unaryunion(st_collect(st_setsrid(st_geomfromgeojson(d.geometry::text), 4326)))
+  -- Only neighbors whose bbox comes within snapping distance matter; && is answered by the GiST index.
+  select st_unaryunion(st_collect(d.geom))
   into neighbors
   from public.districts d
   where d.is_active = true
-    and (p_district_id is null or d.id <> p_district_id);
+    and (p_district_id is null or d.id <> p_district_id)
+    and d.geom && st_expand(candidate, 0.00005);
 
   if neighbors is not null then
     candidate := st_snap(candidate, neighbors, 0.00005);
@@ -108,10 +483,8 @@ begin
   from public.districts d
   where d.is_active = true
     and (p_district_id is null or d.id <> p_district_id)
-    and st_intersects(candidate, st_setsrid(st_geomfromgeojson(d.geometry::text), 4326))
-    and st_area(
-      st_intersection(candidate, st_setsrid(st_geomfromgeojson(d.geometry::text), 4326))::geography
-    ) > 10;
+    and st_intersects(candidate, d.geom)
+    and st_area(st_intersection(candidate, d.geom)::geography) > 10;
 
   if overlap_count > 0 then
     raise exception 'Geometry overlaps neighboring district(s).';
@@ -304,6 +677,9 @@ $$;
 alter table public.user_roles enable row level security;
 alter table public.districts enable row level security;
 alter table public.boundary_edits enable row level security;
+alter table public.district_outlines enable row level security;
+-- No policies: only the security definer functions above touch the queue.
+alter table public.district_outline_queue enable row level security;
 
 drop policy if exists "roles readable" on public.user_roles;
 create policy "roles readable"
@@ -317,6 +693,12 @@ on public.districts
 for select
 using (true);
 
+drop policy if exists "district outlines readable" on public.district_outlines;
+create policy "district outlines readable"
+on public.district_outlines
+for select
+using (true);
+
 drop policy if exists "districts editable by editors" on public.districts;
 create policy "districts editable by editors"
 on public.districts